@@ -0,0 +1,143 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+"""Measure the effect of DB indexes on REST API collection views.
+
+Populates SQLite DB with many boxen each having a few ports and VLAN
+ports, drops the indexes (as in a DB created by an older release),
+measures `show_ports` and `show_vlan_ports` latency along with
+case-insensitive search latency, then creates the indexes the way
+`softboxen-restapi --upgrade-db` does and measures the latency again.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/api_indexes.py [--boxen N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+from softboxen.api import app
+from softboxen.api import db
+from softboxen.api import migrate
+from softboxen.api import models
+from softboxen.api import views
+
+
+def populate(boxen, ports):
+    db.create_all()
+
+    db.session.execute(models.Box.__table__.insert(), [
+        {'id': box_id, 'vendor': 'cisco', 'model': '5300', 'version': '1',
+         'uuid': 'box-%d' % box_id}
+        for box_id in range(1, boxen + 1)
+    ])
+
+    db.session.execute(models.Port.__table__.insert(), [
+        {'id': (box_id - 1) * ports + idx + 1, 'box_id': box_id,
+         'name': 'eth%d' % idx}
+        for box_id in range(1, boxen + 1)
+        for idx in range(ports)
+    ])
+
+    db.session.execute(models.VlanPort.__table__.insert(), [
+        {'box_id': box_id, 'port_id': (box_id - 1) * ports + idx + 1,
+         'role': role, 'vlan_num': vlan_num, 'name': 'vlan%d' % vlan_num}
+        for box_id in range(1, boxen + 1)
+        for idx in range(ports)
+        for role, vlan_num in (('access', 1), ('trunk', 2), ('trunk', 3))
+    ])
+
+    db.session.commit()
+
+
+def drop_indexes():
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(bind=db.engine)
+
+
+VIEWS = [
+    ('show_ports', '%(prefix)s/boxen/%(box_id)s/ports'),
+    ('show_vlan_ports',
+     '%(prefix)s/boxen/%(box_id)s/ports/%(port_id)s/vlan/trunk'),
+    ('search ports by name', '%(prefix)s/boxen/%(box_id)s/ports?name=ETH1'),
+    ('search boxen by uuid', '%(prefix)s/boxen?uuid=BOX-%(box_id)s')
+]
+"""Measured REST API requests"""
+
+
+def measure(client, boxen, ports, repeat):
+    box_ids = random.Random(0).sample(range(1, boxen + 1), 100)
+
+    def get(path):
+        for box_id in box_ids:
+            response = client.get(path % {
+                'prefix': views.PREFIX, 'box_id': box_id,
+                'port_id': (box_id - 1) * ports + 1})
+            assert response.status_code == 200
+            assert response.get_json()['count']
+
+    return [
+        min(timeit.repeat(
+            lambda: get(path), repeat=repeat, number=1)) / len(box_ids)
+        for _, path in VIEWS
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark DB indexes')
+
+    parser.add_argument(
+        '--boxen', type=int, default=10000,
+        help='Number of boxen in the DB')
+
+    parser.add_argument(
+        '--ports', type=int, default=8,
+        help='Number of ports per box')
+
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of times to repeat the measurement')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///%s' % (
+            os.path.join(directory, 'softboxen.db'))
+
+        populate(args.boxen, args.ports)
+
+        client = app.test_client()
+
+        drop_indexes()
+
+        before = measure(client, args.boxen, args.ports, args.repeat)
+
+        migrate.upgrade_db()
+
+        after = measure(client, args.boxen, args.ports, args.repeat)
+
+        for (name, _), latency_before, latency_after in zip(
+                VIEWS, before, after):
+            print('%s: %.2f ms without indexes, %.2f ms with indexes, '
+                  'speedup %.2fx' % (
+                      name, latency_before * 1000, latency_after * 1000,
+                      latency_before / latency_after))
+
+        db.session.remove()
+        db.engine.dispose()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
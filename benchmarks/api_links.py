@@ -0,0 +1,117 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+"""Measure the cost of hyperlinks generation by REST API schemas.
+
+Populates SQLite DB with a port having many trunk VLAN ports and
+measures `show_vlan_ports` latency with all members expanded, first
+building hyperlinks by `flask.url_for` on every serialized object,
+then filling in URL templates precompiled per endpoint. Responses
+are checked to be identical.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/api_links.py [--members N] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import timeit
+
+from softboxen.api import app
+from softboxen.api import db
+from softboxen.api import ma
+from softboxen.api import models
+from softboxen.api import schemas
+from softboxen.api import views
+
+
+def populate(members):
+    db.create_all()
+
+    db.session.execute(models.Box.__table__.insert(), [
+        {'id': 1, 'vendor': 'cisco', 'model': '5300', 'version': '1'}
+    ])
+
+    db.session.execute(models.Port.__table__.insert(), [
+        {'id': 1, 'box_id': 1, 'name': 'eth0'}
+    ])
+
+    db.session.execute(models.VlanPort.__table__.insert(), [
+        {'box_id': 1, 'port_id': 1, 'role': 'trunk', 'vlan_num': idx,
+         'name': 'vlan%d' % idx}
+        for idx in range(members)
+    ])
+
+    db.session.commit()
+
+
+@contextlib.contextmanager
+def url_for_links():
+    """Build hyperlinks by `flask.url_for` within the block."""
+    serialize = schemas.URLFor._serialize
+    schemas.URLFor._serialize = ma.URLFor._serialize
+
+    try:
+        yield
+
+    finally:
+        schemas.URLFor._serialize = serialize
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark REST API hyperlinks generation')
+
+    parser.add_argument(
+        '--members', type=int, default=10000,
+        help='Number of VLAN ports in the collection')
+
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of times to repeat the measurement')
+
+    args = parser.parse_args()
+
+    path = views.PREFIX + '/boxen/1/ports/1/vlan/trunk?expand=members'
+
+    with tempfile.TemporaryDirectory() as directory:
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///%s' % (
+            os.path.join(directory, 'softboxen.db'))
+
+        populate(args.members)
+
+        client = app.test_client()
+
+        def get():
+            response = client.get(path)
+            assert response.status_code == 200
+            return response.data
+
+        with url_for_links():
+            expected = get()
+            before = min(timeit.repeat(get, repeat=args.repeat, number=1))
+
+        assert get() == expected, 'hyperlinks differ'
+
+        after = min(timeit.repeat(get, repeat=args.repeat, number=1))
+
+        print('show_vlan_ports with %d members: %.2f ms with url_for, '
+              '%.2f ms with precompiled templates, speedup %.2fx' % (
+                  args.members, before * 1000, after * 1000,
+                  before / after))
+
+        db.session.remove()
+        db.engine.dispose()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
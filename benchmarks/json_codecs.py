@@ -0,0 +1,117 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+"""Measure the cost of JSON encoding and decoding by available codecs.
+
+Serializes a VLAN ports collection with all members embedded (as
+REST API server does on `?expand=members`) once, then encodes it the
+way REST API server responds and decodes it the way REST API client
+parses responses by each installed JSON codec.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/json_codecs.py [--members N] [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+
+from softboxen import jsoncodec
+from softboxen.api import app
+from softboxen.api import db
+from softboxen.api import models
+from softboxen.api import schemas
+from softboxen.api import views
+
+
+def make_collection(count):
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+
+    with app.test_request_context('/?expand=members'):
+        db.create_all()
+
+        box = models.Box(vendor='cisco', model='5300', version='1')
+        port = models.Port(box=box, name='eth0')
+        db.session.add_all([box, port])
+        db.session.flush()
+
+        vlan_ports = [
+            models.VlanPort(
+                box_id=box.id, port_id=port.id, role='trunk',
+                vlan_num=idx, name='vlan%s' % idx,
+                description='VLAN #%s' % idx)
+            for idx in range(count)
+        ]
+        db.session.add_all(vlan_ports)
+        db.session.flush()
+
+        response = {
+            'members': vlan_ports,
+            'count': count,
+            'box_id': box.id,
+            'role': 'trunk',
+            'port_id': port.id
+        }
+
+        json_doc = views.embed_members(
+            schemas.VlanPortsSchema().dump(response), vlan_ports,
+            schemas.VlanPortSchema)
+
+        db.session.rollback()
+
+    return json_doc
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark JSON codecs')
+
+    parser.add_argument(
+        '--members', type=int, default=5000,
+        help='Number of VLAN ports in the collection')
+
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of times to repeat the measurement')
+
+    args = parser.parse_args()
+
+    json_doc = make_collection(args.members)
+
+    results = {}
+
+    for codec in jsoncodec.CODECS:
+        if not codec.available:
+            print('%s: not installed' % codec.name)
+            continue
+
+        data = codec.dumps(json_doc, sort_keys=True).encode()
+
+        encoding = min(timeit.repeat(
+            lambda: codec.dumps(json_doc, sort_keys=True),
+            repeat=args.repeat, number=1))
+
+        decoding = min(timeit.repeat(
+            lambda: codec.loads(data), repeat=args.repeat, number=1))
+
+        results[codec.name] = encoding, decoding
+
+        print('%s: %d KB document encoded in %.4f sec, decoded in %.4f '
+              'sec' % (codec.name, len(data) // 1024, encoding, decoding))
+
+    baseline = results[jsoncodec.Codec.name]
+
+    for name, (encoding, decoding) in results.items():
+        if name != jsoncodec.Codec.name:
+            print('%s speedup: encoding %.2fx, decoding %.2fx' % (
+                name, baseline[0] / encoding, baseline[1] / decoding))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+"""Measure the cost of parsing collection members JSON documents.
+
+Builds `Port` resources out of embedded member documents the way
+`ResourceCollection` does with `?expand=members` and reads one field
+of each member. Members are parsed with fields looked up by scanning
+the class on every parse, with the per-class compiled fields table
+and with fields decoded lazily on first access.
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/parse_fields.py [--members N] [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+
+from softboxen.client.resources import base
+from softboxen.client.resources.box import port
+
+
+class ScanningPort(port.Port):
+    """Port resource collecting its fields on every parse."""
+
+    def _parse_attributes(self, json_doc):
+        for attr in dir(self.__class__):
+            field = getattr(self.__class__, attr)
+            if isinstance(field, base.Field):
+                setattr(self, attr, field._load(json_doc, self))
+
+
+class LazyPort(port.Port):
+    """Port resource decoding its fields on first access."""
+
+    LAZY_FIELDS = True
+
+
+def make_members(count):
+    return [
+        {
+            'name': 'ETH%s' % idx,
+            'description': 'Port #%s' % idx,
+            'mode': 'access',
+            'shutdown': False,
+            'speed': '1000',
+            'auto_negotiation': True,
+            'mtu': 1500,
+            '_links': {
+                'self': '/softboxen/v1/boxen/1/ports/%s' % idx
+            }
+        }
+        for idx in range(count)
+    ]
+
+
+def parse(resource_type, members):
+    for member in members:
+        resource = resource_type(
+            None, member['_links']['self'], json_doc=member)
+        resource.name  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark resource fields parsing')
+
+    parser.add_argument(
+        '--members', type=int, default=5000,
+        help='Number of collection members to parse')
+
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='Number of times to repeat the measurement')
+
+    args = parser.parse_args()
+
+    members = make_members(args.members)
+
+    results = {}
+
+    for label, resource_type in (('scanning', ScanningPort),
+                                 ('compiled', port.Port),
+                                 ('lazy', LazyPort)):
+        results[label] = min(timeit.repeat(
+            lambda: parse(resource_type, members),
+            repeat=args.repeat, number=1))
+
+        print('%s: %d members parsed in %.4f sec (%.2f usec/member)' % (
+            label, args.members, results[label],
+            results[label] * 1e6 / args.members))
+
+    for label in ('compiled', 'lazy'):
+        print('%s speedup: %.2fx' % (
+            label, results['scanning'] / results[label]))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
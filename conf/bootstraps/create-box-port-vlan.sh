@@ -20,21 +20,20 @@ req='{
 
 box_id=$(create_resource "$req" $ENDPOINT/boxen) || exit 1
 
-# Create login credentials at the switch (admin operation)
-req='{
-  "user": "admin",
-  "password": "secret"
-}'
-
-credential_id=$(create_resource "$req" $ENDPOINT/boxen/$box_id/credentials)
-
-# Create privileged credentials at the switch (admin operation)
-req='{
-  "user": "<enable>",
-  "password": "secret"
-}'
+# Create login and privileged credentials at the switch at once
+# (admin operation)
+req='[
+  {
+    "user": "admin",
+    "password": "secret"
+  },
+  {
+    "user": "<enable>",
+    "password": "secret"
+  }
+]'
 
-credential_id=$(create_resource "$req" $ENDPOINT/boxen/$box_id/credentials)
+credential_ids=$(create_resources "$req" $ENDPOINT/boxen/$box_id/credentials)
 
 # Create a physical port at the network device (admin operation)
 req='{
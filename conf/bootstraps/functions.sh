@@ -32,6 +32,40 @@ except Exception as exc:
 }
 
 
+# Create many REST API resources at once, return their IDs
+function create_resources() {
+  req=$1
+  endpoint=$2
+
+  ids=$(curl -s -d "$req" \
+          -H "Content-Type: application/json" \
+          -X POST \
+          $endpoint | \
+       python -c "
+import sys, json
+
+rsp = {}
+
+try:
+    rsp = json.load(sys.stdin)
+
+    sys.stdout.write(' '.join('%s' % item['id'] for item in rsp))
+
+except Exception as exc:
+    if isinstance(rsp, list):
+        rsp = {}
+    sys.stderr.write('API error #%s (%s)\n' % (rsp.get('status', '?'), rsp.get('message', exc)))
+    sys.exit(1)
+")
+
+  if [ $? -ne 0 ]; then
+      return 1
+  fi
+
+  echo $ids
+}
+
+
 # Update REST API resource
 function update_resource() {
   endpoint=$1
@@ -51,6 +51,11 @@ with open('requirements.txt') as fl:
 
 params = {
     'install_requires': requires,
+    'extras_require': {
+        'async': ['aiohttp'],
+        'orjson': ['orjson'],
+        'ujson': ['ujson']
+    },
     'name': 'softboxen',
     'version': open(
         os.path.join('softboxen', '__init__.py')).read().split('\'')[1],
@@ -8,14 +8,47 @@
 import os
 
 from flask import Flask
+from flask import json
 from flask_marshmallow import Marshmallow
 from flask_sqlalchemy import SQLAlchemy
 
+from softboxen import jsoncodec
 from softboxen.api import config
 
 
+class JSONEncoder(json.JSONEncoder):
+    """Serialize JSON documents with configured JSON codec.
+
+    Standard library codec honors all Flask JSON options, other
+    codecs produce compact documents.
+    """
+
+    def encode(self, o):
+        codec = jsoncodec.get_codec(app.config['SOFTBOXEN_JSON_CODEC'])
+        if codec is jsoncodec.Codec:
+            return super(JSONEncoder, self).encode(o)
+
+        return codec.dumps(
+            o, default=self.default, sort_keys=self.sort_keys,
+            indent=self.indent)
+
+
+class JSONDecoder(json.JSONDecoder):
+    """Parse JSON documents with configured JSON codec."""
+
+    def decode(self, s):
+        codec = jsoncodec.get_codec(app.config['SOFTBOXEN_JSON_CODEC'])
+        if codec is jsoncodec.Codec:
+            return super(JSONDecoder, self).decode(s)
+
+        return codec.loads(s)
+
+
 app = Flask(__name__)
 
+app.json_encoder = JSONEncoder
+app.json_decoder = JSONDecoder
+
 app.url_map.strict_slashes = False
 
 app.config.from_object(config.DefaultConfig)
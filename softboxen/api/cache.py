@@ -0,0 +1,225 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+# Serialized REST API responses cache invalidated by data revisions
+#
+import collections
+import functools
+import mmap
+import os
+import struct
+import threading
+
+from softboxen import exceptions
+from softboxen import lru
+from softboxen.api import app
+
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+BOXEN = 'boxen'
+"""Revision scope of the boxen collection, other scopes are box IDs"""
+
+
+def get_box_scope(box_id):
+    """Return revision scope of the box.
+
+    :param box_id: box ID, possibly a string taken from request URL
+    :returns: box revision scope or `None` if box ID is not an integer
+    """
+    try:
+        return int(box_id)
+
+    except (TypeError, ValueError):
+        return
+
+
+class Revisions(object):
+    """Revision counters of REST API data scopes kept in process memory.
+
+    Each scope (a box or the boxen collection) has its own counter
+    which is bumped whenever data within the scope is committed.
+
+    Counters start over with the process, `epoch` tells the sets of
+    counters apart.
+    """
+
+    def __init__(self):
+        self.epoch = os.urandom(4).hex()
+        self._revisions = collections.defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, scope):
+        """Return current revision of the scope.
+
+        :param scope: box ID or `BOXEN`
+        """
+        return self._revisions.get(scope, 0)
+
+    def bump(self, scopes):
+        """Advance revisions of the scopes.
+
+        :param scopes: iterable of box IDs or `BOXEN`
+        """
+        with self._lock:
+            for scope in scopes:
+                self._revisions[scope] += 1
+
+
+class SharedRevisions(object):
+    """Revision counters of REST API data scopes shared by processes.
+
+    Counters live in a memory-mapped file so that all REST API server
+    processes sharing the file see data committed by any of them.
+    Boxen are hashed into a fixed number of counters, boxen sharing a
+    counter get their revisions bumped together.
+
+    :param path: counters file path, created if missing
+    :raises: InvalidParameterValueError if the platform can not
+        lock files
+    """
+
+    SLOTS = 4096
+    """Number of counters in the file"""
+
+    HEADER = struct.Struct('<8s')
+    COUNTER = struct.Struct('<Q')
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise exceptions.InvalidParameterValueError(
+                parameter='SOFTBOXEN_SHARED_REVISIONS', value=path,
+                valid_values='none, this platform has no file locking')
+
+        size = self.HEADER.size + self.SLOTS * self.COUNTER.size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+        try:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+                os.write(self._fd, self.HEADER.pack(
+                    os.urandom(4).hex().encode()))
+
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self._mmap = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+        self.epoch = self.HEADER.unpack_from(self._mmap)[0].decode()
+
+    def _get_offset(self, scope):
+        slot = 0 if scope == BOXEN else 1 + scope % (self.SLOTS - 1)
+        return self.HEADER.size + slot * self.COUNTER.size
+
+    def get(self, scope):
+        """Return current revision of the scope.
+
+        :param scope: box ID or `BOXEN`
+        """
+        return self.COUNTER.unpack_from(
+            self._mmap, self._get_offset(scope))[0]
+
+    def bump(self, scopes):
+        """Advance revisions of the scopes.
+
+        :param scopes: iterable of box IDs or `BOXEN`
+        """
+        offsets = set(self._get_offset(scope) for scope in scopes)
+
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+            try:
+                for offset in offsets:
+                    revision = self.COUNTER.unpack_from(self._mmap, offset)[0]
+                    self.COUNTER.pack_into(self._mmap, offset, revision + 1)
+
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class ResponseCache(lru.LRUCache):
+    """LRU cache of serialized REST API responses.
+
+    Each response is stored along with the revision of the data it
+    has been built from and is only served while that revision is
+    current.
+
+    :param size: the maximum number of responses to keep
+    :param revisions: `Revisions` or `SharedRevisions` object
+    """
+
+    CacheEntry = collections.namedtuple(
+        'CacheEntry', ('revision', 'data', 'mimetype'))
+
+    def __init__(self, size, revisions):
+        super(ResponseCache, self).__init__(size)
+        self.revisions = revisions
+
+    def fetch(self, key, revision):
+        """Return the cached response built at the revision.
+
+        :param key: cache key e.g. request path and query
+        :param revision: current revision of the response data
+        :returns: `CacheEntry` or `None` if not cached or out of date
+        """
+        with self._lock:
+            entry = self._get(key)
+
+            if not entry or entry.revision != revision:
+                self._misses += 1
+                return
+
+            self._hits += 1
+
+            return entry
+
+    def store(self, key, revision, data, mimetype):
+        """Store the response built at the revision.
+
+        :param key: cache key e.g. request path and query
+        :param revision: revision of the data read before building
+            the response
+        :param data: serialized response body
+        :param mimetype: response media type
+        """
+        with self._lock:
+            self._put(key, self.CacheEntry(revision, data, mimetype))
+
+
+@functools.lru_cache(maxsize=None)
+def make_response_cache(size, revisions_path=None):
+    """Create response cache once per configuration.
+
+    :param size: the maximum number of responses to keep
+    :param revisions_path: shared revision counters file path or `None`
+        to keep revisions in process memory
+    """
+    if revisions_path:
+        revisions = SharedRevisions(revisions_path)
+
+    else:
+        revisions = Revisions()
+
+    return ResponseCache(size, revisions)
+
+
+def get_response_cache():
+    """Return response cache configured for REST API server.
+
+    :returns: `ResponseCache` object or `None` if caching is disabled
+    """
+    size = app.config.get('SOFTBOXEN_RESPONSE_CACHE_SIZE')
+    if size:
+        return make_response_cache(
+            size, app.config.get('SOFTBOXEN_SHARED_REVISIONS'))
@@ -16,3 +16,16 @@ class DefaultConfig(object):
     SOFTBOXEN_MGMT_LISTEN_PORT = 5000
     SOFTBOXEN_MGMT_SSL_CERT = None
     SOFTBOXEN_MGMT_SSL_KEY = None
+
+    # JSON library name, the fastest installed one if not set
+    SOFTBOXEN_JSON_CODEC = None
+
+    # Max number of GET responses to cache, no caching if not set
+    SOFTBOXEN_RESPONSE_CACHE_SIZE = 0
+
+    # File of data revisions shared by REST API server processes,
+    # each process keeps its own revisions if not set
+    SOFTBOXEN_SHARED_REVISIONS = None
+
+    # Max number of change feed records to keep, all are kept if not set
+    SOFTBOXEN_CHANGES_RETENTION = 0
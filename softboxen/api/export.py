@@ -0,0 +1,212 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import json
+import os
+import tempfile
+
+from werkzeug import exceptions as http_exceptions
+
+from softboxen import exceptions
+from softboxen.api import app
+from softboxen.api import views
+
+ROOT_FILE = 'root.json'
+"""Name of the file holding REST API service root document"""
+
+SUFFIX = '.json'
+"""Suffix of the files holding REST API documents"""
+
+SKIPPED_ENDPOINTS = frozenset(['show_changes'])
+"""Endpoints serving documents that make no sense in a static mirror"""
+
+
+def get_file_path(path):
+    """Turn REST API resource path into static mirror file path.
+
+    The file path is relative to the directory of the REST API service
+    root file. Each resource lives in its own file so that collection
+    members go into a directory named after the collection e.g.
+    `boxen.json` and `boxen/1.json`.
+
+    :param path: REST API resource path
+    :returns: file path or `None` if the path is not a REST API resource
+    """
+    path = path.rstrip('/')
+
+    if path == views.PREFIX:
+        return ROOT_FILE
+
+    if not path.startswith(views.PREFIX + '/'):
+        return
+
+    return path[len(views.PREFIX) + 1:] + SUFFIX
+
+
+def get_endpoint(path):
+    """Return the name of the view serving REST API resource path."""
+    try:
+        endpoint, _ = app.url_map.bind('').match(path, method='GET')
+
+    except http_exceptions.HTTPException:
+        return
+
+    return endpoint
+
+
+def relink(json_doc, links):
+    """Turn document hyperlinks into static mirror file paths.
+
+    Hyperlinks found in `_links` objects anywhere in the document,
+    including embedded documents, are replaced in place.
+
+    :param json_doc: parsed JSON document
+    :param links: a `set` collecting REST API paths of the hyperlinked
+        resources
+    :returns: the document
+    """
+    if isinstance(json_doc, list):
+        for item in json_doc:
+            relink(item, links)
+
+    elif isinstance(json_doc, dict):
+        for name, value in json_doc.items():
+            if name != '_links' or not isinstance(value, dict):
+                relink(value, links)
+                continue
+
+            for relation, link in value.items():
+                if not isinstance(link, str):
+                    continue
+
+                file_path = get_file_path(link)
+                if file_path is None:
+                    continue
+
+                if get_endpoint(link) in SKIPPED_ENDPOINTS:
+                    continue
+
+                links.add(link.rstrip('/'))
+                value[relation] = file_path
+
+    return json_doc
+
+
+def write_file(file_path, json_doc):
+    """Atomically replace file with JSON document.
+
+    The document is written into a temporary file next to the target
+    one and then moved into its place so that readers, possibly having
+    the file memory-mapped, never see it truncated or partially written.
+
+    :param file_path: path to the file to write
+    :param json_doc: JSON document to write
+    """
+    directory, file_name = os.path.split(file_path)
+
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix='.' + file_name + '.', suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(json_doc, f)
+
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def prune_files(directory, kept):
+    """Remove documents files left over from previous exports.
+
+    Files not holding REST API documents are left intact, directories
+    emptied by pruning are removed.
+
+    :param directory: static mirror directory
+    :param kept: a `set` of the paths of the files to keep
+    :returns: the number of removed files
+    """
+    pruned = 0
+
+    for dir_path, dir_names, file_names in os.walk(directory, topdown=False):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+
+            if not file_name.endswith(SUFFIX) or file_path in kept:
+                continue
+
+            os.unlink(file_path)
+
+            pruned += 1
+
+        if dir_path != directory and not os.listdir(dir_path):
+            os.rmdir(dir_path)
+
+    return pruned
+
+
+def export_static(directory):
+    """Dump all REST API documents into a tree of files.
+
+    Walks REST API resources starting from the service root and
+    writes each document into its own file. Hyperlinks are rewritten
+    into file paths relative to the service root file so that
+    `RestClient` can read the tree by `file://` URL pointing to that
+    file e.g. `file:///srv/softboxen/v1/root.json`.
+
+    Exporting into the directory of the previous export updates the
+    mirror in place. Files of the resources which are gone are removed
+    once all the current documents are written.
+
+    :param directory: directory to create the static mirror in
+    :returns: the number of exported documents
+    :raises: RestApiError if a document can not be exported
+    """
+    directory = os.path.join(directory, views.PREFIX.lstrip('/'))
+
+    client = app.test_client()
+
+    pending = [views.PREFIX]
+    exported = set()
+    written = set()
+
+    while pending:
+        path = pending.pop()
+        if path in exported:
+            continue
+
+        exported.add(path)
+
+        response = client.get(path)
+        if response.status_code != 200:
+            raise exceptions.RestApiError(
+                error='resource %s can not be exported: HTTP %s' % (
+                    path, response.status_code))
+
+        links = set()
+        json_doc = relink(response.get_json(), links)
+
+        file_path = os.path.join(directory, get_file_path(path))
+
+        write_file(file_path, json_doc)
+
+        written.add(file_path)
+
+        pending.extend(links - exported)
+
+    pruned = prune_files(directory, written)
+
+    app.logger.info(
+        'Exported %d REST API documents into %s, removed %d stale '
+        'ones', len(exported), directory, pruned)
+
+    return len(exported)
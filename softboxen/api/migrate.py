@@ -0,0 +1,69 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import logging
+
+import sqlalchemy
+
+from softboxen.api import db
+from softboxen.api import models  # noqa
+
+LOG = logging.getLogger(__name__)
+
+INDEX_PREFIX = 'ix_'
+"""Prefix of the names of the indexes managed by softboxen"""
+
+
+def upgrade_db():
+    """Bring existing DB schema up to date with the models.
+
+    Creates missing tables along with their indexes, then creates the
+    indexes declared on the models after the DB had been created and
+    drops softboxen indexes no longer declared on the models. Existing
+    data is left intact.
+
+    :returns: a list of the names of created indexes
+    """
+    db.create_all()
+
+    inspector = sqlalchemy.inspect(db.engine)
+
+    created = []
+
+    for table in db.metadata.sorted_tables:
+        existing = set(
+            index['name'] for index in inspector.get_indexes(table.name))
+
+        declared = set(index.name for index in table.indexes)
+
+        obsolete = set(
+            name for name in existing - declared
+            if name and name.startswith(INDEX_PREFIX))
+
+        if obsolete:
+            reflected_table = sqlalchemy.Table(
+                table.name, sqlalchemy.MetaData(), autoload=True,
+                autoload_with=db.engine)
+
+            for index in reflected_table.indexes:
+                if index.name in obsolete:
+                    LOG.info('Dropping index %s on table %s',
+                             index.name, table.name)
+
+                    index.drop(bind=db.engine)
+
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+
+            LOG.info('Creating index %s on table %s', index.name, table.name)
+
+            index.create(bind=db.engine)
+
+            created.append(index.name)
+
+    return created
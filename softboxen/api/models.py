@@ -6,9 +6,34 @@
 #
 import uuid
 
+from sqlalchemy.ext import compiler
+from sqlalchemy.sql import expression
+from sqlalchemy.sql import sqltypes
+
 from softboxen.api import db
 
 
+class NoCase(expression.FunctionElement):
+    """Column value compared case-insensitively.
+
+    Renders as `column COLLATE NOCASE` for SQLite and `lower(column)`
+    for other DBs. Either form can back an index, to make use of it
+    the compared values must be lower-cased.
+    """
+    name = 'nocase'
+    type = sqltypes.String()
+
+
+@compiler.compiles(NoCase)
+def compile_nocase(element, compiler, **kwargs):
+    return 'lower(%s)' % compiler.process(element.clauses, **kwargs)
+
+
+@compiler.compiles(NoCase, 'sqlite')
+def compile_nocase_sqlite(element, compiler, **kwargs):
+    return '%s COLLATE NOCASE' % compiler.process(element.clauses, **kwargs)
+
+
 class Box(db.Model):
     id = db.Column(db.Integer(), primary_key=True)
     vendor = db.Column(db.String(64), nullable=False)
@@ -26,13 +51,16 @@ class Box(db.Model):
     routes = db.relationship('Route', backref='box', lazy='dynamic')
 
 
+db.Index('ix_box_uuid_nocase', NoCase(Box.uuid))
+
+
 class Credential(db.Model):
     id = db.Column(db.Integer(), primary_key=True)
     protocol = db.Column(
         db.Enum('password'), nullable=False, default='password')
     user = db.Column(db.String(64), nullable=True)
     password = db.Column(db.String(32), nullable=True)
-    box_id = db.Column(db.Integer, db.ForeignKey('box.id'))
+    box_id = db.Column(db.Integer, db.ForeignKey('box.id'), index=True)
 
 
 class Port(db.Model):
@@ -52,7 +80,14 @@ class Port(db.Model):
     box_id = db.Column(db.Integer, db.ForeignKey('box.id'))
 
 
+db.Index('ix_port_box_id_name_nocase', Port.box_id, NoCase(Port.name))
+
+
 class VlanPort(db.Model):
+    __table_args__ = (
+        db.Index('ix_vlan_port_box_id_port_id_role',
+                 'box_id', 'port_id', 'role'),
+    )
     id = db.Column(db.Integer(), primary_key=True)
     vlan_num = db.Column(db.Integer(), nullable=False)
     name = db.Column(db.String(64))
@@ -69,7 +104,7 @@ class VlanPort(db.Model):
     unicast_reverse_path_forwarding = db.Column(db.Boolean(), default=False)
     load_interval = db.Column(db.Integer())
     mpls_ip = db.Column(db.String(32))
-    port_id = db.Column(db.Integer, db.ForeignKey('port.id'))
+    port_id = db.Column(db.Integer, db.ForeignKey('port.id'), index=True)
     box_id = db.Column(db.Integer, db.ForeignKey('box.id'))
 
 
@@ -78,4 +113,12 @@ class Route(db.Model):
     dst = db.Column(db.String(23))
     gw = db.Column(db.String(23))
     metric = db.Column(db.Integer(), default=1)
-    box_id = db.Column(db.Integer, db.ForeignKey('box.id'))
+    box_id = db.Column(db.Integer, db.ForeignKey('box.id'), index=True)
+
+
+class Change(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
+    id = db.Column(db.Integer(), primary_key=True)
+    action = db.Column(
+        db.Enum('create', 'update', 'delete'), nullable=False)
+    path = db.Column(db.String(), nullable=False)
@@ -5,16 +5,147 @@
 # License: https://github.com/etingof/softboxen/LICENSE.rst
 #
 
+import functools
+import re
+
+import flask
+from marshmallow import missing
+from marshmallow import utils
+from werkzeug import urls
+
+from softboxen.api import app
 from softboxen.api import ma
 from softboxen.api import models
 
+ATTR_PARAM = re.compile(r'\s*<\s*(\S*)\s*>\s*')
+"""`URLFor` parameter taken from the serialized object attribute"""
+
+
+@functools.lru_cache(maxsize=None)
+def compile_url_template(endpoint, params):
+    """Compile endpoint URL rule into a string formatting template.
+
+    Static parts of the rule are quoted and constant parameters are
+    filled in once, leaving placeholders for parameters taken from the
+    serialized object.
+
+    :param endpoint: Flask endpoint name
+    :param params: tuple of `(name, value)` pairs as passed to `URLFor`
+    :returns: tuple of URL path template and `(attribute, to_url)` pairs
+        feeding its placeholders or `None` if the URL can only be built
+        by `flask.url_for`
+    """
+    rules = list(app.url_map.iter_rules(endpoint))
+
+    if (len(rules) != 1 or app.url_default_functions or
+            app.url_map.host_matching):
+        return
+
+    rule = rules[0]
+
+    params = dict(params)
+
+    if rule.subdomain or rule.defaults or set(params) != rule.arguments:
+        return
+
+    try:
+        # domain part of the rule is empty, path part follows the separator
+        trace = rule._trace[1:]
+        converters = rule._converters
+
+    except AttributeError:
+        # Werkzeug internals are not there, let `flask.url_for` build URLs
+        return
+
+    template = []
+    attrs = []
+
+    for is_dynamic, data in trace:
+        if not is_dynamic:
+            template.append(urls.url_quote(
+                data, app.url_map.charset, safe='/:|+').replace('%', '%%'))
+            continue
+
+        to_url = converters[data].to_url
+
+        match = ATTR_PARAM.match(str(params[data]))
+        if match:
+            template.append('%s')
+            attrs.append((match.group(1), to_url))
+
+        else:
+            template.append(to_url(params[data]).replace('%', '%%'))
+
+    return '/' + ''.join(template).lstrip('/'), tuple(attrs)
+
+
+def get_url_adapter():
+    """Return URL adapter of the current request.
+
+    :returns: `werkzeug.routing.MapAdapter` object or `None` if
+        there is no request context or it can not be looked up
+    """
+    if not flask.has_request_context():
+        return
+
+    # Flask 2.2+ exposes request context, the older ones a stack of them
+    ctx = getattr(flask.globals, 'request_ctx', None)
+    if ctx is None:
+        ctx_stack = getattr(flask.globals, '_request_ctx_stack', None)
+        ctx = getattr(ctx_stack, 'top', None)
+
+    return getattr(ctx, 'url_adapter', None)
+
+
+class URLFor(ma.URLFor):
+    """Hyperlink to Flask endpoint built from precompiled template.
+
+    Produces the same URL as `ma.URLFor` but looks up and compiles the
+    endpoint URL rule only once, then fills it in by string formatting.
+    Falls back to `flask.url_for` whenever it could build a different
+    URL (e.g. external one) or Flask and Werkzeug internals it relies
+    upon are not available.
+    """
+
+    def _serialize(self, value, key, obj):
+        template = compile_url_template(
+            self.endpoint, tuple(sorted(self.params.items())))
+
+        url_adapter = get_url_adapter()
+
+        if template is None or url_adapter is None or url_adapter.subdomain:
+            return super(URLFor, self)._serialize(value, key, obj)
+
+        path, attrs = template
+
+        values = []
+
+        for attr, to_url in attrs:
+            attr_value = utils.get_value(obj, attr, default=missing)
+
+            if attr_value is None:
+                return
+
+            if attr_value is missing:
+                raise AttributeError(
+                    '%r is not a valid attribute of %r' % (attr, obj))
+
+            # integer IDs need no quoting
+            if type(attr_value) is int:
+                values.append(str(attr_value))
+
+            else:
+                values.append(to_url(attr_value))
+
+        return url_adapter.script_name.rstrip('/') + path % tuple(values)
+
 
 class RootSchema(ma.ModelSchema):
     class Meta:
-        fields = ('description', 'boxen', '_links')
+        fields = ('description', 'boxen', 'changes', '_links')
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_root')})
+        {'self': URLFor('show_root')})
 
 
 class BoxSchema(ma.ModelSchema):
@@ -22,23 +153,27 @@ class BoxSchema(ma.ModelSchema):
         model = models.Box
         fields = ('id', 'vendor', 'model', 'version', 'uuid', 'description',
                   'hostname', 'mgmt_address', 'credentials',
-                  'ports', 'routes', '_links')
+                  'ports', 'routes', 'snapshot', '_links')
 
     credentials = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor('show_credentials', box_id='<id>')}})
+            'self': URLFor('show_credentials', box_id='<id>')}})
 
     ports = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor('show_ports', box_id='<id>')}})
+            'self': URLFor('show_ports', box_id='<id>')}})
 
     routes = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor('show_routes', box_id='<id>')}})
+            'self': URLFor('show_routes', box_id='<id>')}})
+
+    snapshot = ma.Hyperlinks(
+        {'_links': {
+            'self': URLFor('show_box_snapshot', id='<id>')}})
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_box', id='<id>'),
-         'collection': ma.URLFor('show_boxen')})
+        {'self': URLFor('show_box', id='<id>'),
+         'collection': URLFor('show_boxen')})
 
 
 class BoxenSchema(ma.ModelSchema):
@@ -53,12 +188,12 @@ class BoxenSchema(ma.ModelSchema):
                 '_links')
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor('show_box', id='<id>')})
+            {'self': URLFor('show_box', id='<id>')})
 
     members = ma.Nested(BoxSchema, many=True)
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_boxen')})
+        {'self': URLFor('show_boxen')})
 
 
 class CredentialSchema(ma.ModelSchema):
@@ -69,11 +204,11 @@ class CredentialSchema(ma.ModelSchema):
 
     box = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor('show_box', id='<box_id>')}})
+            'self': URLFor('show_box', id='<box_id>')}})
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_credential', box_id='<box_id>', id='<id>'),
-         'collection': ma.URLFor('show_credentials', box_id='<box_id>')})
+        {'self': URLFor('show_credential', box_id='<box_id>', id='<id>'),
+         'collection': URLFor('show_credentials', box_id='<box_id>')})
 
 
 class CredentialsSchema(ma.ModelSchema):
@@ -86,13 +221,13 @@ class CredentialsSchema(ma.ModelSchema):
             fields = ('_links',)
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor(
+            {'self': URLFor(
                 'show_credential', box_id='<box_id>', id='<id>')})
 
     members = ma.Nested(CredentialSchema, many=True)
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_credentials', box_id='<box_id>')})
+        {'self': URLFor('show_credentials', box_id='<box_id>')})
 
 
 class PortSchema(ma.ModelSchema):
@@ -105,29 +240,29 @@ class PortSchema(ma.ModelSchema):
 
     access_vlan = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor(
+            'self': URLFor(
                 'show_vlan_ports', box_id='<box_id>', port_id='<id>',
                 role='access')}})
 
     trunk_vlans = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor(
+            'self': URLFor(
                 'show_vlan_ports', box_id='<box_id>', port_id='<id>',
                 role='trunk')}})
 
     trunk_native_vlan = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor(
+            'self': URLFor(
                 'show_vlan_ports', box_id='<box_id>', port_id='<id>',
                 role='native')}})
 
     box = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor('show_box', id='<box_id>')}})
+            'self': URLFor('show_box', id='<box_id>')}})
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_port', box_id='<box_id>', id='<id>'),
-         'collection': ma.URLFor('show_ports', box_id='<box_id>')})
+        {'self': URLFor('show_port', box_id='<box_id>', id='<id>'),
+         'collection': URLFor('show_ports', box_id='<box_id>')})
 
 
 class PortsSchema(ma.ModelSchema):
@@ -140,13 +275,13 @@ class PortsSchema(ma.ModelSchema):
             fields = ('_links',)
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor(
+            {'self': URLFor(
                 'show_port', box_id='<box_id>', id='<id>')})
 
     members = ma.Nested(PortSchema, many=True)
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_ports', box_id='<box_id>')})
+        {'self': URLFor('show_ports', box_id='<box_id>')})
 
 
 class VlanPortSchema(ma.ModelSchema):
@@ -165,8 +300,8 @@ class VlanPortSchema(ma.ModelSchema):
             fields = ('_links',)
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor('show_port', box_id='<box_id>', id='<id>'),
-             'collection': ma.URLFor('show_ports', box_id='<box_id>')})
+            {'self': URLFor('show_port', box_id='<box_id>', id='<id>'),
+             'collection': URLFor('show_ports', box_id='<box_id>')})
 
     class BoxSchema(ma.ModelSchema):
         class Meta:
@@ -174,14 +309,14 @@ class VlanPortSchema(ma.ModelSchema):
             fields = ('_links',)
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor('show_box', id='<id>'),
-             'collection': ma.URLFor('show_boxen')})
+            {'self': URLFor('show_box', id='<id>'),
+             'collection': URLFor('show_boxen')})
 
     _links = ma.Hyperlinks({
-        'self': ma.URLFor(
+        'self': URLFor(
             'show_vlan_port', box_id='<box_id>', port_id='<port_id>',
             role='<role>', id='<id>'),
-        'collection': ma.URLFor(
+        'collection': URLFor(
             'show_vlan_ports', box_id='<box_id>', port_id='<port_id>',
             role='<role>')})
 
@@ -201,14 +336,14 @@ class VlanPortsSchema(ma.ModelSchema):
             fields = ('_links',)
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor(
+            {'self': URLFor(
                 'show_vlan_port', box_id='<box_id>', port_id='<port_id>',
                 role='<role>', id='<id>')})
 
     members = ma.Nested(VlanPortSchema, many=True)
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor(
+        {'self': URLFor(
             'show_vlan_ports', box_id='<box_id>', port_id='<port_id>',
             role='<role>')})
 
@@ -220,11 +355,11 @@ class RouteSchema(ma.ModelSchema):
 
     box = ma.Hyperlinks(
         {'_links': {
-            'self': ma.URLFor('show_box', id='<box_id>')}})
+            'self': URLFor('show_box', id='<box_id>')}})
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_route', box_id='<box_id>', id='<id>'),
-         'collection': ma.URLFor('show_routes', box_id='<box_id>')})
+        {'self': URLFor('show_route', box_id='<box_id>', id='<id>'),
+         'collection': URLFor('show_routes', box_id='<box_id>')})
 
 
 class RoutesSchema(ma.ModelSchema):
@@ -237,10 +372,28 @@ class RoutesSchema(ma.ModelSchema):
             fields = ('_links',)
 
         _links = ma.Hyperlinks(
-            {'self': ma.URLFor(
+            {'self': URLFor(
                 'show_route', box_id='<box_id>', id='<id>')})
 
     members = ma.Nested(RouteSchema, many=True)
 
     _links = ma.Hyperlinks(
-        {'self': ma.URLFor('show_routes', box_id='<box_id>')})
+        {'self': URLFor('show_routes', box_id='<box_id>')})
+
+
+class ChangeSchema(ma.ModelSchema):
+    class Meta:
+        model = models.Change
+        fields = ('revision', 'action', 'path')
+
+    revision = ma.Integer(attribute='id')
+
+
+class ChangesSchema(ma.ModelSchema):
+    class Meta:
+        fields = ('revision', 'changes', '_links')
+
+    changes = ma.Nested(ChangeSchema, many=True)
+
+    _links = ma.Hyperlinks(
+        {'self': URLFor('show_changes')})
@@ -5,17 +5,39 @@
 # License: https://github.com/etingof/softboxen/LICENSE.rst
 #
 
+import functools
+import types
+
 import flask
+import sqlalchemy
 from sqlalchemy import func
+from sqlalchemy import orm
 from werkzeug import exceptions
 
 from softboxen.api import app
+from softboxen.api import cache
 from softboxen.api import db
+from softboxen.api import ma
 from softboxen.api import models
 from softboxen.api import schemas
 
 PREFIX = '/softboxen/v1'
 
+EXPAND_ARG = 'expand'
+"""Query parameter listing collection members to expand"""
+
+FIELDS_ARG = 'fields'
+"""Query parameter listing the fields to serialize"""
+
+LIMIT_ARG = 'limit'
+"""Query parameter limiting the number of collection members per page"""
+
+AFTER_ARG = 'after'
+"""Query parameter carrying the ID of the last member of previous page"""
+
+RESERVED_ARGS = frozenset([EXPAND_ARG, FIELDS_ARG, LIMIT_ARG, AFTER_ARG])
+"""Query parameters which are not search terms"""
+
 
 @app.errorhandler(exceptions.HTTPException)
 def flask_exception_handler(exc):
@@ -41,11 +63,26 @@ def all_exception_handler(exc):
     return response
 
 
+@app.after_request
+def add_validators(response):
+    """Let clients make conditional requests for GET responses."""
+    if (flask.request.method != 'GET' or
+            response.status_code != 200 or response.direct_passthrough):
+        return response
+
+    response.add_etag()
+
+    return response.make_conditional(flask.request)
+
+
 def search_model(model, query):
 
     known_columns = model.__table__.columns.keys()
 
     for search_column in flask.request.args:
+        if search_column in RESERVED_ARGS:
+            continue
+
         if search_column not in known_columns:
             raise exceptions.NotFound(
                 'Search term %s is not supported' % search_column)
@@ -54,11 +91,673 @@ def search_model(model, query):
         if search_terms:
             search_terms = [term.lower() for term in search_terms]
             query = query.filter(
-                func.lower(getattr(model, search_column)).in_(search_terms))
+                models.NoCase(
+                    getattr(model, search_column)).in_(search_terms))
 
     return query
 
 
+def get_int_arg(name, minimum=0):
+    """Return integer query parameter value.
+
+    :param name: query parameter name
+    :param minimum: the lowest allowed value
+    :returns: parameter value or `None` if not present
+    :raises: BadRequest if the value is not an integer or is too low
+    """
+    value = flask.request.args.get(name)
+    if value is None:
+        return
+
+    try:
+        value = int(value)
+
+    except ValueError:
+        value = None
+
+    if value is None or value < minimum:
+        raise exceptions.BadRequest(
+            'Query parameter %s must be an integer not less '
+            'than %d' % (name, minimum))
+
+    return value
+
+
+def paginate(model, query):
+    """Fetch a page of collection members.
+
+    Collection members are paged by their IDs (keyset pagination) so
+    that fetching each page costs the same no matter how far into the
+    collection it is. Pagination is requested by the `limit` query
+    parameter. The `after` query parameter resumes the listing
+    after the member with that ID.
+
+    :param model: collection members model class
+    :param query: collection members query
+    :returns: a tuple of collection members on the page, total number
+        of members in the collection and the URL of the next page or
+        `None` if there are no more members
+    """
+    limit = get_int_arg(LIMIT_ARG, minimum=1)
+    if limit is None:
+        members = query.all()
+        return members, len(members), None
+
+    count = query.count()
+
+    query = query.order_by(model.id)
+
+    after = get_int_arg(AFTER_ARG)
+    if after is not None:
+        query = query.filter(model.id > after)
+
+    members = query.limit(limit + 1).all()
+    if len(members) <= limit:
+        return members, count, None
+
+    members = members[:limit]
+
+    args = flask.request.args.to_dict(flat=False)
+    args[AFTER_ARG] = members[-1].id
+
+    next_url = flask.url_for(
+        flask.request.endpoint, **dict(flask.request.view_args, **args))
+
+    return members, count, next_url
+
+
+def add_next_link(json_doc, next_url):
+    """Link collection document to its next page.
+
+    :param json_doc: serialized collection document
+    :param next_url: next page URL or `None` if this page is the last one
+    :returns: collection document
+    """
+    if next_url:
+        json_doc['_links']['next'] = next_url
+
+    return json_doc
+
+
+def parse_fields():
+    """Parse sparse fieldset request.
+
+    Field names can be comma-separated or passed in repeated query
+    parameters. Hyperlinks to the document itself are always
+    serialized.
+
+    :returns: a `set` of field names or `None` if all fields are
+        requested
+    """
+    fields = set()
+
+    for value in flask.request.args.getlist(FIELDS_ARG):
+        fields.update(name for name in value.split(',') if name)
+
+    if fields:
+        fields.add('_links')
+        return fields
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema_fields(schema_class):
+    """Return the names of the fields serialized by the schema.
+
+    :param schema_class: schema class
+    :returns: a `frozenset` of field names
+    """
+    return frozenset(schema_class().fields)
+
+
+def make_schema(schema_class, fields=None, **kwargs):
+    """Instantiate schema serializing only the requested fields.
+
+    Requested fields the schema does not have are ignored so that
+    clients can ask for the fields they know of.
+
+    :param schema_class: schema class to instantiate
+    :param fields: field names to serialize, all fields are
+        serialized if not given
+    :param kwargs: schema options
+    :returns: schema object
+    """
+    if fields:
+        fields = get_schema_fields(schema_class).intersection(fields)
+
+    return schema_class(only=fields, **kwargs)
+
+
+def parse_expand():
+    """Parse expansion request into a tree of expansions.
+
+    Expansions are dot-separated paths e.g. `members.trunk_vlans`.
+    Multiple expansions can be comma-separated or passed in
+    repeated query parameters.
+
+    :returns: a `dict` of expanded names to nested expansions
+    """
+    expand = {}
+
+    for value in flask.request.args.getlist(EXPAND_ARG):
+        for expansion in value.split(','):
+            node = expand
+            for name in expansion.split('.'):
+                if name:
+                    node = node.setdefault(name, {})
+
+    return expand
+
+
+@functools.lru_cache(maxsize=None)
+def get_nested_fields(schema_class):
+    """Return the names of the fields serialized by nested schemas.
+
+    :param schema_class: schema class
+    :returns: a `frozenset` of field names
+    """
+    return frozenset(
+        name for name, field in schema_class().fields.items()
+        if isinstance(field, ma.Nested))
+
+
+def eager_load(query, model, schema_class, fields=None):
+    """Load related objects serialized by the schema along with the query.
+
+    Otherwise each serialized object would lazily load its related
+    objects by separate queries. Single related objects are joined to
+    the queried rows, related collections are fetched by one more
+    query.
+
+    :param query: model objects query
+    :param model: model class
+    :param schema_class: schema class to serialize the objects with
+    :param fields: serialized fields, all fields if not given
+    :returns: model objects query
+    """
+    names = get_nested_fields(schema_class)
+    if fields:
+        names = names.intersection(fields)
+
+    relationships = sqlalchemy.inspect(model).relationships
+
+    options = []
+
+    for name in sorted(names):
+        if name not in relationships:
+            continue
+
+        if relationships[name].uselist:
+            options.append(orm.selectinload(getattr(model, name)))
+
+        else:
+            options.append(orm.joinedload(getattr(model, name)))
+
+    return query.options(*options)
+
+
+def eager_load_members(query, model, member_schema):
+    """Eager-load related objects of collection members to be embedded.
+
+    :param query: collection members query
+    :param model: collection members model class
+    :param member_schema: schema class to serialize members with
+    :returns: collection members query
+    """
+    if 'members' not in parse_expand():
+        return query
+
+    return eager_load(query, model, member_schema, parse_fields())
+
+
+def embed_members(json_doc, members, member_schema, expand=None,
+                  fields=None):
+    """Embed full documents of collection members.
+
+    Serialized members are put under `_embedded` key of the
+    collection document. Sub-collections of the members can be
+    further embedded into members' `_embedded` documents.
+
+    :param json_doc: serialized collection document
+    :param members: collection members model objects
+    :param member_schema: schema class to serialize members with
+    :param expand: expansions tree, taken from the request if not given
+    :param fields: members fields to serialize, all fields are
+        serialized if not given
+    :returns: collection document
+    """
+    if expand is None:
+        expand = parse_expand()
+
+    for name in expand:
+        if name != 'members':
+            raise exceptions.BadRequest(
+                'Collection %s can not be expanded' % name)
+
+    if 'members' not in expand:
+        return json_doc
+
+    member_docs = make_schema(
+        member_schema, fields, many=True).dump(members)
+
+    if members:
+        sub_collections = SUB_COLLECTIONS.get(type(members[0]), {})
+
+        for name in expand['members']:
+            if name not in sub_collections:
+                raise exceptions.BadRequest(
+                    'Member %s can not be expanded' % name)
+
+        for name, expansion in expand['members'].items():
+            sub_collection = sub_collections[name]
+            sub_members = sub_collection.load(members)
+
+            for member, member_doc in zip(members, member_docs):
+                embedded = member_doc.setdefault('_embedded', {})
+                embedded[name] = sub_collection.dump(
+                    member, sub_members[member.id], {'members': expansion})
+
+    json_doc['_embedded'] = {
+        'members': member_docs
+    }
+
+    return json_doc
+
+
+class SubCollection(object):
+    """Serializer of model object sub-collection.
+
+    Sub-collections of many model objects are loaded by one query
+    rather than by a query per object.
+
+    :param model: sub-collection members model class
+    :param parent_column: name of the members column referring
+        to the model object owning the sub-collection
+    :param collection_schema: schema class to serialize the
+        sub-collection with
+    :param member_schema: schema class to serialize members with
+    :param get_ids: callable returning a `dict` of the IDs the
+        sub-collection document links to, given the owning object
+    :param criteria: members columns values to select members by
+    """
+
+    CHUNK_SIZE = 500
+    """Maximum number of owning objects to load sub-collections of
+    in one query"""
+
+    def __init__(self, model, parent_column, collection_schema,
+                 member_schema, get_ids, **criteria):
+        self._model = model
+        self._parent_column = parent_column
+        self._collection_schema = collection_schema
+        self._member_schema = member_schema
+        self._get_ids = get_ids
+        self._criteria = criteria
+
+    def load(self, parents):
+        """Fetch sub-collections members of the model objects.
+
+        :param parents: model objects owning the sub-collections
+        :returns: a `dict` of lists of members by owning object ID
+        """
+        members = {parent.id: [] for parent in parents}
+
+        parent_ids = list(members)
+        parent_column = getattr(self._model, self._parent_column)
+
+        for idx in range(0, len(parent_ids), self.CHUNK_SIZE):
+            query = (
+                self._model
+                .query
+                .filter_by(**self._criteria)
+                .filter(parent_column.in_(
+                    parent_ids[idx:idx + self.CHUNK_SIZE]))
+                .order_by(self._model.id))
+
+            query = eager_load(query, self._model, self._member_schema)
+
+            for member in query:
+                members[getattr(member, self._parent_column)].append(member)
+
+        return members
+
+    def dump(self, parent, members, expand):
+        """Serialize sub-collection.
+
+        :param parent: model object owning the sub-collection
+        :param members: sub-collection members
+        :param expand: expansions tree
+        :returns: sub-collection document
+        """
+        response = dict(
+            self._get_ids(parent), members=members, count=len(members))
+
+        schema = self._collection_schema()
+        return embed_members(
+            schema.dump(response), members, self._member_schema, expand)
+
+    def __call__(self, parent, expand):
+        return self.dump(parent, self.load([parent])[parent.id], expand)
+
+
+def get_box_ids(box):
+    return {'box_id': box.id}
+
+
+def vlan_ports_sub_collection(role):
+
+    def get_port_ids(port):
+        return {'box_id': port.box_id, 'port_id': port.id, 'role': role}
+
+    return SubCollection(
+        models.VlanPort, 'port_id', schemas.VlanPortsSchema,
+        schemas.VlanPortSchema, get_port_ids, role=role)
+
+
+SUB_COLLECTIONS = {
+    models.Box: {
+        'credentials': SubCollection(
+            models.Credential, 'box_id', schemas.CredentialsSchema,
+            schemas.CredentialSchema, get_box_ids),
+        'ports': SubCollection(
+            models.Port, 'box_id', schemas.PortsSchema,
+            schemas.PortSchema, get_box_ids),
+        'routes': SubCollection(
+            models.Route, 'box_id', schemas.RoutesSchema,
+            schemas.RouteSchema, get_box_ids)
+    },
+    models.Port: {
+        'access_vlan': vlan_ports_sub_collection('access'),
+        'trunk_vlans': vlan_ports_sub_collection('trunk'),
+        'trunk_native_vlan': vlan_ports_sub_collection('native')
+    }
+}
+"""Serializers of expandable member sub-collections"""
+
+SNAPSHOT_EXPAND = {
+    'credentials': {'members': {}},
+    'ports': {
+        'members': {
+            'access_vlan': {},
+            'trunk_vlans': {},
+            'trunk_native_vlan': {}
+        }
+    },
+    'routes': {'members': {}}
+}
+"""Expansions embedding all sub-resources of a box into its snapshot"""
+
+SNAPSHOT_VLAN_ROLES = {
+    'access_vlan': 'access',
+    'trunk_vlans': 'trunk',
+    'trunk_native_vlan': 'native'
+}
+"""VLAN port roles by the names of port sub-collections"""
+
+SNAPSHOT_SKIPPED_COLUMNS = frozenset(['id', 'box_id', 'port_id', 'role'])
+"""Model columns set by the server on snapshot restore"""
+
+SINCE_ARG = 'since'
+"""Query parameter carrying the last revision known to the client"""
+
+CHANGE_PATHS = {
+    models.Box: lambda url_for, obj: url_for(
+        'show_box', id=obj.id),
+    models.Credential: lambda url_for, obj: url_for(
+        'show_credential', box_id=obj.box_id, id=obj.id),
+    models.Port: lambda url_for, obj: url_for(
+        'show_port', box_id=obj.box_id, id=obj.id),
+    models.VlanPort: lambda url_for, obj: url_for(
+        'show_vlan_port', box_id=obj.box_id, port_id=obj.port_id,
+        role=obj.role, id=obj.id),
+    models.Route: lambda url_for, obj: url_for(
+        'show_route', box_id=obj.box_id, id=obj.id)
+}
+"""Builders of paths to the changed model objects"""
+
+
+PARENT_KEYS = ('box_id', 'port_id')
+"""Foreign keys of model objects to their parent objects"""
+
+
+def is_detached(obj):
+    """Tell whether the object has been detached from its parent.
+
+    :param obj: model object updated by the flush
+    """
+    state = sqlalchemy.inspect(obj)
+
+    for key in PARENT_KEYS:
+        if key in state.attrs and getattr(obj, key) is None:
+            if state.attrs[key].history.deleted:
+                return True
+
+    return False
+
+
+def get_committed(obj):
+    """Return column values of the object as they were before the flush.
+
+    :param obj: model object updated by the flush
+    :returns: an object carrying column values as attributes
+    """
+    state = sqlalchemy.inspect(obj)
+
+    values = {}
+
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        values[attr.key] = (
+            history.deleted[0] if history.deleted
+            else getattr(obj, attr.key))
+
+    return types.SimpleNamespace(**values)
+
+
+CHANGED_SCOPES = 'softboxen_changed_scopes'
+"""Session info key collecting revision scopes changed by transaction"""
+
+
+@sqlalchemy.event.listens_for(db.session, 'after_flush')
+def record_changes(session, flush_context):
+    """Log model objects created, updated or deleted by the flush.
+
+    Each logged change is assigned the next revision number of the
+    REST API data. Changes are written in the same transaction as
+    the objects themselves.
+
+    Revision scopes of the changed objects are collected to advance
+    on commit.
+    """
+    if flask.has_request_context():
+        url_for = flask.url_for
+
+    else:
+        # Request context would tear down the session being flushed
+        url_adapter = app.url_map.bind('localhost')
+
+        def url_for(endpoint, **values):
+            return url_adapter.build(endpoint, values)
+
+    paths = {'create': [], 'update': [], 'delete': []}
+
+    scopes = session.info.setdefault(CHANGED_SCOPES, set())
+
+    for action, objs in (('create', session.new),
+                         ('update', session.dirty),
+                         ('delete', session.deleted)):
+        for obj in objs:
+            get_path = CHANGE_PATHS.get(type(obj))
+            if get_path is None:
+                continue
+
+            change = action
+
+            if action == 'update':
+                if not session.is_modified(obj):
+                    continue
+
+                if is_detached(obj):
+                    # ORM detaches rather than deletes the children
+                    # of deleted parents, REST API reports them gone
+                    obj = get_committed(obj)
+                    change = 'delete'
+
+            paths[change].append(get_path(url_for, obj))
+
+            if isinstance(obj, models.Box):
+                scopes.update((cache.get_box_scope(obj.id), cache.BOXEN))
+
+            else:
+                scopes.add(cache.get_box_scope(obj.box_id))
+
+    changes = []
+
+    for action in ('create', 'update', 'delete'):
+        # Parents are created before and deleted after their children
+        paths[action].sort(key=len, reverse=action == 'delete')
+
+        changes.extend(
+            {'action': action, 'path': path} for path in paths[action])
+
+    if changes:
+        session.execute(models.Change.__table__.insert(), changes)
+
+        retention = app.config.get('SOFTBOXEN_CHANGES_RETENTION')
+        if retention:
+            prune_changes(session, retention)
+
+
+def prune_changes(session, keep):
+    """Drop all but the latest records of the change feed.
+
+    Clients asking for the changes since a dropped revision are
+    told to replicate all resources anew.
+
+    :param session: DB session
+    :param keep: the number of the latest changes to keep
+    :returns: the number of dropped changes
+    """
+    revision = session.query(func.max(models.Change.id)).scalar()
+    if revision is None:
+        return 0
+
+    result = session.execute(
+        models.Change.__table__.delete().where(
+            models.Change.id <= revision - keep))
+
+    return result.rowcount
+
+
+@sqlalchemy.event.listens_for(db.session, 'after_commit')
+def invalidate_responses(session):
+    """Advance revisions of the scopes changed by the transaction.
+
+    Cached responses built at the previous revisions are no longer
+    served.
+    """
+    scopes = session.info.pop(CHANGED_SCOPES, None)
+
+    response_cache = cache.get_response_cache()
+
+    if scopes and response_cache is not None:
+        # objects with non-integer box IDs are never cached
+        scopes.discard(None)
+        response_cache.revisions.bump(scopes)
+
+
+@sqlalchemy.event.listens_for(db.session, 'after_rollback')
+def discard_changed_scopes(session):
+    session.info.pop(CHANGED_SCOPES, None)
+
+
+def cached(box_arg=None):
+    """Serve GET view responses from the response cache.
+
+    Responses are cached by request path and query and are served
+    until any data of their box is committed. Strong `ETag` is built
+    from the box revision so that conditional requests are answered
+    without calling the view.
+
+    Boxen collection responses embedding sub-collections of the
+    boxen are not cached.
+
+    :param box_arg: name of the view argument carrying box ID or `None`
+        for the views of the boxen collection
+    """
+    def decorator(view):
+
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            response_cache = cache.get_response_cache()
+            if response_cache is None:
+                return view(**kwargs)
+
+            if box_arg is None:
+                # Boxen sub-collections are versioned by box scopes
+                if parse_expand().get('members'):
+                    return view(**kwargs)
+
+                scope = cache.BOXEN
+
+            else:
+                scope = cache.get_box_scope(kwargs[box_arg])
+                if scope is None:
+                    return view(**kwargs)
+
+            # Read before the data so that concurrent commits
+            # make the response out of date
+            revision = response_cache.revisions.get(scope)
+
+            etag = '%s-%s-%d' % (
+                response_cache.revisions.epoch, scope, revision)
+
+            if flask.request.if_none_match.contains(etag):
+                response = app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            key = flask.request.script_root + flask.request.full_path
+
+            entry = response_cache.fetch(key, revision)
+            if entry:
+                response = app.response_class(
+                    entry.data, mimetype=entry.mimetype)
+
+            else:
+                response = flask.make_response(view(**kwargs))
+
+                if response.status_code != 200:
+                    return response
+
+                response_cache.store(
+                    key, revision, response.get_data(), response.mimetype)
+
+            response.set_etag(etag)
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def add_many(objs, schema_class):
+    """Create many model objects in a single transaction.
+
+    Backs bulk POST requests carrying a JSON array of new objects.
+
+    :param objs: new model objects
+    :param schema_class: schema class to serialize the objects with
+    :returns: response carrying serialized objects and status code
+    """
+    db.session.add_all(objs)
+
+    db.session.commit()
+
+    schema = make_schema(schema_class, parse_fields(), many=True)
+    return schema.jsonify(objs), 201
+
+
 @app.route(PREFIX + '/')
 def show_root():
     response = {
@@ -68,32 +767,46 @@ def show_root():
             '_links': {
                 'self': flask.url_for('show_boxen')
             }
+        },
+        'changes': {
+            '_links': {
+                'self': flask.url_for('show_changes')
+            }
         }
     }
 
-    schema = schemas.RootSchema()
+    schema = make_schema(schemas.RootSchema, parse_fields())
     return schema.jsonify(response), 200
 
 
 @app.route(PREFIX + '/boxen')
+@cached()
 def show_boxen():
     boxen_query = (
         models.Box
         .query)
 
     boxen_query = search_model(models.Box, boxen_query)
+    boxen_query = eager_load_members(
+        boxen_query, models.Box, schemas.BoxSchema)
 
-    boxen = boxen_query.all()
+    boxen, count, next_url = paginate(models.Box, boxen_query)
     response = {
         'members': boxen,
-        'count': len(boxen)
+        'count': count
     }
 
     schema = schemas.BoxenSchema()
-    return schema.jsonify(response), 200
+    response = embed_members(
+        schema.dump(response), boxen, schemas.BoxSchema,
+        fields=parse_fields())
+    response = add_next_link(response, next_url)
+
+    return flask.jsonify(response), 200
 
 
 @app.route(PREFIX + '/boxen/<id>', methods=['GET'])
+@cached('id')
 def show_box(id):
     box = (
         models.Box
@@ -104,7 +817,7 @@ def show_box(id):
     if not box:
         raise exceptions.NotFound('Box not found')
 
-    schema = schemas.BoxSchema()
+    schema = make_schema(schemas.BoxSchema, parse_fields())
     return schema.jsonify(box), 200
 
 
@@ -112,12 +825,16 @@ def show_box(id):
 def new_box():
     req = flask.request.json
 
+    if isinstance(req, list):
+        boxen = [models.Box(**item) for item in req]
+        return add_many(boxen, schemas.BoxSchema)
+
     box = models.Box(**req)
     db.session.add(box)
 
     db.session.commit()
 
-    schema = schemas.BoxSchema()
+    schema = make_schema(schemas.BoxSchema, parse_fields())
     return schema.jsonify(box), 201
 
 
@@ -138,7 +855,119 @@ def del_box(id):
     return flask.Response(status=204)
 
 
+def dump_snapshot(box):
+    """Serialize the box along with all its sub-resources.
+
+    Full documents of box sub-collections and their members are
+    embedded into the box document.
+
+    :param box: box model object
+    :returns: box snapshot document
+    """
+    json_doc = schemas.BoxSchema().dump(box)
+
+    json_doc['_embedded'] = {
+        name: SUB_COLLECTIONS[models.Box][name](box, expand)
+        for name, expand in SNAPSHOT_EXPAND.items()
+    }
+
+    return json_doc
+
+
+def get_snapshot_members(json_doc, name):
+    """Return documents of sub-collection members embedded into snapshot.
+
+    :param json_doc: snapshot document or its part
+    :param name: sub-collection name
+    :returns: a list of members documents
+    """
+    collection = json_doc.get('_embedded', {}).get(name, {})
+    return collection.get('_embedded', {}).get('members', [])
+
+
+def load_columns(model, json_doc):
+    """Pick model columns values from serialized model object.
+
+    :param model: model class
+    :param json_doc: serialized model object
+    :returns: a `dict` of column names and values
+    """
+    columns = model.__table__.columns.keys()
+
+    return {
+        name: value for name, value in json_doc.items()
+        if name in columns and name not in SNAPSHOT_SKIPPED_COLUMNS
+    }
+
+
+@app.route(PREFIX + '/boxen/<id>/snapshot', methods=['GET'])
+@cached('id')
+def show_box_snapshot(id):
+    box = (
+        models.Box
+        .query
+        .filter_by(id=id)
+        .first())
+
+    if not box:
+        raise exceptions.NotFound('Box not found')
+
+    return flask.jsonify(dump_snapshot(box)), 200
+
+
+@app.route(PREFIX + '/boxen/<id>/snapshot', methods=['POST'])
+def restore_box_snapshot(id):
+    req = flask.request.json
+
+    box = (
+        models.Box
+        .query
+        .filter_by(id=id)
+        .first())
+
+    if box:
+        for objs in (box.credentials, box.vlan_ports, box.ports,
+                     box.routes):
+            for obj in objs:
+                db.session.delete(obj)
+
+    else:
+        box = models.Box(id=id)
+        db.session.add(box)
+
+    for name, value in load_columns(models.Box, req).items():
+        setattr(box, name, value)
+
+    for model, name in ((models.Credential, 'credentials'),
+                        (models.Route, 'routes')):
+        for item in get_snapshot_members(req, name):
+            db.session.add(model(box=box, **load_columns(model, item)))
+
+    ports = []
+
+    for item in get_snapshot_members(req, 'ports'):
+        port = models.Port(box=box, **load_columns(models.Port, item))
+        db.session.add(port)
+        ports.append((port, item))
+
+    # VLAN ports refer to the new ports by their IDs
+    db.session.flush()
+
+    for port, item in ports:
+        for name, role in SNAPSHOT_VLAN_ROLES.items():
+            for vlan_item in get_snapshot_members(item, name):
+                vlan_port = models.VlanPort(
+                    box_id=box.id, port_id=port.id, role=role,
+                    **load_columns(models.VlanPort, vlan_item))
+                db.session.add(vlan_port)
+
+    db.session.commit()
+
+    return flask.jsonify(dump_snapshot(box)), 201
+
+
 @app.route(PREFIX + '/boxen/<box_id>/credentials')
+@cached('box_id')
 def show_credentials(box_id):
     credentials_query = (
         models.Credential
@@ -146,19 +975,28 @@ def show_credentials(box_id):
         .filter_by(box_id=box_id))
 
     credentials_query = search_model(models.Credential, credentials_query)
+    credentials_query = eager_load_members(
+        credentials_query, models.Credential, schemas.CredentialSchema)
 
-    schema = schemas.CredentialsSchema()
-    credentials = credentials_query.all()
+    credentials, count, next_url = paginate(
+        models.Credential, credentials_query)
     response = {
         'members': credentials,
-        'count': len(credentials),
+        'count': count,
         'box_id': box_id
     }
 
-    return schema.jsonify(response), 200
+    schema = schemas.CredentialsSchema()
+    response = embed_members(
+        schema.dump(response), credentials, schemas.CredentialSchema,
+        fields=parse_fields())
+    response = add_next_link(response, next_url)
+
+    return flask.jsonify(response), 200
 
 
 @app.route(PREFIX + '/boxen/<box_id>/credentials/<id>', methods=['GET'])
+@cached('box_id')
 def show_credential(box_id, id):
     credential = (
         models.Credential
@@ -169,7 +1007,7 @@ def show_credential(box_id, id):
     if not credential:
         raise exceptions.NotFound('Credentials not found')
 
-    schema = schemas.CredentialSchema()
+    schema = make_schema(schemas.CredentialSchema, parse_fields())
     return schema.jsonify(credential), 200
 
 
@@ -177,12 +1015,17 @@ def show_credential(box_id, id):
 def new_credential(box_id):
     req = flask.request.json
 
+    if isinstance(req, list):
+        credentials = [
+            models.Credential(box_id=box_id, **item) for item in req]
+        return add_many(credentials, schemas.CredentialSchema)
+
     credential = models.Credential(box_id=box_id, **req)
     db.session.add(credential)
 
     db.session.commit()
 
-    schema = schemas.CredentialSchema()
+    schema = make_schema(schemas.CredentialSchema, parse_fields())
     return schema.jsonify(credential), 201
 
 
@@ -204,6 +1047,7 @@ def del_credential(box_id, id):
 
 
 @app.route(PREFIX + '/boxen/<box_id>/ports')
+@cached('box_id')
 def show_ports(box_id):
     ports_query = (
         models.Port
@@ -211,19 +1055,27 @@ def show_ports(box_id):
         .filter_by(box_id=box_id))
 
     ports_query = search_model(models.Port, ports_query)
+    ports_query = eager_load_members(
+        ports_query, models.Port, schemas.PortSchema)
 
-    ports = ports_query.all()
+    ports, count, next_url = paginate(models.Port, ports_query)
     response = {
         'members': ports,
-        'count': len(ports),
+        'count': count,
         'box_id': box_id
     }
 
     schema = schemas.PortsSchema()
-    return schema.jsonify(response), 200
+    response = embed_members(
+        schema.dump(response), ports, schemas.PortSchema,
+        fields=parse_fields())
+    response = add_next_link(response, next_url)
+
+    return flask.jsonify(response), 200
 
 
 @app.route(PREFIX + '/boxen/<box_id>/ports/<id>', methods=['GET'])
+@cached('box_id')
 def show_port(box_id, id):
     port = (
         models.Port
@@ -234,7 +1086,7 @@ def show_port(box_id, id):
     if not port:
         raise exceptions.NotFound('Port not found')
 
-    schema = schemas.PortSchema()
+    schema = make_schema(schemas.PortSchema, parse_fields())
     return schema.jsonify(port), 200
 
 
@@ -242,12 +1094,16 @@ def show_port(box_id, id):
 def new_port(box_id):
     req = flask.request.json
 
+    if isinstance(req, list):
+        ports = [models.Port(box_id=box_id, **item) for item in req]
+        return add_many(ports, schemas.PortSchema)
+
     port = models.Port(box_id=box_id, **req)
     db.session.add(port)
 
     db.session.commit()
 
-    schema = schemas.PortSchema()
+    schema = make_schema(schemas.PortSchema, parse_fields())
     return schema.jsonify(port), 201
 
 
@@ -269,6 +1125,7 @@ def del_port(box_id, id):
 
 
 @app.route(PREFIX + '/boxen/<box_id>/ports/<port_id>/vlan/<role>')
+@cached('box_id')
 def show_vlan_ports(box_id, port_id, role):
     vlan_ports_query = (
         models.VlanPort
@@ -276,34 +1133,48 @@ def show_vlan_ports(box_id, port_id, role):
         .filter_by(box_id=box_id, port_id=port_id, role=role))
 
     vlan_ports_query = search_model(models.VlanPort, vlan_ports_query)
+    vlan_ports_query = eager_load_members(
+        vlan_ports_query, models.VlanPort, schemas.VlanPortSchema)
 
-    vlan_ports = vlan_ports_query.all()
+    vlan_ports, count, next_url = paginate(
+        models.VlanPort, vlan_ports_query)
     response = {
         'members': vlan_ports,
-        'count': len(vlan_ports),
+        'count': count,
         'box_id': box_id,
         'role': role,
         'port_id': port_id
     }
 
     schema = schemas.VlanPortsSchema()
-    return schema.jsonify(response), 200
+    response = embed_members(
+        schema.dump(response), vlan_ports, schemas.VlanPortSchema,
+        fields=parse_fields())
+    response = add_next_link(response, next_url)
+
+    return flask.jsonify(response), 200
 
 
 @app.route(
     PREFIX + '/boxen/<box_id>/ports/<port_id>/vlan/<role>/<id>',
     methods=['GET'])
+@cached('box_id')
 def show_vlan_port(box_id, port_id, role, id):
-    vlan_port = (
+    fields = parse_fields()
+
+    vlan_port_query = (
         models.VlanPort
         .query
-        .filter_by(box_id=box_id, port_id=port_id, role=role, id=id)
-        .first())
+        .filter_by(box_id=box_id, port_id=port_id, role=role, id=id))
+
+    vlan_port = eager_load(
+        vlan_port_query, models.VlanPort, schemas.VlanPortSchema,
+        fields).first()
 
     if not vlan_port:
         raise exceptions.NotFound('VLAN port not found')
 
-    schema = schemas.VlanPortSchema()
+    schema = make_schema(schemas.VlanPortSchema, fields)
     return schema.jsonify(vlan_port), 200
 
 
@@ -313,13 +1184,20 @@ def show_vlan_port(box_id, port_id, role, id):
 def new_vlan_port(box_id, port_id, role):
     req = flask.request.json
 
+    if isinstance(req, list):
+        vlan_ports = [
+            models.VlanPort(
+                box_id=box_id, port_id=port_id, **dict(item, role=role))
+            for item in req]
+        return add_many(vlan_ports, schemas.VlanPortSchema)
+
     vlan_port = models.VlanPort(
         box_id=box_id, port_id=port_id, **dict(req, role=role))
     db.session.add(vlan_port)
 
     db.session.commit()
 
-    schema = schemas.VlanPortSchema()
+    schema = make_schema(schemas.VlanPortSchema, parse_fields())
     return schema.jsonify(vlan_port), 201
 
 
@@ -343,6 +1221,7 @@ def del_vlan_port(box_id, port_id, role, id):
 
 
 @app.route(PREFIX + '/boxen/<box_id>/routes')
+@cached('box_id')
 def show_routes(box_id):
     routes_query = (
         models.Route
@@ -350,19 +1229,27 @@ def show_routes(box_id):
         .filter_by(box_id=box_id))
 
     routes_query = search_model(models.Route, routes_query)
+    routes_query = eager_load_members(
+        routes_query, models.Route, schemas.RouteSchema)
 
-    routes = routes_query.all()
+    routes, count, next_url = paginate(models.Route, routes_query)
     response = {
         'members': routes,
-        'count': len(routes),
+        'count': count,
         'box_id': box_id
     }
 
     schema = schemas.RoutesSchema()
-    return schema.jsonify(response), 200
+    response = embed_members(
+        schema.dump(response), routes, schemas.RouteSchema,
+        fields=parse_fields())
+    response = add_next_link(response, next_url)
+
+    return flask.jsonify(response), 200
 
 
 @app.route(PREFIX + '/boxen/<box_id>/routes/<id>', methods=['GET'])
+@cached('box_id')
 def show_route(box_id, id):
     route = (
         models.Route
@@ -373,7 +1260,7 @@ def show_route(box_id, id):
     if not route:
         raise exceptions.NotFound('Routes not found')
 
-    schema = schemas.RouteSchema()
+    schema = make_schema(schemas.RouteSchema, parse_fields())
     return schema.jsonify(route), 200
 
 
@@ -381,12 +1268,16 @@ def show_route(box_id, id):
 def new_route(box_id):
     req = flask.request.json
 
+    if isinstance(req, list):
+        routes = [models.Route(box_id=box_id, **item) for item in req]
+        return add_many(routes, schemas.RouteSchema)
+
     route = models.Route(box_id=box_id, **req)
     db.session.add(route)
 
     db.session.commit()
 
-    schema = schemas.RouteSchema()
+    schema = make_schema(schemas.RouteSchema, parse_fields())
     return schema.jsonify(route), 201
 
 
@@ -405,3 +1296,49 @@ def del_route(box_id, id):
     db.session.commit()
 
     return flask.Response(status=204)
+
+
+@app.route(PREFIX + '/changes')
+def show_changes():
+    oldest, revision = db.session.query(
+        func.min(models.Change.id), func.max(models.Change.id)).one()
+
+    revision = revision or 0
+
+    since = get_int_arg(SINCE_ARG)
+    if since is None:
+        since = revision
+
+    elif oldest is not None and since < oldest - 1:
+        raise exceptions.Gone(
+            'Changes since revision %d have been pruned, the oldest '
+            'known revision is %d' % (since, oldest))
+
+    changes_query = (
+        models.Change
+        .query
+        .filter(models.Change.id > since)
+        .order_by(models.Change.id))
+
+    next_url = None
+
+    limit = get_int_arg(LIMIT_ARG, minimum=1)
+    if limit is None:
+        changes = changes_query.all()
+
+    else:
+        changes = changes_query.limit(limit + 1).all()
+        if len(changes) > limit:
+            changes = changes[:limit]
+            next_url = flask.url_for(
+                'show_changes', since=changes[-1].id, limit=limit)
+
+    response = {
+        'revision': changes[-1].id if changes else revision,
+        'changes': changes
+    }
+
+    schema = schemas.ChangesSchema()
+    response = add_next_link(schema.dump(response), next_url)
+
+    return flask.jsonify(response), 200
@@ -10,6 +10,7 @@ import os
 import jinja2
 
 from softboxen import exceptions
+from softboxen.client import deadline
 
 LOG = logging.getLogger(__name__)
 
@@ -34,6 +35,8 @@ class CommandProcessor:
         command output by this command processor
     :param scopes: a sequence of names of nesting command processors
         followed by the name of this command processor
+    :param command_deadline: time budget (seconds) for the REST API
+        calls made while processing one command, `None` for no limit
     """
 
     # Identify backend models to load and use
@@ -42,12 +45,13 @@ class CommandProcessor:
     VERSION = '?'
 
     def __init__(self, model, input_stream, output_stream,
-                 template_root=None, scopes=()):
+                 template_root=None, scopes=(), command_deadline=None):
         self._model = model
         self._input = input_stream
         self._output = output_stream
         self._scopes = scopes
         self._template_root = template_root
+        self._command_deadline = command_deadline
         self._template_dir = os.path.join(
             template_root, self.VENDOR, self.MODEL, self.VERSION,
             *scopes)
@@ -138,12 +142,17 @@ class CommandProcessor:
         return subprocessor(
             self._model, self._input, self._output,
             template_root=self._template_root,
-            scopes=scopes)
+            scopes=scopes, command_deadline=self._command_deadline)
 
     def process_command(self, line, context):
         self._parse_and_execute_command(line, context)
 
     def loop(self, context=None, return_to=None):
+        # Nested command loop outlives the command that started it
+        with deadline.suspended():
+            self._loop(context, return_to)
+
+    def _loop(self, context=None, return_to=None):
         if context is None:
             context = {}
 
@@ -156,7 +165,8 @@ class CommandProcessor:
                 break
 
             try:
-                self.process_command(line, context)
+                with deadline.deadline(self._command_deadline):
+                    self.process_command(line, context)
 
             except exceptions.CommandSyntaxError as exc:
                 self.on_error(dict(context, command=exc.command))
@@ -0,0 +1,285 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import asyncio
+import logging
+import os
+import ssl
+from urllib import parse as urlparse
+
+import aiohttp
+import requests
+from requests import structures
+
+from softboxen import exceptions
+from softboxen import jsoncodec
+from softboxen.client import cache
+from softboxen.client import deadline
+from softboxen.client import rest_client
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncRestClient(object):
+    """Asynchronous HTTP method executor.
+
+    Abstracts away HTTP details, exposes high-level CRUD
+    coroutines. All requests share a single pool of persistent
+    connections so that many resources can be loaded concurrently
+    by one event loop.
+
+    Responses are returned as fully read `requests` library response
+    objects so that they can be consumed by the same code that
+    handles `RestClient` responses.
+
+    :param url: The base URL to the REST API server. Should include
+        scheme and authority portion of the URL. For example:
+        https://example.com
+    :param username: Username to use for basic HTTP authentication.
+    :param password: Password to use for basic HTTP authentication.
+    :param verify: Either a boolean value, a path to a CA_BUNDLE
+        file or directory with certificates of trusted CAs.
+        Defaults to True.
+    :param pool_size: The maximum number of simultaneously open
+        connections.
+    :param file_cache_size: The maximum number of JSON documents read
+        by `file://` URLs to keep parsed until their files change.
+        Zero disables the cache.
+    :param json_codec: The name of JSON codec to parse responses with
+        i.e. `orjson`, `ujson` or `json`. The fastest available codec
+        is used if not given.
+    """
+
+    def __init__(self, url, username=None, password=None, verify=True,
+                 pool_size=100, file_cache_size=0, json_codec=None):
+        self._url = url
+        self._codec = jsoncodec.get_codec(json_codec)
+        self._auth = (aiohttp.BasicAuth(username, password or '')
+                      if username else None)
+        self._verify = verify
+        self._pool_size = pool_size
+        self._session = None
+        self._file_adapter = rest_client.LocalFileAdapter(
+            cache_size=file_cache_size, codec=self._codec)
+
+    def _get_ssl(self):
+        if self._verify is True:
+            return None
+
+        if not self._verify:
+            return False
+
+        if os.path.isdir(self._verify):
+            return ssl.create_default_context(capath=self._verify)
+
+        return ssl.create_default_context(cafile=self._verify)
+
+    def _get_session(self):
+        """Return HTTP session, create one on first use.
+
+        HTTP session is bound to the running event loop, therefore
+        it can not be created along with the client.
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                auth=self._auth, connector=aiohttp.TCPConnector(
+                    limit=self._pool_size, ssl=self._get_ssl()))
+
+        return self._session
+
+    async def close(self):
+        """Close this connection and the associated HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def file_cache_stats(self):
+        """Report usage of the cache of JSON documents read from files.
+
+        :returns: a `dict` of cache statistics or `None` if the
+            cache is not enabled.
+        """
+        return self._file_adapter.stats()
+
+    def _get_url(self, path):
+        """Turn resource path into absolute URL.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :returns: absolute URL
+        """
+        if urlparse.urlparse(path).netloc:
+            return path
+
+        return urlparse.urljoin(self._url, path)
+
+    async def _file_call(self, method, url):
+        """Read local file as an HTTP resource.
+
+        Files are read in the default executor of the running event
+        loop so that slow disk I/O does not block other coroutines.
+        """
+        request = requests.Request(method, url).prepare()
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            None, self._file_adapter.send, request)
+
+    async def _http_call(self, method, path='', data=None, headers=None,
+                         timeout=60, **request_options):
+        """Call any HTTP method.
+
+        :param method: The HTTP method to be used, e.g: GET, POST,
+            PUT, PATCH, DELETE.
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: JSON data.
+        :param headers: HTTP headers as a `dict`.
+        :param timeout: Response timeout (seconds), cut down to the
+            time left till the current deadline if any.
+        :param request_options: `aiohttp` library request options.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: DeadlineExceededError
+        :raises: HTTPError
+        """
+        url = self._get_url(path)
+
+        headers = headers or {}
+
+        timeout = deadline.get_timeout(method, url, timeout)
+
+        LOG.debug('HTTP request: %s %s; headers: %s; body: %s; timeout: %s; '
+                  'session arguments: %s;', method, url, headers, data,
+                  timeout, request_options)
+
+        if urlparse.urlparse(url).scheme == 'file':
+            response = await self._file_call(method, url)
+
+        else:
+            session = self._get_session()
+
+            try:
+                async with session.request(
+                        method, url, json=data, headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=timeout),
+                        **request_options) as rsp:
+                    response = requests.Response()
+                    response.status_code = rsp.status
+                    response.reason = rsp.reason
+                    response.headers = structures.CaseInsensitiveDict(
+                        rsp.headers)
+                    response.url = str(rsp.url)
+                    response._content = await rsp.read()
+
+                response = cache.CachedResponse(response, codec=self._codec)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if deadline.exceeded():
+                    raise exceptions.DeadlineExceededError(
+                        method=method, url=url)
+
+                raise exceptions.NetworkError(url=url, error=e)
+
+        LOG.debug('HTTP response for %s %s: status code: %s',
+                  method, url, response.status_code)
+
+        exceptions.handle_error_response(method, url, response)
+
+        return response
+
+    async def get(self, path='', data=None, headers=None,
+                  timeout=60, **request_options):
+        """Call HTTP GET method.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: JSON data.
+        :param headers: HTTP headers as a `dict`.
+        :param timeout: Response timeout (seconds).
+        :param request_options: `aiohttp` library request options.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        return await self._http_call(
+            'GET', path, data=data, headers=headers, timeout=timeout,
+            **request_options)
+
+    async def post(self, path='', data=None, headers=None,
+                   timeout=60, **request_options):
+        """Call HTTP POST method.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: JSON data.
+        :param headers: HTTP headers as a `dict`.
+        :param timeout: Response timeout (seconds).
+        :param request_options: `aiohttp` library request options.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        return await self._http_call(
+            'POST', path, data=data, headers=headers, timeout=timeout,
+            **request_options)
+
+    async def patch(self, path='', data=None, headers=None,
+                    timeout=60, **request_options):
+        """Call HTTP PATCH method.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: JSON data.
+        :param headers: HTTP headers as a `dict`.
+        :param timeout: Response timeout (seconds).
+        :param request_options: `aiohttp` library request options.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        return await self._http_call(
+            'PATCH', path, data=data, headers=headers, timeout=timeout,
+            **request_options)
+
+    async def put(self, path='', data=None, headers=None,
+                  timeout=60, **request_options):
+        """Call HTTP PUT method.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: JSON data.
+        :param headers: HTTP headers as a `dict`.
+        :param timeout: Response timeout (seconds).
+        :param request_options: `aiohttp` library request options.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        return await self._http_call(
+            'PUT', path, data=data, headers=headers, timeout=timeout,
+            **request_options)
+
+    async def delete(self, path='', data=None, headers=None,
+                     timeout=60, **request_options):
+        """Call HTTP DELETE method.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: JSON data.
+        :param headers: HTTP headers as a `dict`.
+        :param timeout: Response timeout (seconds).
+        :param request_options: `aiohttp` library request options.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        return await self._http_call(
+            'DELETE', path, data=data, headers=headers, timeout=timeout,
+            **request_options)
+
+    async def __aenter__(self):
+        """Enter into context."""
+        return self
+
+    async def __aexit__(self, *_args):
+        """Leave context."""
+        await self.close()
@@ -0,0 +1,366 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import collections
+import logging
+import threading
+from urllib import parse as urlparse
+
+import requests
+
+from softboxen import exceptions
+from softboxen import jsoncodec
+from softboxen import lru
+from softboxen.client import deadline
+
+LOG = logging.getLogger(__name__)
+
+
+class CachedResponse(requests.Response):
+    """HTTP response with memoized JSON body.
+
+    Once parsed, JSON document is kept along with the response
+    so that repeated `json()` calls do not parse it again.
+
+    :param response: `requests.Response` object to take over
+    :param codec: JSON codec to parse the body with, the codec of the
+        taken over response or the fastest available one if not given
+    """
+
+    def __init__(self, response, codec=None):
+        super(CachedResponse, self).__init__()
+        self.__dict__.update(response.__dict__)
+        self._content = response.content
+        # Reuse the document already parsed off the taken over response
+        self._json = getattr(response, '_json', None)
+        self._codec = (codec or getattr(response, '_codec', None) or
+                       jsoncodec.get_codec())
+
+    def json(self, **kwargs):
+        """Return parsed JSON body of the response.
+
+        :param kwargs: ignored, the body is parsed by the JSON codec
+        :raises: ValueError on malformed JSON body
+        """
+        if self._json is None:
+            self._json = self._codec.loads(self._content or b'')
+
+        return self._json
+
+
+class ResponseCache(lru.LRUCache):
+    """LRU cache of HTTP responses carrying validators.
+
+    Holds the most recently used responses along with their
+    `ETag` and `Last-Modified` validators to make conditional
+    HTTP requests.
+
+    :param size: The maximum number of responses to keep.
+    :param ttl: Drop cached responses older than this many seconds.
+        `None` keeps the responses until they get evicted.
+    """
+
+    CacheEntry = collections.namedtuple(
+        'CacheEntry', ('response', 'validators'))
+
+    def validators(self, key):
+        """Return conditional request headers for the cached response.
+
+        :param key: cache key e.g. request URL
+        :returns: a `dict` of conditional HTTP request headers, empty if
+            the response is not cached
+        """
+        with self._lock:
+            entry = self._get(key)
+            if not entry:
+                return {}
+
+            return dict(entry.validators)
+
+    def store(self, key, response):
+        """Store the response along with its validators.
+
+        Responses that carry no validators are not cached.
+
+        :param key: cache key e.g. request URL
+        :param response: `requests.Response` object
+        :returns: the response to hand over to the caller
+        """
+        validators = {}
+
+        etag = response.headers.get('ETag')
+        if etag:
+            validators['If-None-Match'] = etag
+
+        last_modified = response.headers.get('Last-Modified')
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+
+        with self._lock:
+            self._misses += 1
+
+            if not validators:
+                self._entries.pop(key, None)
+                return response
+
+            response = CachedResponse(response)
+
+            self._put(key, self.CacheEntry(response, validators))
+
+        return response
+
+    def fetch(self, key):
+        """Return the cached response confirmed to be up to date.
+
+        :param key: cache key e.g. request URL
+        :returns: cached response object or `None` if not cached
+        """
+        with self._lock:
+            entry = self._get(key)
+            if not entry:
+                return
+
+            self._hits += 1
+
+            return entry.response
+
+    def invalidate(self, url=None):
+        """Drop cached responses.
+
+        :param url: absolute URL of the resource to drop the responses
+            for along with the resources nested under it, all responses
+            are dropped if not given
+        """
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                return
+
+            url = url.partition('?')[0].rstrip('/')
+
+            for key in [key for key in self._entries
+                        if key.partition('?')[0].rstrip('/') == url or
+                        key.startswith(url + '/')]:
+                del self._entries[key]
+
+
+class DocumentCache(lru.LRUCache):
+    """LRU cache of JSON documents parsed from local files.
+
+    Documents are kept by file path along with the identity of the
+    file they have been parsed from. Once the file is replaced or
+    modified, its cached document is no longer used.
+
+    :param size: The maximum number of documents to keep.
+    """
+
+    @staticmethod
+    def file_identity(stat):
+        """Identify file contents by file status.
+
+        :param stat: `os.stat_result` of the file
+        :returns: a tuple of file device, inode, modification time
+            and size
+        """
+        return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def fetch(self, path, identity):
+        """Return the document parsed from the file.
+
+        :param path: file path
+        :param identity: file identity as returned by `file_identity()`
+        :returns: parsed JSON document or `None` if the document is
+            not cached or the file has changed since it was cached
+        """
+        with self._lock:
+            entry = self._get(path)
+            if entry is None or entry[0] != identity:
+                self._misses += 1
+                return
+
+            self._hits += 1
+
+            return entry[1]
+
+    def store(self, path, identity, json_doc):
+        """Store the document parsed from the file.
+
+        :param path: file path
+        :param identity: file identity as returned by `file_identity()`
+        :param json_doc: parsed JSON document
+        :returns: the document
+        """
+        with self._lock:
+            self._put(path, (identity, json_doc))
+
+        return json_doc
+
+
+class IdentityMap(lru.LRUCache):
+    """LRU map of resource objects by their paths.
+
+    Holds the most recently built resource objects so that the same
+    REST API resource is represented by the same object rather than
+    being fetched and parsed over again.
+
+    :param size: The maximum number of resource objects to keep.
+    :param ttl: Drop resource objects older than this many seconds.
+        `None` keeps the objects until they get evicted or invalidated.
+    """
+
+    @staticmethod
+    def _get_key(path):
+        return urlparse.urlparse(path).path.rstrip('/')
+
+    def get(self, path, resource_type):
+        """Return resource object by its path.
+
+        :param path: sub-URI or absolute URL of the resource
+        :param resource_type: expected type of the resource object
+        :returns: resource object or `None` if not known
+        """
+        with self._lock:
+            resource = self._get(self._get_key(path))
+            if resource is None or type(resource) is not resource_type:
+                self._misses += 1
+                return
+
+            self._hits += 1
+
+            return resource
+
+    def put(self, path, resource):
+        """Remember resource object by its path.
+
+        :param path: sub-URI or absolute URL of the resource
+        :param resource: resource object
+        :returns: the resource object
+        """
+        with self._lock:
+            self._put(self._get_key(path), resource)
+
+        return resource
+
+    def invalidate(self, path=None, nested=True):
+        """Drop resource objects.
+
+        :param path: sub-URI or absolute URL of the resource to drop,
+            all resource objects are dropped if not given
+        :param nested: whether to also drop the resources whose paths
+            are nested under `path` e.g. members of a collection
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+
+            key = self._get_key(path)
+
+            self._entries.pop(key, None)
+
+            if nested:
+                prefix = key + '/'
+
+                for nested_key in [nested_key for nested_key in self._entries
+                                   if nested_key.startswith(prefix)]:
+                    del self._entries[nested_key]
+
+
+class SingleFlight(object):
+    """Share the outcome of a call among concurrent identical calls.
+
+    The first caller makes the call, callers arriving with the same
+    key while the call is in flight wait for it to complete and get
+    the same result or exception.
+    """
+
+    class Call(object):
+        """Call in flight."""
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._made = 0
+        self._coalesced = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    def call(self, key, func, *args, **kwargs):
+        """Call function unless the same call is in flight.
+
+        Callers waiting for the call in flight give up once their
+        operation deadline passes.
+
+        :param key: call key, a tuple of HTTP method, URL and any other
+            call details, calls with equal keys are coalesced
+        :param func: callable to call
+        :param args: positional arguments to call `func` with
+        :param kwargs: keyword arguments to call `func` with
+        :returns: `func` result
+        :raises: DeadlineExceededError if the deadline passes while
+            waiting for the call in flight
+        :raises: whatever `func` raises
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = self.Call()
+                self._made += 1
+                leader = True
+
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            timeout = deadline.remaining()
+            if timeout is not None:
+                timeout = max(timeout, 0)
+
+            if not call.done.wait(timeout):
+                raise exceptions.DeadlineExceededError(
+                    method=key[0], url=key[1])
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+
+        except Exception as exc:
+            call.error = exc
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    def stats(self):
+        """Report calls coalescing.
+
+        :returns: a `dict` of the number of `calls` made, calls
+            `coalesced` with the calls in flight and the number of
+            calls currently `in_flight`
+        """
+        with self._lock:
+            return {
+                'calls': self._made,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._calls)
+            }
@@ -0,0 +1,106 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+# Operation-scoped time budget for REST API calls
+#
+import contextlib
+import contextvars
+import time
+
+from softboxen import exceptions
+
+_DEADLINE = contextvars.ContextVar('softboxen_deadline', default=None)
+
+
+@contextlib.contextmanager
+def deadline(timeout):
+    """Limit the time all REST API calls within the block may take.
+
+    Each REST API call made by `RestClient` or `AsyncRestClient`,
+    including resources lazily loaded on attribute access, has its
+    timeout cut down to the time left till the deadline. Once the
+    deadline has passed, REST API calls fail right away.
+
+    Nested deadlines can only shorten the outer one. The deadline
+    follows the thread or `asyncio` task that set it.
+
+    :param timeout: time budget (seconds) of the whole block or `None`
+        to leave the current deadline as it is
+    """
+    if timeout is None:
+        yield
+        return
+
+    expires = time.monotonic() + timeout
+
+    current = _DEADLINE.get()
+    if current is not None:
+        expires = min(expires, current)
+
+    token = _DEADLINE.set(expires)
+
+    try:
+        yield
+
+    finally:
+        _DEADLINE.reset(token)
+
+
+@contextlib.contextmanager
+def suspended():
+    """Run the block regardless of the current deadline.
+
+    Meant for long-running parts of an operation, such as nested
+    interactive sessions, that set their own deadlines.
+    """
+    token = _DEADLINE.set(None)
+
+    try:
+        yield
+
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining():
+    """Report the time left till the current deadline.
+
+    :returns: seconds left, negative once the deadline has passed, or
+        `None` if no deadline is set
+    """
+    expires = _DEADLINE.get()
+
+    if expires is not None:
+        return expires - time.monotonic()
+
+
+def get_timeout(method, url, timeout=None):
+    """Cut REST API call timeout down to the time left till deadline.
+
+    :param method: HTTP method of the call
+    :param url: URL of the call
+    :param timeout: call timeout (seconds) or `None` for no timeout
+    :returns: call timeout (seconds) or `None` for no timeout
+    :raises: DeadlineExceededError if the deadline has passed
+    """
+    left = remaining()
+
+    if left is None:
+        return timeout
+
+    if left <= 0:
+        raise exceptions.DeadlineExceededError(method=method, url=url)
+
+    if timeout is None:
+        return left
+
+    return min(timeout, left)
+
+
+def exceeded():
+    """Tell if the current deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
@@ -0,0 +1,341 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import logging
+import threading
+from http import client as http_client
+from urllib import parse as urlparse
+
+from softboxen import exceptions
+from softboxen.client import cache
+from softboxen.client.resources import base
+from softboxen.client.resources import root
+
+LOG = logging.getLogger(__name__)
+
+
+class Replica(object):
+    """In-memory copy of REST API resources.
+
+    Walks the whole tree of REST API resources once and keeps their
+    JSON documents in memory. Then keeps the copy up to date by
+    fetching only the resources reported by REST API change feed.
+
+    Replica acts as a read-only connection to REST API server so that
+    resource objects built on top of it e.g. `replica.root.boxen` read
+    JSON documents from memory without blocking on the network.
+    Modifying HTTP methods are passed through to REST API server.
+
+    :param connection: A RestClient instance
+    :param path: sub-URI path to REST API service root.
+    """
+
+    CHANGES_ATTR = 'changes'
+
+    UNREPLICATED_ATTRS = frozenset(['snapshot'])
+    """Links to the resources read through to REST API server
+
+    Box snapshots are derived from other resources, change feed never
+    reports them changed.
+    """
+
+    def __init__(self, connection, path='/softboxen/v1'):
+        self._conn = connection
+        self._path = path
+        self._responses = {}
+        self._revision = None
+        self._changes_path = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _get_key(path):
+        return urlparse.urlparse(path).path.rstrip('/')
+
+    @property
+    def revision(self):
+        """The revision of REST API data this replica is synced to."""
+        return self._revision
+
+    @property
+    def root(self):
+        """Return `Root` object reading the replica."""
+        return root.Root(self, path=self._path)
+
+    def _fetch(self, path):
+        """Copy JSON document of the resource into the replica.
+
+        :param path: path to the resource
+        :returns: parsed JSON document or `None` if there is no
+            such resource any more
+        """
+        try:
+            response = self._conn.get(path=path)
+
+        except exceptions.ResourceNotFoundError:
+            self._drop(path, nested=False)
+            return
+
+        response = cache.CachedResponse(response)
+
+        self._responses[self._get_key(path)] = response
+
+        return response.json() if response.content else {}
+
+    def _drop(self, path, nested=True):
+        """Drop JSON documents of the resource and its sub-resources."""
+        key = self._get_key(path)
+
+        self._responses.pop(key, None)
+
+        if nested:
+            prefix = key + '/'
+
+            for nested_key in [nested_key for nested_key in self._responses
+                               if nested_key.startswith(prefix)]:
+                self._responses.pop(nested_key, None)
+
+    @classmethod
+    def _get_links(cls, json_doc):
+        """Find hyperlinks to other resources in JSON document.
+
+        :param json_doc: parsed JSON document
+        :returns: generator of hyperlinked resources paths
+        """
+        if isinstance(json_doc, list):
+            for item in json_doc:
+                yield from cls._get_links(item)
+
+        elif isinstance(json_doc, dict):
+            links = json_doc.get('_links')
+            if isinstance(links, dict):
+                link = base.get_link(links.get('self'))
+                if link:
+                    yield link
+
+            for name, value in json_doc.items():
+                if (name not in ('_links', base.Resource.EMBEDDED_ATTR) and
+                        name not in cls.UNREPLICATED_ATTRS):
+                    yield from cls._get_links(value)
+
+    def _crawl(self, path):
+        """Copy the resource and all resources reachable from it."""
+        pending = [path]
+
+        while pending:
+            path = pending.pop()
+
+            if self._get_key(path) in self._responses:
+                continue
+
+            json_doc = self._fetch(path)
+            if json_doc is None:
+                continue
+
+            pending.extend(self._get_links(json_doc))
+
+    def load(self):
+        """Copy all REST API resources into the replica.
+
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        with self._lock:
+            self._changes_path = base.get_sub_resource_path_by(
+                root.Root(self._conn, path=self._path), self.CHANGES_ATTR)
+
+            # Changes made while walking the tree are applied on sync
+            data = self._conn.get(path=self._changes_path)
+            revision = data.json()['revision']
+
+            self._responses.clear()
+
+            root_doc = dict(self._fetch(self._path))
+            root_doc.pop(self.CHANGES_ATTR, None)
+            root_doc.pop('_links', None)
+
+            for path in self._get_links(root_doc):
+                self._crawl(path)
+
+            self._revision = revision
+
+        LOG.info('Replicated %d REST API resources at revision %s',
+                 len(self._responses), revision)
+
+    def sync(self):
+        """Apply changes made to REST API resources since last sync.
+
+        Fetches the resources that have been created or updated,
+        drops the deleted ones. Loads the whole replica if it has not
+        been loaded, REST API data has been reset or the changes since
+        the replica revision have been pruned from the change feed.
+
+        :returns: the number of applied changes
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        if self._revision is None:
+            self.load()
+            return 0
+
+        with self._lock:
+            try:
+                revision, changes = self._fetch_changes()
+
+            except exceptions.HTTPError as exc:
+                if exc.status_code != http_client.GONE:
+                    raise
+
+                LOG.info('REST API changes since revision %s have been '
+                         'pruned, replicating all resources', self._revision)
+                changes = []
+                reset = True
+
+            else:
+                reset = revision < self._revision
+
+                if reset:
+                    LOG.info('REST API data revision went back from %s to '
+                             '%s, replicating all resources',
+                             self._revision, revision)
+
+                else:
+                    self._apply(changes)
+                    self._revision = revision
+
+        if reset:
+            self._revision = None
+            self.load()
+
+        return len(changes)
+
+    def _fetch_changes(self):
+        """Fetch all pages of change feed since the replica revision.
+
+        :returns: a tuple of the latest revision and a list of changes
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        data = self._conn.get(
+            path=self._changes_path, params={'since': self._revision})
+        json_doc = data.json()
+
+        revision = json_doc['revision']
+        changes = json_doc.get('changes', [])
+
+        next_page = base.get_link(json_doc['_links'].get('next'))
+
+        while next_page:
+            data = self._conn.get(path=next_page)
+            json_doc = data.json()
+
+            revision = json_doc['revision']
+            changes.extend(json_doc.get('changes', []))
+
+            next_page = base.get_link(json_doc['_links'].get('next'))
+
+        return revision, changes
+
+    def _apply(self, changes):
+        """Apply REST API change feed entries to the replica."""
+        fetched = set()
+
+        for change in changes:
+            path = change['path']
+
+            # Collection membership changes along with the member
+            if change['action'] in ('create', 'delete'):
+                collection_path = self._get_key(path).rpartition('/')[0]
+                if collection_path not in fetched:
+                    fetched.add(collection_path)
+                    self._fetch(collection_path)
+
+            if change['action'] == 'delete':
+                self._drop(path)
+                fetched.discard(self._get_key(path))
+                continue
+
+            if self._get_key(path) in fetched:
+                continue
+
+            fetched.add(self._get_key(path))
+
+            json_doc = self._fetch(path)
+            if json_doc is not None:
+                for link in self._get_links(json_doc):
+                    self._crawl(link)
+
+        LOG.debug('Applied %d REST API changes', len(changes))
+
+    def start(self, interval=1):
+        """Keep syncing the replica in a background thread.
+
+        :param interval: Seconds to wait between syncs.
+        """
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+
+        def run():
+            while not self._stopped.wait(interval):
+                try:
+                    self.sync()
+
+                except exceptions.SoftboxenError as exc:
+                    LOG.error('REST API replica sync failed: %s', exc)
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop syncing the replica in background."""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def get(self, path='', data=None, headers=None, timeout=60,
+            **requests_options):
+        """Read JSON document from the replica.
+
+        The resources that have not been replicated are fetched from
+        REST API server.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :param data: ignored.
+        :param headers: ignored.
+        :param timeout: ignored.
+        :param requests_options: ignored.
+        :returns: `requests` library response object.
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        response = self._responses.get(self._get_key(path))
+        if response is not None:
+            return response
+
+        return self._conn.get(path=path, **requests_options)
+
+    def post(self, *args, **kwargs):
+        """Call HTTP POST method at REST API server."""
+        return self._conn.post(*args, **kwargs)
+
+    def patch(self, *args, **kwargs):
+        """Call HTTP PATCH method at REST API server."""
+        return self._conn.patch(*args, **kwargs)
+
+    def put(self, *args, **kwargs):
+        """Call HTTP PUT method at REST API server."""
+        return self._conn.put(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Call HTTP DELETE method at REST API server."""
+        return self._conn.delete(*args, **kwargs)
@@ -5,10 +5,15 @@
 # License: https://github.com/etingof/softboxen/LICENSE.rst
 #
 
+import collections
+import contextvars
 import copy
+import itertools
 import logging
+from concurrent import futures
 
 from softboxen import exceptions
+from softboxen.client import cache
 
 LOG = logging.getLogger(__name__)
 
@@ -39,6 +44,33 @@ class Field:
         self._default = default
         self._converter = converter
 
+        # Pre-resolve JSON path to avoid slicing it on every load
+        self._name = path[-1]
+        self._parents = tuple(path[:-1])
+
+        self._attr = None
+
+    def __set_name__(self, owner, name):
+        self._attr = name
+
+    def __get__(self, instance, owner):
+        """Decode the field of a lazily parsed resource on first access.
+
+        The decoded value is memoized in the instance attribute
+        shadowing this field. Unless the resource is parsed lazily,
+        the field itself is returned.
+        """
+        if instance is None or self._attr is None:
+            return self
+
+        json_doc = getattr(instance, '_lazy_json', None)
+        if json_doc is None:
+            return self
+
+        value = self._load(json_doc, instance)
+        setattr(instance, self._attr, value)
+        return value
+
     def _load(self, body, resource, nested_in=None):
         """Load a field from a JSON object.
 
@@ -50,12 +82,11 @@ class Field:
         :raises: MalformedAttributeError on invalid field value or type.
         :returns: field value.
         """
-        name = self._path[-1]
-        for path_item in self._path[:-1]:
+        for path_item in self._parents:
             body = body.get(path_item, {})
 
         try:
-            item = body[name]
+            item = body[self._name]
 
         except KeyError:
             if self._required:
@@ -80,24 +111,34 @@ class Field:
                 error=exc)
 
 
-def _collect_fields(resource):
-    """Collect fields from JSON document.
+def _collect_fields(cls):
+    """Collect fields declared in a class and its bases.
 
-    :param resource: `Resource` instance.
-    :returns: generator of tuples (key, field)
+    :param cls: `Resource` or `CollectionField` class.
+    :returns: a tuple of tuples (key, field) ordered by key
     """
-    for attr in dir(resource.__class__):
-        field = getattr(resource.__class__, attr)
+    fields = []
+
+    for attr in dir(cls):
+        field = getattr(cls, attr)
         if isinstance(field, Field):
-            yield (attr, field)
+            fields.append((attr, field))
+
+    return tuple(fields)
 
 
 class CollectionField(Field):
-    """A list of objects field."""
+    """A list of objects field.
+
+    Subfields are collected once, when `CollectionField` subclass
+    is created.
+    """
+
+    _subfields = ()
 
-    def __init__(self, *args, **kwargs):
-        super(CollectionField, self).__init__(*args, **kwargs)
-        self._subfields = dict(_collect_fields(self))
+    def __init_subclass__(cls, **kwargs):
+        super(CollectionField, cls).__init_subclass__(**kwargs)
+        cls._subfields = _collect_fields(cls)
 
     def _load(self, body, resource, nested_in=None):
         """Load a field from a JSON object.
@@ -115,7 +156,7 @@ class CollectionField(Field):
         instances = []
         for value in values:
             instance = copy.copy(self)
-            for attr, field in self._subfields.items():
+            for attr, field in self._subfields:
                 # Hide the Field object behind the real value
                 setattr(instance, attr, field._load(
                     value, resource, nested_in))
@@ -149,20 +190,57 @@ class Resource:
     """Represent a JSON document.
 
     JSON document fields are set as object attributes with
-    `Field` instances as values.
+    `Field` instances as values. Fields are collected once, when
+    `Resource` subclass is created.
 
-    Lazily loads hyperlinked JSON documents.
+    Lazily loads hyperlinked JSON documents unless they are
+    embedded into this document.
 
     :param connection: A RestClient instance
     :param path: sub-URI path to the resource.
+    :param json_doc: already available JSON document of the resource,
+        the document is loaded from `path` if not given.
     """
 
-    def __init__(self, connection, path=''):
+    EMBEDDED_ATTR = '_embedded'
+
+    LAZY_FIELDS = False
+    """Decode JSON document fields on first attribute access rather
+    than when the document is parsed. Missing or malformed fields are
+    then reported on access"""
+
+    SPARSE_FIELDS = False
+    """Ask REST API server for the declared fields and `LINK_FIELDS`
+    only rather than for the whole JSON document"""
+
+    LINK_FIELDS = ()
+    """Names of hyperlinks to sub-resources to ask REST API server for
+    along with the declared fields"""
+
+    _fields = ()
+
+    _fieldset = ''
+
+    _lazy_json = None
+
+    def __init_subclass__(cls, **kwargs):
+        super(Resource, cls).__init_subclass__(**kwargs)
+        cls._fields = _collect_fields(cls)
+        cls._fieldset = ','.join(sorted(
+            set(field._path[0] for _, field in cls._fields) |
+            set(cls.LINK_FIELDS)))
+
+    def __init__(self, connection, path='', json_doc=None):
         self._conn = connection
         self._path = path
         self._json = None
 
-        self.load()
+        if json_doc is None:
+            self.load()
+
+        else:
+            self._json = json_doc
+            self._parse_attributes(json_doc)
 
     @classmethod
     def create(cls, connection, path='', **fields):
@@ -191,6 +269,45 @@ class Resource:
             if url:
                 return cls(connection, url)
 
+    @classmethod
+    def create_many(cls, connection, path, items, chunk_size=100):
+        """Create many resources at once.
+
+        Performs REST API calls to create resources in bulk, each
+        call carries up to `chunk_size` resources. REST API server
+        creates all resources of one call or none of them.
+
+        :param connection: A RestClient instance
+        :param path: Path to create the resources (via POST).
+        :param items: iterable of `dict` objects holding required and
+            optional name-value pairs for resource fields
+        :param chunk_size: The maximum number of resources to create
+            per REST API call
+
+        :return: a list of new resource objects
+        """
+        resources = []
+
+        items = iter(items)
+
+        while True:
+            chunk = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+
+            rsp = connection.post(path=path, data=chunk)
+
+            LOG.info(
+                'Resources have been created by path %s, status code %s, '
+                'new objects %s', path, rsp.status_code, len(chunk))
+
+            for json_doc in rsp.json() if rsp.content else ():
+                resources.append(cls(
+                    connection, get_member_identity(json_doc),
+                    json_doc=json_doc))
+
+        return resources
+
     def delete(self):
         """Delete existing resource.
 
@@ -204,12 +321,49 @@ class Resource:
         """Parse the attributes of a resource.
 
         Parsed JSON fields are set to `self` as declared in the class.
+        With `LAZY_FIELDS` on, fields are decoded on first access.
 
         :param json_doc: parsed JSON document in form of Python types
         """
-        for attr, field in _collect_fields(self):
+        if self.LAZY_FIELDS:
+            # Drop values decoded from the previous document
+            for attr, _ in self._fields:
+                self.__dict__.pop(attr, None)
+
+            self._lazy_json = json_doc
+            return
+
+        for attr, field in self._fields:
             setattr(self, attr, field._load(json_doc, self))
 
+    def _get_query_params(self):
+        """Return query parameters to load JSON document with.
+
+        :returns: a `dict` of query parameters
+        """
+        if self.SPARSE_FIELDS:
+            return {'fields': self._fieldset}
+
+        return {}
+
+    def _get_sub_resource(self, resource_type, subresource_name):
+        """Return hyperlinked resource object.
+
+        Builds the resource from its JSON document if it is embedded
+        into this document, otherwise the resource loads its JSON
+        document by its hyperlink.
+
+        :param resource_type: `Resource` subclass to instantiate
+        :param subresource_name: name of the resource attribute.
+        :returns: `resource_type` object
+        """
+        path = get_sub_resource_path_by(self, subresource_name)
+
+        json_doc = self._json.get(self.EMBEDDED_ATTR, {}).get(
+            subresource_name)
+
+        return get_resource(resource_type, self._conn, path, json_doc)
+
     def load(self):
         """Load and parse JSON document.
 
@@ -217,7 +371,13 @@ class Resource:
         :raises: NetworkError
         :raises: HTTPError
         """
-        data = self._conn.get(path=self._path)
+        kwargs = {}
+
+        params = self._get_query_params()
+        if params:
+            kwargs['params'] = params
+
+        data = self._conn.get(path=self._path, **kwargs)
         self._json = data.json() if data.content else {}
 
         LOG.debug('Received representation of %(type)s %(path)s: %(json)s',
@@ -234,6 +394,66 @@ class Resource:
         return self._path
 
 
+class OfflineConnection:
+    """Connection to nowhere.
+
+    Backs resources built from JSON documents at hand, such as box
+    snapshot, so that reaching for a resource missing from the
+    documents fails rather than calls REST API server.
+    """
+
+    def _call(self, path='', **kwargs):
+        raise exceptions.NetworkError(
+            url=path, error='resource is not available offline')
+
+    get = post = patch = put = delete = _call
+
+
+def get_resource(resource_type, connection, path, json_doc=None):
+    """Build or reuse resource object.
+
+    If the connection maintains an identity map of resource objects,
+    the object already built for the path is reused. Otherwise new
+    resource object is built.
+
+    :param resource_type: `Resource` subclass to instantiate
+    :param connection: A RestClient instance
+    :param path: sub-URI path to the resource.
+    :param json_doc: already available JSON document of the resource,
+        the document is loaded from `path` if not given.
+    :returns: `resource_type` object
+    """
+    identity_map = getattr(connection, 'identity_map', None)
+    if not isinstance(identity_map, cache.IdentityMap):
+        identity_map = None
+
+    else:
+        resource = identity_map.get(path, resource_type)
+        if resource is not None:
+            return resource
+
+    if json_doc is None:
+        resource = resource_type(connection, path)
+
+    else:
+        resource = resource_type(connection, path, json_doc=json_doc)
+
+    if identity_map is None:
+        return resource
+
+    return identity_map.put(path, resource)
+
+
+def get_link(link):
+    """Return hyperlink path.
+
+    :param link: hyperlink value found in JSON document
+    :returns: hyperlink path or `None` if the value is not a path
+    """
+    if isinstance(link, str) and link:
+        return link
+
+
 def get_sub_resource_path_by(resource, subresource_name):
     """Find subresource path.
 
@@ -323,18 +543,53 @@ def get_members_identities(members):
 class ResourceCollection(Resource):
     """Represent a collection of references to JSON documents.
 
+    Collection members can be fetched in parallel while iterating
+    over the collection. Parallel fetching is enabled by setting
+    `PREFETCH_WORKERS` attribute to the number of threads to use.
+
+    Members documents embedded into the collection document are
+    used as they are without fetching them.
+
+    Large collections can be fetched page by page by setting
+    `PAGE_SIZE` attribute. Pages following the first one are then
+    fetched on demand while iterating over the collection.
+
     :param connection: A RestClient instance
     :param path: sub-URI path to the resource collection.
+    :param json_doc: already available JSON document of the collection,
+        the document is loaded from `path` if not given.
     """
 
     MEMBERS_ATTR = 'members'
 
+    EXPAND = ()
+    """Ask REST API server to embed members documents into the
+    collection document e.g. `('members', 'members.trunk_vlans')`"""
+
+    PREFETCH_WORKERS = 0
+    """The number of threads fetching collection members in parallel"""
+
+    PREFETCH_WINDOW = None
+    """The number of members to fetch ahead of the iteration, defaults
+    to twice the number of prefetch threads"""
+
+    PAGE_SIZE = None
+    """The number of members to fetch per collection page, the whole
+    collection is fetched at once if not set"""
+
     members_identities = Field(
         MEMBERS_ATTR, default=[], converter=get_members_identities)
+    """Members of the loaded collection page"""
+
+    members_count = Field('count')
+    """The number of members in the whole collection"""
 
-    def __init__(self, connection, path):
+    next_page = Field(['_links', 'next'], converter=get_link)
+    """Path to the next collection page or `None` if there is none"""
+
+    def __init__(self, connection, path, json_doc=None):
         super(ResourceCollection, self).__init__(
-            connection, path)
+            connection, path, json_doc=json_doc)
         LOG.debug('Received %(count)d member(s) for %(type)s %(path)s',
                   {'count': len(self.members_identities),
                    'type': self.__class__.__name__, 'path': self._path})
@@ -344,33 +599,542 @@ class ResourceCollection(Resource):
         """`Resource` subclass that the collection contains."""
         return Resource
 
+    def _get_query_params(self):
+        params = super(ResourceCollection, self)._get_query_params()
+
+        if self.EXPAND:
+            params['expand'] = ','.join(self.EXPAND)
+
+            resource_type = self._resource_type
+            if 'members' in self.EXPAND and resource_type.SPARSE_FIELDS:
+                params['fields'] = resource_type._fieldset
+
+        if self.PAGE_SIZE:
+            params['limit'] = self.PAGE_SIZE
+
+        return params
+
+    def _get_embedded_members(self, json_doc):
+        """Return members documents embedded into collection document.
+
+        :param json_doc: collection JSON document
+        :returns: a `dict` of member paths to member documents
+        """
+        embedded = json_doc.get(self.EMBEDDED_ATTR, {})
+
+        return {
+            get_member_identity(member): member
+            for member in embedded.get(self.MEMBERS_ATTR, [])
+        }
+
+    def _parse_attributes(self, json_doc):
+        super(ResourceCollection, self)._parse_attributes(json_doc)
+
+        self._embedded_members = self._get_embedded_members(json_doc)
+
+    def _parse_page(self, json_doc):
+        """Parse collection page document.
+
+        :param json_doc: collection page JSON document
+        :returns: a tuple of member paths, embedded members documents
+            and the path to the next page
+        """
+        identities = get_members_identities(
+            json_doc.get(self.MEMBERS_ATTR, []))
+
+        next_page = get_link(json_doc.get('_links', {}).get('next'))
+
+        return identities, self._get_embedded_members(json_doc), next_page
+
+    def _iter_members_documents(self):
+        """Iterate over collection members paths and documents.
+
+        The pages following the loaded one are fetched on demand and
+        dropped once iterated over.
+
+        :returns: generator of tuples (member path, member document),
+            member document is `None` unless it is embedded
+        """
+        identities = self.members_identities
+        embedded_members = self._embedded_members
+        next_page = self.next_page
+
+        while True:
+            for identity in identities:
+                yield identity, embedded_members.get(identity)
+
+            if not next_page:
+                return
+
+            data = self._conn.get(path=next_page)
+            identities, embedded_members, next_page = self._parse_page(
+                data.json() if data.content else {})
+
+    def _get_member(self, identity, json_doc):
+        return get_resource(
+            self._resource_type, self._conn, identity, json_doc)
+
     def get_member(self, identity):
         """Return `Resource` object identified by `identity`.
 
-        Lazily pulls `Resource` object from the collection.
+        Lazily pulls `Resource` object from the collection unless
+        its document is embedded into the collection document.
 
         :param identity: The identity of the `Resource` object
             in the collection
         :returns: The `Resource` object
         :raises: ResourceNotFoundError
         """
-        return self._resource_type(self._conn, identity)
+        return self._get_member(
+            identity, self._embedded_members.get(identity))
 
     def __len__(self):
         """Return the size of the collection."""
+        if self.next_page and self.members_count is not None:
+            return self.members_count
+
         return len(self.members_identities)
 
     def __iter__(self):
         """Iterate over collection members."""
-        for identity in self.members_identities:
-            yield self.get_member(identity)
+        return self.iter_members()
+
+    def iter_members(self, workers=None, window=None):
+        """Iterate over collection members.
+
+        Optionally fetches up to `window` members ahead of the
+        iteration by a pool of threads. Members are yielded in
+        the order of the collection. The error that occurs while
+        fetching a member is raised when the iteration reaches
+        that member.
+
+        :param workers: The number of threads to fetch members with.
+            Defaults to `PREFETCH_WORKERS`. Zero disables parallel
+            fetching.
+        :param window: The maximum number of members to fetch ahead.
+            Defaults to `PREFETCH_WINDOW`.
+        :returns: generator of `Resource` objects
+        :raises: ResourceNotFoundError
+        """
+        if workers is None:
+            workers = self.PREFETCH_WORKERS
+
+        if not workers:
+            for identity, json_doc in self._iter_members_documents():
+                yield self._get_member(identity, json_doc)
+
+            return
+
+        window = max(window or self.PREFETCH_WINDOW or 2 * workers, 1)
+
+        members = self._iter_members_documents()
+        pending = collections.deque()
+
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+
+            def submit(identity, json_doc):
+                # Pool threads do not inherit context e.g. deadline
+                return executor.submit(
+                    contextvars.copy_context().run,
+                    self._get_member, identity, json_doc)
+
+            try:
+                for identity, json_doc in itertools.islice(members, window):
+                    pending.append(submit(identity, json_doc))
 
-    def find_by_field_value(self, name, value):
-        for element in self:
+                while pending:
+                    future = pending.popleft()
+
+                    for identity, json_doc in itertools.islice(members, 1):
+                        pending.append(submit(identity, json_doc))
+
+                    yield future.result()
+
+            finally:
+                # Do not fetch what will not be consumed
+                for future in pending:
+                    future.cancel()
+
+    def _get_search_params(self, fields):
+        """Turn member field values into collection search parameters.
+
+        Only the fields that are fetched from a top-level JSON document
+        field as is can be searched for by REST API server. Matching
+        members documents are asked to be embedded into the response.
+
+        :param fields: a `dict` of member field names and values
+        :returns: a `dict` of search query parameters, empty if none of
+            the fields can be searched for
+        """
+        params = {}
+
+        resource_type = self._resource_type
+
+        for name, value in fields.items():
+            field = getattr(resource_type, name, None)
+            if (not isinstance(field, Field) or len(field._path) != 1 or
+                    field._converter is not None):
+                continue
+
+            if isinstance(value, bool) or not isinstance(value, (str, int)):
+                continue
+
+            params[field._path[0]] = str(value)
+
+        if params:
+            params['expand'] = ','.join(
+                ['members'] + [name for name in self.EXPAND
+                               if name.startswith('members.')])
+
+            if resource_type.SPARSE_FIELDS:
+                params['fields'] = resource_type._fieldset
+
+        return params
+
+    @staticmethod
+    def _match(element, fields, ignore_case=False):
+        """Check whether member fields have expected values."""
+        for name, value in fields.items():
             assigned_value = getattr(element, name, None)
-            if assigned_value == value:
+
+            if (ignore_case and isinstance(value, str) and
+                    isinstance(assigned_value, str)):
+                value = value.lower()
+                assigned_value = assigned_value.lower()
+
+            if assigned_value != value:
+                return False
+
+        return True
+
+    def _parse_search_results(self, json_doc):
+        """Parse collection search results document.
+
+        :param json_doc: collection JSON document holding matching
+            members only
+        :returns: a list of tuples (member path, member document),
+            member document is `None` unless it is embedded
+        """
+        embedded_members = self._get_embedded_members(json_doc)
+
+        return [
+            (identity, embedded_members.get(identity))
+            for identity in get_members_identities(
+                json_doc.get(self.MEMBERS_ATTR, []))
+        ]
+
+    def _search_members_documents(self, params):
+        """Ask REST API server for matching collection members.
+
+        :param params: a `dict` of search query parameters
+        :returns: a list of tuples (member path, member document)
+            or `None` if REST API server can not search the collection
+        """
+        try:
+            data = self._conn.get(path=self._path, params=params)
+
+        except (exceptions.ResourceNotFoundError,
+                exceptions.BadRequestError) as exc:
+            LOG.debug('Server-side search in %s failed, falling back to '
+                      'members scan: %s', self._path, exc)
+            return
+
+        return self._parse_search_results(
+            data.json() if data.content else {})
+
+    def find_by_field_values(self, ignore_case=False, **fields):
+        """Find collection member by the values of its fields.
+
+        Lets REST API server filter collection members whenever
+        possible, falls back to fetching and matching all members
+        otherwise.
+
+        :param ignore_case: compare string values case-insensitively
+        :param fields: member field names and expected values
+        :returns: the first matching `Resource` object
+        :raises: InvalidInputError if no member matches
+        """
+        members = None
+
+        params = self._get_search_params(fields)
+        if params:
+            members = self._search_members_documents(params)
+
+        if members is None:
+            elements = iter(self)
+
+        else:
+            elements = (self._get_member(identity, json_doc)
+                        for identity, json_doc in members)
+
+        for element in elements:
+            if self._match(element, fields, ignore_case):
                 return element
 
         raise exceptions.InvalidInputError(
-            error='Component with field %s and value %s not '
-                  'found' % (name, value))
+            error='Component with field(s) %s not found' % ', '.join(
+                '%s=%s' % (name, value) for name, value in fields.items()))
+
+    def find_by_field_value(self, name, value, ignore_case=False):
+        """Find collection member by the value of its field.
+
+        :param name: member field name
+        :param value: expected member field value
+        :param ignore_case: compare string values case-insensitively
+        :returns: the first matching `Resource` object
+        :raises: InvalidInputError if no member matches
+        """
+        return self.find_by_field_values(
+            ignore_case=ignore_case, **{name: value})
+
+
+class AsyncResource(Resource):
+    """Represent a JSON document loaded asynchronously.
+
+    Unlike `Resource`, the JSON document is not loaded on object
+    instantiation. Awaiting the object loads the document, unless
+    it is already loaded, and returns the object itself e.g.
+    `box = await AsyncBox(conn, path)`.
+
+    Hyperlinked JSON documents are represented by not yet loaded
+    (awaitable) objects.
+
+    :param connection: An AsyncRestClient instance
+    :param path: sub-URI path to the resource.
+    :param json_doc: already available JSON document of the resource.
+    """
+
+    def __init__(self, connection, path='', json_doc=None):
+        self._conn = connection
+        self._path = path
+        self._json = None
+
+        if json_doc is not None:
+            self._json = json_doc
+            self._parse_attributes(json_doc)
+
+    def __await__(self):
+        return self._get_loaded().__await__()
+
+    async def _get_loaded(self):
+        if self._json is None:
+            await self.load()
+
+        return self
+
+    @classmethod
+    async def create(cls, connection, path='', **fields):
+        """Create new resource.
+
+        Performs a REST API call to create a resource with some initial
+        values. In response, REST API can return a redirect to the newly
+        created resource. In that case, this method will load and return
+        the new resource.
+
+        :param connection: An AsyncRestClient instance
+        :param path: Path to create the resource (via POST).
+        :param fields: required and optional name-value pairs for
+            resource fields
+
+        :return: new resource object or `None`
+        """
+        rsp = await connection.post(
+            path=path, data=fields, allow_redirects=False)
+
+        url = rsp.headers.get('Location')
+
+        LOG.info(
+            'Resource has been created by path %s, status code %s, '
+            'new object redirect %s', path, rsp.status_code, url)
+
+        if rsp.status_code == 302 and url:
+            return await cls(connection, url)
+
+    @classmethod
+    async def create_many(cls, connection, path, items, chunk_size=100):
+        """Create many resources at once.
+
+        Performs REST API calls to create resources in bulk, each
+        call carries up to `chunk_size` resources. REST API server
+        creates all resources of one call or none of them.
+
+        :param connection: An AsyncRestClient instance
+        :param path: Path to create the resources (via POST).
+        :param items: iterable of `dict` objects holding required and
+            optional name-value pairs for resource fields
+        :param chunk_size: The maximum number of resources to create
+            per REST API call
+
+        :return: a list of new resource objects
+        """
+        resources = []
+
+        items = iter(items)
+
+        while True:
+            chunk = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+
+            rsp = await connection.post(path=path, data=chunk)
+
+            LOG.info(
+                'Resources have been created by path %s, status code %s, '
+                'new objects %s', path, rsp.status_code, len(chunk))
+
+            for json_doc in rsp.json() if rsp.content else ():
+                resources.append(cls(
+                    connection, get_member_identity(json_doc),
+                    json_doc=json_doc))
+
+        return resources
+
+    async def delete(self):
+        """Delete existing resource.
+
+        Performs a REST API call to delete this resource.
+        """
+        await self._conn.delete(path=self._path)
+
+        LOG.info('Resource %s has been deleted', self)
+
+    async def load(self):
+        """Load and parse JSON document.
+
+        :returns: this resource object
+        :raises: ResourceNotFoundError
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        kwargs = {}
+
+        params = self._get_query_params()
+        if params:
+            kwargs['params'] = params
+
+        data = await self._conn.get(path=self._path, **kwargs)
+        self._json = data.json() if data.content else {}
+
+        LOG.debug('Received representation of %(type)s %(path)s: %(json)s',
+                  {'type': self.__class__.__name__,
+                   'path': self._path, 'json': self._json})
+        self._parse_attributes(self._json)
+
+        return self
+
+
+class AsyncResourceCollection(AsyncResource, ResourceCollection):
+    """Represent a collection of references to JSON documents.
+
+    Collection members are loaded asynchronously by iterating
+    over the collection with `async for`.
+
+    :param connection: An AsyncRestClient instance
+    :param path: sub-URI path to the resource collection.
+    """
+
+    # Members can only be loaded with `async for`
+    __iter__ = None
+
+    def __init__(self, connection, path, json_doc=None):
+        super(AsyncResourceCollection, self).__init__(
+            connection, path, json_doc=json_doc)
+
+    @property
+    def _resource_type(self):
+        """`AsyncResource` subclass that the collection contains."""
+        return AsyncResource
+
+    async def __aiter__(self):
+        """Iterate over loaded collection members.
+
+        Loads the collection unless it is already loaded. The pages
+        following the loaded one are fetched on demand.
+        """
+        await self._get_loaded()
+
+        identities = self.members_identities
+        embedded_members = self._embedded_members
+        next_page = self.next_page
+
+        while True:
+            for identity in identities:
+                yield await self._get_member(
+                    identity, embedded_members.get(identity))
+
+            if not next_page:
+                return
+
+            data = await self._conn.get(path=next_page)
+            identities, embedded_members, next_page = self._parse_page(
+                data.json() if data.content else {})
+
+    async def _search_members_documents(self, params):
+        """Ask REST API server for matching collection members.
+
+        :param params: a `dict` of search query parameters
+        :returns: a list of tuples (member path, member document)
+            or `None` if REST API server can not search the collection
+        """
+        try:
+            data = await self._conn.get(path=self._path, params=params)
+
+        except (exceptions.ResourceNotFoundError,
+                exceptions.BadRequestError) as exc:
+            LOG.debug('Server-side search in %s failed, falling back to '
+                      'members scan: %s', self._path, exc)
+            return
+
+        return self._parse_search_results(
+            data.json() if data.content else {})
+
+    async def find_by_field_values(self, ignore_case=False, **fields):
+        """Find collection member by the values of its fields.
+
+        Lets REST API server filter collection members whenever
+        possible, falls back to fetching and matching all members
+        otherwise.
+
+        :param ignore_case: compare string values case-insensitively
+        :param fields: member field names and expected values
+        :returns: the first matching `AsyncResource` object
+        :raises: InvalidInputError if no member matches
+        """
+        members = None
+
+        params = self._get_search_params(fields)
+        if params:
+            members = await self._search_members_documents(params)
+
+        if members is None:
+            elements = self.__aiter__()
+
+            try:
+                async for element in elements:
+                    if self._match(element, fields, ignore_case):
+                        return element
+
+            finally:
+                await elements.aclose()
+
+        else:
+            for identity, json_doc in members:
+                element = await self._get_member(identity, json_doc)
+                if self._match(element, fields, ignore_case):
+                    return element
+
+        raise exceptions.InvalidInputError(
+            error='Component with field(s) %s not found' % ', '.join(
+                '%s=%s' % (name, value) for name, value in fields.items()))
+
+    async def find_by_field_value(self, name, value, ignore_case=False):
+        """Find collection member by the value of its field.
+
+        :param name: member field name
+        :param value: expected member field value
+        :param ignore_case: compare string values case-insensitively
+        :returns: the first matching `AsyncResource` object
+        :raises: InvalidInputError if no member matches
+        """
+        return await self.find_by_field_values(
+            ignore_case=ignore_case, **{name: value})
@@ -22,6 +22,8 @@ class Box(base.Resource):
     :param identity: The identity of the System resource
     """
 
+    LINK_FIELDS = ('credentials', 'ports', 'routes', 'snapshot')
+
     vendor = base.Field('vendor', required=True)
     """Network device vendor e.g. cisco"""
 
@@ -46,21 +48,77 @@ class Box(base.Resource):
     @property
     def credentials(self):
         """Return `CredentialsCollection` object."""
-        return credentials.CredentialsCollection(
-            self._conn, base.get_sub_resource_path_by(
-                self, 'credentials'))
+        return self._get_sub_resource(
+            credentials.CredentialsCollection, 'credentials')
 
     @property
     def routes(self):
         """Return `RouteCollection` object."""
-        return route.RouteCollection(
-            self._conn, base.get_sub_resource_path_by(self, 'routes'))
+        return self._get_sub_resource(
+            route.RouteCollection, 'routes')
 
     @property
     def ports(self):
         """Return `PortCollection` object."""
-        return port.PortCollection(
-            self._conn, base.get_sub_resource_path_by(self, 'ports'))
+        return self._get_sub_resource(
+            port.PortCollection, 'ports')
+
+    @classmethod
+    def from_snapshot(cls, json_doc, connection=None):
+        """Build box and all its sub-resources from box snapshot.
+
+        Box snapshot embeds JSON documents of all box sub-resources
+        so that none of them is fetched from REST API server.
+
+        :param json_doc: box snapshot JSON document
+        :param connection: A RestClient instance to modify resources
+            through, resources can not be modified if not given
+        :returns: box object
+        """
+        if connection is None:
+            connection = base.OfflineConnection()
+
+        return cls(connection, base.get_member_identity(json_doc),
+                   json_doc=json_doc)
+
+    def get_snapshot(self):
+        """Fetch the snapshot of this box and all its sub-resources.
+
+        :returns: box snapshot JSON document
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        data = self._conn.get(
+            path=base.get_sub_resource_path_by(self, 'snapshot'))
+
+        return data.json()
+
+    def _invalidate_restored(self):
+        """Drop this box and all its sub-resources cached by connection."""
+        invalidate = getattr(self._conn, 'invalidate', None)
+        if invalidate is not None:
+            invalidate(self.path)
+
+    def restore_snapshot(self, json_doc):
+        """Replace this box and all its sub-resources with box snapshot.
+
+        REST API server restores the whole snapshot or nothing of it.
+
+        :param json_doc: box snapshot JSON document
+        :returns: restored box object
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        rsp = self._conn.post(
+            path=base.get_sub_resource_path_by(self, 'snapshot'),
+            data=json_doc)
+
+        self._invalidate_restored()
+
+        LOG.info('Box %s has been restored from snapshot, status code %s',
+                 self.path, rsp.status_code)
+
+        return self.from_snapshot(rsp.json(), self._conn)
 
 
 class BoxCollection(base.ResourceCollection):
@@ -73,3 +131,74 @@ class BoxCollection(base.ResourceCollection):
     @property
     def _resource_type(self):
         return Box
+
+
+class AsyncBox(base.AsyncResource, Box):
+    """Represent a network device (AKA box) loaded asynchronously.
+
+    :param connection: An AsyncRestClient instance
+    :param identity: The identity of the System resource
+    """
+
+    @property
+    def credentials(self):
+        """Return awaitable `AsyncCredentialsCollection` object."""
+        return self._get_sub_resource(
+            credentials.AsyncCredentialsCollection, 'credentials')
+
+    @property
+    def routes(self):
+        """Return awaitable `AsyncRouteCollection` object."""
+        return self._get_sub_resource(
+            route.AsyncRouteCollection, 'routes')
+
+    @property
+    def ports(self):
+        """Return awaitable `AsyncPortCollection` object."""
+        return self._get_sub_resource(
+            port.AsyncPortCollection, 'ports')
+
+    async def get_snapshot(self):
+        """Fetch the snapshot of this box and all its sub-resources.
+
+        :returns: box snapshot JSON document
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        data = await self._conn.get(
+            path=base.get_sub_resource_path_by(self, 'snapshot'))
+
+        return data.json()
+
+    async def restore_snapshot(self, json_doc):
+        """Replace this box and all its sub-resources with box snapshot.
+
+        REST API server restores the whole snapshot or nothing of it.
+
+        :param json_doc: box snapshot JSON document
+        :returns: restored box object
+        :raises: NetworkError
+        :raises: HTTPError
+        """
+        rsp = await self._conn.post(
+            path=base.get_sub_resource_path_by(self, 'snapshot'),
+            data=json_doc)
+
+        self._invalidate_restored()
+
+        LOG.info('Box %s has been restored from snapshot, status code %s',
+                 self.path, rsp.status_code)
+
+        return self.from_snapshot(rsp.json(), self._conn)
+
+
+class AsyncBoxCollection(base.AsyncResourceCollection, BoxCollection):
+    """Represent a collection of boxen loaded asynchronously.
+
+    :param connection: An AsyncRestClient instance
+    :param path: The canonical path to the Box collection resource
+    """
+
+    @property
+    def _resource_type(self):
+        return AsyncBox
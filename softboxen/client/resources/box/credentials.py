@@ -26,3 +26,16 @@ class CredentialsCollection(base.ResourceCollection):
     @property
     def _resource_type(self):
         return Credentials
+
+
+class AsyncCredentials(base.AsyncResource, Credentials):
+    """Represent user credentials loaded asynchronously."""
+
+
+class AsyncCredentialsCollection(base.AsyncResourceCollection,
+                                 CredentialsCollection):
+    """Represent a collection of users credentials loaded asynchronously."""
+
+    @property
+    def _resource_type(self):
+        return AsyncCredentials
@@ -17,6 +17,8 @@ LOG = logging.getLogger(__name__)
 class Port(base.Resource):
     """Represent physical port resource."""
 
+    LINK_FIELDS = ('access_vlan', 'trunk_vlans', 'trunk_native_vlan')
+
     name = base.Field('name')
     description = base.Field('description')
     mode = base.Field('mode')
@@ -28,23 +30,20 @@ class Port(base.Resource):
     @property
     def access_vlan(self):
         """Return `VlanPort` object for access VLAN."""
-        return vlan_port.VlanPort(
-            self._conn, base.get_sub_resource_path_by(
-                self, 'access_vlan'))
+        return self._get_sub_resource(
+            vlan_port.VlanPort, 'access_vlan')
 
     @property
     def trunk_vlans(self):
         """Return `VlanPortCollection` object for trunk VLANs."""
-        return vlan_port.VlanPortCollection(
-            self._conn, base.get_sub_resource_path_by(
-                self, 'trunk_vlans'))
+        return self._get_sub_resource(
+            vlan_port.VlanPortCollection, 'trunk_vlans')
 
     @property
     def trunk_native_vlan(self):
         """Return `VlanPort` object for trunk native VLAN."""
-        return vlan_port.VlanPort(
-            self._conn, base.get_sub_resource_path_by(
-                self, 'trunk_native_vlan'))
+        return self._get_sub_resource(
+            vlan_port.VlanPort, 'trunk_native_vlan')
 
     def add_access_vlan(self, **fields):
         """Add new access VLAN."""
@@ -74,3 +73,54 @@ class PortCollection(base.ResourceCollection):
     @property
     def _resource_type(self):
         return Port
+
+
+class AsyncPort(base.AsyncResource, Port):
+    """Represent physical port resource loaded asynchronously."""
+
+    @property
+    def access_vlan(self):
+        """Return awaitable `AsyncVlanPort` object for access VLAN."""
+        return self._get_sub_resource(
+            vlan_port.AsyncVlanPort, 'access_vlan')
+
+    @property
+    def trunk_vlans(self):
+        """Return awaitable `AsyncVlanPortCollection` for trunk VLANs."""
+        return self._get_sub_resource(
+            vlan_port.AsyncVlanPortCollection, 'trunk_vlans')
+
+    @property
+    def trunk_native_vlan(self):
+        """Return awaitable `AsyncVlanPort` object for trunk native VLAN."""
+        return self._get_sub_resource(
+            vlan_port.AsyncVlanPort, 'trunk_native_vlan')
+
+    async def add_access_vlan(self, **fields):
+        """Add new access VLAN."""
+        await vlan_port.AsyncVlanPort.create(
+            self._conn,
+            os.path.join(self.path, 'access_vlan'),
+            **fields)
+
+    async def add_trunk_vlan(self, **fields):
+        """Add new trunk VLAN."""
+        await vlan_port.AsyncVlanPort.create(
+            self._conn,
+            os.path.join(self.path, 'trunk_vlans'),
+            **fields)
+
+    async def add_trunk_native_vlan(self, **fields):
+        """Add new trunk native VLAN."""
+        await vlan_port.AsyncVlanPort.create(
+            self._conn,
+            os.path.join(self.path, 'trunk_native_vlan'),
+            **fields)
+
+
+class AsyncPortCollection(base.AsyncResourceCollection, PortCollection):
+    """Represent a collection of ports loaded asynchronously."""
+
+    @property
+    def _resource_type(self):
+        return AsyncPort
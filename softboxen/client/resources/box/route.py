@@ -26,3 +26,15 @@ class RouteCollection(base.ResourceCollection):
     @property
     def _resource_type(self):
         return Route
+
+
+class AsyncRoute(base.AsyncResource, Route):
+    """Represent network routing entry resource loaded asynchronously."""
+
+
+class AsyncRouteCollection(base.AsyncResourceCollection, RouteCollection):
+    """Represent a collection of network routes loaded asynchronously."""
+
+    @property
+    def _resource_type(self):
+        return AsyncRoute
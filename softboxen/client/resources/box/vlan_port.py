@@ -33,14 +33,14 @@ class VlanPort(base.Resource):
 
     @property
     def port(self):
-        return port.Port(
-            self._conn, base.get_sub_resource_path_by(self, 'port'))
+        return self._get_sub_resource(
+            port.Port, 'port')
 
     @property
     def ports(self):
         """Return `VlanPortCollection` object."""
-        return VlanPortCollection(
-            self._conn, base.get_sub_resource_path_by(self, 'ports'))
+        return self._get_sub_resource(
+            VlanPortCollection, 'ports')
 
 
 class VlanPortCollection(base.ResourceCollection):
@@ -49,3 +49,28 @@ class VlanPortCollection(base.ResourceCollection):
     @property
     def _resource_type(self):
         return VlanPort
+
+
+class AsyncVlanPort(base.AsyncResource, VlanPort):
+    """Represent VLAN port resource loaded asynchronously."""
+
+    @property
+    def port(self):
+        """Return awaitable `AsyncPort` object."""
+        return self._get_sub_resource(
+            port.AsyncPort, 'port')
+
+    @property
+    def ports(self):
+        """Return awaitable `AsyncVlanPortCollection` object."""
+        return self._get_sub_resource(
+            AsyncVlanPortCollection, 'ports')
+
+
+class AsyncVlanPortCollection(base.AsyncResourceCollection,
+                              VlanPortCollection):
+    """Represent a collection of VLAN ports loaded asynchronously."""
+
+    @property
+    def _resource_type(self):
+        return AsyncVlanPort
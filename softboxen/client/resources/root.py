@@ -20,6 +20,8 @@ class Root(base.Resource):
     :param path: sub-URI path to the resource.
     """
 
+    LINK_FIELDS = ('boxen',)
+
     description = base.Field('description')
     """Service description."""
 
@@ -30,8 +32,8 @@ class Root(base.Resource):
     @property
     def boxen(self):
         """Return a `BoxCollection` object."""
-        return box.BoxCollection(
-            self._conn, base.get_sub_resource_path_by(self, 'boxen'))
+        return self._get_sub_resource(
+            box.BoxCollection, 'boxen')
 
     def get_box(self, identity):
         """Return `Box` object by identity.
@@ -40,4 +42,30 @@ class Root(base.Resource):
         :raises: `UnknownDefaultError` if default box can't be determined.
         :returns: The Box object
         """
-        return box.Box(self._conn, identity)
+        return base.get_resource(box.Box, self._conn, identity)
+
+
+class AsyncRoot(base.AsyncResource, Root):
+    """Softboxen REST API service root loaded asynchronously.
+
+    :param connector: An AsyncRestClient instance
+    :param path: sub-URI path to the resource.
+    """
+
+    def __init__(self, connector, path='/softboxen/v1'):
+
+        super(AsyncRoot, self).__init__(connector, path=path)
+
+    @property
+    def boxen(self):
+        """Return awaitable `AsyncBoxCollection` object."""
+        return self._get_sub_resource(
+            box.AsyncBoxCollection, 'boxen')
+
+    def get_box(self, identity):
+        """Return awaitable `AsyncBox` object by identity.
+
+        :param identity: The identity of the Box resource.
+        :returns: The AsyncBox object
+        """
+        return box.AsyncBox(self._conn, identity)
@@ -6,24 +6,49 @@
 #
 
 import logging
+import mmap
 import os
+import socket
+import threading
+import time
+from http import client as http_client
 from urllib import parse as urlparse
 from urllib.request import url2pathname
 
 import requests
+import urllib3
 from requests import adapters
 
 from softboxen import exceptions
+from softboxen import jsoncodec
+from softboxen.client import cache
+from softboxen.client import deadline
 
 LOG = logging.getLogger(__name__)
 
+UNIX_SOCKET_SCHEME = 'http+unix'
+
 
 class LocalFileAdapter(adapters.BaseAdapter):
     """Allow Requests to GET file:// URLs.
 
     Protocol Adapter to allow Requests to GET file:// URLs.
+
+    Files are copied out of memory mapping rather than read in chunks.
+    Parsed documents can be cached until their files change.
+
+    :param cache_size: The maximum number of parsed JSON documents
+        to keep. Zero disables the cache.
+    :param codec: JSON codec to parse documents with, the fastest
+        available one if not given
     """
 
+    def __init__(self, cache_size=0, codec=None):
+        super(LocalFileAdapter, self).__init__()
+        self._cache = (cache.DocumentCache(cache_size)
+                       if cache_size else None)
+        self._codec = codec or jsoncodec.get_codec()
+
     @staticmethod
     def _verify_path(method, path):
         """Return an HTTP status for the given filesystem path."""
@@ -45,24 +70,57 @@ class LocalFileAdapter(adapters.BaseAdapter):
         else:
             return 200, "OK"
 
+    @staticmethod
+    def _read_file(path):
+        """Read file contents through memory mapping.
+
+        File contents are copied out of the mapping in one go and the
+        mapping is closed right away so that the response never refers
+        to the file which can be replaced or truncated later on.
+
+        :param path: file path
+        :returns: a tuple of file status and file contents as `bytes`
+        """
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+
+            if not stat.st_size:
+                return stat, b''
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return stat, data[:]
+
     def send(self, req, **kwargs):  # pylint: disable=unused-argument
         """Return the file specified by the given request.
 
+        Query parameters are ignored as files are static documents.
+
         :param req: request object
         """
-        path = os.path.normcase(os.path.normpath(url2pathname(req.path_url)))
+        path = os.path.normcase(os.path.normpath(
+            url2pathname(urlparse.urlparse(req.url).path)))
         response = requests.Response()
 
         response.status_code, response.reason = self._verify_path(
             req.method, path)
+
+        json_doc = None
+
         if response.status_code == 200 and req.method.lower() != 'head':
             try:
-                response.raw = open(path, 'rb')
+                stat, response._content = self._read_file(path)
 
-            except OSError as err:
+            except (OSError, ValueError) as err:
                 response.status_code = 500
                 response.reason = str(err)
 
+            else:
+                response._content_consumed = True
+
+                if self._cache is not None:
+                    identity = self._cache.file_identity(stat)
+                    json_doc = self._cache.fetch(path, identity)
+
         if isinstance(req.url, bytes):
             response.url = req.url.decode('utf-8')
 
@@ -72,12 +130,250 @@ class LocalFileAdapter(adapters.BaseAdapter):
         response.request = req
         response.connection = self
 
+        if response._content_consumed:
+            response = cache.CachedResponse(response, codec=self._codec)
+
+            if json_doc is not None:
+                response._json = json_doc
+
+            elif self._cache is not None and response.content:
+                try:
+                    self._cache.store(path, identity, response.json())
+
+                except ValueError:
+                    LOG.debug('File %s is not a JSON document', path)
+
         return response
 
+    def stats(self):
+        """Report parsed documents cache usage.
+
+        :returns: a `dict` of cache statistics or `None` if the
+            cache is not enabled.
+        """
+        if self._cache is not None:
+            return self._cache.stats()
+
     def close(self):
         pass
 
 
+class PooledHTTPAdapter(adapters.HTTPAdapter):
+    """Keep HTTP connections alive and reuse them across requests.
+
+    Maintains a pool of persistent connections per remote host,
+    closes the pools that have not been used for `idle_timeout`
+    seconds and keeps track of pool usage.
+
+    :param pool_connections: The number of per-host connection
+        pools to cache.
+    :param pool_maxsize: The maximum number of connections to keep
+        alive per host.
+    :param idle_timeout: Close the connections to a host once they
+        have been idle for this many seconds. `None` disables reaping.
+    """
+
+    def __init__(self, pool_connections=adapters.DEFAULT_POOLSIZE,
+                 pool_maxsize=adapters.DEFAULT_POOLSIZE,
+                 idle_timeout=None, **kwargs):
+        self._idle_timeout = idle_timeout
+        self._last_used = {}
+        self._requests = 0
+        self._reaped = 0
+        self._lock = threading.Lock()
+
+        super(PooledHTTPAdapter, self).__init__(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            **kwargs)
+
+    @staticmethod
+    def _host_key(scheme, host, port):
+        return '%s://%s:%s' % (scheme, host, port)
+
+    def send(self, request, **kwargs):
+        """Send HTTP request over a pooled connection.
+
+        :param request: `requests.PreparedRequest` object
+        :returns: `requests.Response` object
+        """
+        self.reap_idle_connections()
+
+        url = urlparse.urlparse(request.url)
+        port = url.port or (443 if url.scheme == 'https' else 80)
+        host_key = self._host_key(url.scheme, url.hostname, port)
+
+        try:
+            return super(PooledHTTPAdapter, self).send(request, **kwargs)
+
+        finally:
+            with self._lock:
+                self._last_used[host_key] = time.monotonic()
+                self._requests += 1
+
+    def reap_idle_connections(self):
+        """Close connection pools which have been idle for too long.
+
+        :returns: the number of closed connection pools
+        """
+        if self._idle_timeout is None:
+            return 0
+
+        now = time.monotonic()
+        reaped = 0
+
+        pools = self.poolmanager.pools
+
+        for pool_key in pools.keys():
+            host_key = self._host_key(
+                pool_key.key_scheme, pool_key.key_host, pool_key.key_port)
+
+            with self._lock:
+                last_used = self._last_used.get(host_key, now)
+                if now - last_used < self._idle_timeout:
+                    continue
+
+                self._last_used.pop(host_key, None)
+                self._reaped += 1
+
+            try:
+                # Pool manager closes the pool on removal
+                del pools[pool_key]
+
+            except KeyError:
+                continue
+
+            LOG.debug('Closed connection pool to %s idle for %d sec',
+                      host_key, now - last_used)
+
+            reaped += 1
+
+        return reaped
+
+    def stats(self):
+        """Report connection pools usage.
+
+        :returns: a `dict` of overall `requests` and `reaped` pools
+            counters along with per-host `pools` statistics, each
+            holding the number of `connections` ever opened,
+            `requests` served and currently `idle` connections.
+        """
+        pools = self.poolmanager.pools
+
+        pool_stats = {}
+
+        for pool_key in pools.keys():
+            try:
+                pool = pools[pool_key]
+
+            except KeyError:
+                continue
+
+            idle = pool.pool.queue if pool.pool else ()
+
+            pool_stats[self._host_key(
+                pool_key.key_scheme, pool_key.key_host,
+                pool_key.key_port)] = {
+                'connections': pool.num_connections,
+                'requests': pool.num_requests,
+                'idle': len([conn for conn in idle if conn])
+            }
+
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'reaped': self._reaped,
+                'pools': pool_stats
+            }
+
+
+class UnixHTTPConnection(urllib3.connection.HTTPConnection):
+    """HTTP connection over Unix domain socket.
+
+    :param socket_path: file system path to Unix domain socket
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._socket_path = kwargs.pop('socket_path')
+        super(UnixHTTPConnection, self).__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+
+        try:
+            sock.connect(self._socket_path)
+
+        except OSError:
+            sock.close()
+            raise
+
+        return sock
+
+
+class UnixHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    """Pool of HTTP connections over Unix domain socket.
+
+    :param socket_path: file system path to Unix domain socket
+    """
+
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, socket_path, **kwargs):
+        super(UnixHTTPConnectionPool, self).__init__('localhost', **kwargs)
+        self.conn_kw['socket_path'] = socket_path
+
+
+class UnixSocketAdapter(adapters.HTTPAdapter):
+    """Allow Requests to call `http+unix://` URLs.
+
+    The authority portion of the URL is the percent-encoded path
+    to Unix domain socket the HTTP server listens on, e.g.
+    `http+unix://%2Frun%2Fsoftboxen.sock/softboxen/v1/root.json`.
+
+    Connections are kept in a pool per socket.
+
+    :param pool_maxsize: The maximum number of connections to keep
+        alive per socket.
+    """
+
+    def __init__(self, pool_maxsize=adapters.DEFAULT_POOLSIZE, **kwargs):
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+        super(UnixSocketAdapter, self).__init__(
+            pool_maxsize=pool_maxsize, **kwargs)
+
+    def _get_pool(self, url):
+        socket_path = urlparse.unquote(urlparse.urlparse(url).netloc)
+
+        with self._pools_lock:
+            pool = self._pools.get(socket_path)
+            if pool is None:
+                pool = self._pools[socket_path] = UnixHTTPConnectionPool(
+                    socket_path, maxsize=self._pool_maxsize)
+
+        return pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None,
+                                        cert=None):
+        return self._get_pool(request.url)
+
+    def get_connection(self, url, proxies=None):
+        return self._get_pool(url)
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        super(UnixSocketAdapter, self).close()
+
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+
+            self._pools.clear()
+
+
 class RestClient(object):
     """HTTP method executor.
 
@@ -86,26 +382,191 @@ class RestClient(object):
 
     :param url: The base URL to the REST API server. Should include
         scheme and authority portion of the URL. For example:
-        https://example.com
+        https://example.com. REST API server listening on Unix
+        domain socket is reachable by `http+unix://` URL with
+        percent-encoded socket path in place of the authority e.g.
+        http+unix://%2Frun%2Fsoftboxen.sock
     :param username: Username to use for basic HTTP authentication.
     :param password: Password to use for basic HTTP authentication.
     :param verify: Either a boolean value, a path to a CA_BUNDLE
         file or directory with certificates of trusted CAs.
         Defaults to True.
+    :param keep_alive: Reuse persistent HTTP connections across
+        requests rather than closing the connection after each
+        request. Defaults to False.
+    :param pool_size: The maximum number of persistent connections
+        to keep per host. Only has effect when `keep_alive` is set.
+    :param idle_timeout: Close persistent connections that have not
+        been used for this many seconds. Only has effect when
+        `keep_alive` is set. `None` keeps idle connections open.
+    :param cache_size: The maximum number of GET responses to cache
+        for making conditional requests. Zero disables the cache.
+    :param cache_ttl: Drop cached responses older than this many
+        seconds. `None` keeps cached responses until evicted.
+    :param identity_map_size: The maximum number of resource objects
+        to reuse by their paths. Resources created, modified or deleted
+        through this client are dropped from the identity map. Zero
+        disables the identity map.
+    :param identity_map_ttl: Drop resource objects older than this many
+        seconds. `None` keeps resource objects until evicted or
+        invalidated.
+    :param file_cache_size: The maximum number of JSON documents read
+        by `file://` URLs to keep parsed until their files change.
+        Zero disables the cache.
+    :param json_codec: The name of JSON codec to parse responses with
+        i.e. `orjson`, `ujson` or `json`. The fastest available codec
+        is used if not given.
+    :param coalesce: Let concurrent GET requests for the same URL share
+        one request in flight and its response. Defaults to False.
     """
 
-    def __init__(self, url, username=None, password=None, verify=True):
+    def __init__(self, url, username=None, password=None, verify=True,
+                 keep_alive=False, pool_size=adapters.DEFAULT_POOLSIZE,
+                 idle_timeout=None, cache_size=0, cache_ttl=None,
+                 identity_map_size=0, identity_map_ttl=None,
+                 file_cache_size=0, json_codec=None, coalesce=False):
         self._url = url
+        self._codec = jsoncodec.get_codec(json_codec)
+        self._single_flight = cache.SingleFlight() if coalesce else None
+        self._cache = (cache.ResponseCache(cache_size, ttl=cache_ttl)
+                       if cache_size else None)
+        self._identity_map = (
+            cache.IdentityMap(identity_map_size, ttl=identity_map_ttl)
+            if identity_map_size else None)
         self._session = requests.Session()
-        self._session.mount('file://', LocalFileAdapter())
+        self._file_adapter = LocalFileAdapter(
+            cache_size=file_cache_size, codec=self._codec)
+        self._session.mount('file://', self._file_adapter)
+        self._session.mount(
+            UNIX_SOCKET_SCHEME + '://', UnixSocketAdapter(
+                pool_maxsize=pool_size))
+        self._session.hooks['response'].append(self._decode_with_codec)
         self._session.auth = (username, password)
         self._session.verify = verify
-        self._session.headers['Connection'] = 'close'
+
+        if keep_alive:
+            self._adapter = PooledHTTPAdapter(
+                pool_maxsize=pool_size, idle_timeout=idle_timeout)
+            self._session.mount('http://', self._adapter)
+            self._session.mount('https://', self._adapter)
+
+        else:
+            self._adapter = None
+            self._session.headers['Connection'] = 'close'
 
     def close(self):
         """Close this connection and the associated HTTP session."""
         self._session.close()
 
+    def _decode_with_codec(self, response, *args, **kwargs):
+        """Make HTTP response parse its JSON body with our JSON codec."""
+        if isinstance(response, cache.CachedResponse):
+            return response
+
+        return cache.CachedResponse(response, codec=self._codec)
+
+    def pool_stats(self):
+        """Report persistent connections pool usage.
+
+        :returns: a `dict` of pool statistics or `None` if
+            connection pooling is not enabled.
+        """
+        if self._adapter:
+            return self._adapter.stats()
+
+    def cache_stats(self):
+        """Report GET responses cache usage.
+
+        :returns: a `dict` of cache statistics or `None` if
+            responses caching is not enabled.
+        """
+        if self._cache:
+            return self._cache.stats()
+
+    def file_cache_stats(self):
+        """Report usage of the cache of JSON documents read from files.
+
+        :returns: a `dict` of cache statistics or `None` if the
+            cache is not enabled.
+        """
+        return self._file_adapter.stats()
+
+    def coalescing_stats(self):
+        """Report concurrent GET requests coalescing.
+
+        :returns: a `dict` of coalescing statistics or `None` if
+            requests coalescing is not enabled.
+        """
+        if self._single_flight is not None:
+            return self._single_flight.stats()
+
+    @property
+    def identity_map(self):
+        """Map of resource objects built through this client.
+
+        :returns: `IdentityMap` object or `None` if the identity map
+            is not enabled.
+        """
+        return self._identity_map
+
+    def identity_map_stats(self):
+        """Report resource objects identity map usage.
+
+        :returns: a `dict` of identity map statistics or `None` if
+            the identity map is not enabled.
+        """
+        if self._identity_map:
+            return self._identity_map.stats()
+
+    def invalidate(self, path=None):
+        """Drop resource objects and cached responses.
+
+        Next time the resources are accessed, they are loaded from
+        REST API server.
+
+        :param path: Sub-URI or absolute URL path to the resource to
+            drop along with the resources nested under it. All
+            resource objects and responses are dropped if not given.
+        """
+        if self._identity_map is not None:
+            self._identity_map.invalidate(path)
+
+        if self._cache is not None:
+            self._cache.invalidate(
+                None if path is None else self._get_url(path))
+
+    def _invalidate_modified(self, method, path):
+        """Drop resource objects affected by a modifying request."""
+        if self._identity_map is None or method == 'GET':
+            return
+
+        self._identity_map.invalidate(path)
+
+        if method == 'DELETE':
+            # Drop the collection that the resource was a member of
+            resource_path = urlparse.urlparse(path).path.rstrip('/')
+            self._identity_map.invalidate(
+                resource_path.rpartition('/')[0], nested=False)
+
+    def _get_url(self, path):
+        """Turn resource path into absolute URL.
+
+        :param path: Sub-URI or absolute URL path to the resource.
+        :returns: absolute URL
+        """
+        if urlparse.urlparse(path).netloc:
+            return path
+
+        url = urlparse.urlparse(self._url)
+
+        if url.scheme == UNIX_SOCKET_SCHEME:
+            # `urljoin` leaves relative paths alone for unknown schemes
+            url = urlparse.urlparse(urlparse.urljoin(
+                url._replace(scheme='http').geturl(), path))
+            return url._replace(scheme=UNIX_SOCKET_SCHEME).geturl()
+
+        return urlparse.urljoin(self._url, path)
+
     def _http_call(self, method, path='', data=None, headers=None,
                    timeout=60, **requests_options):
         """Call any HTTP method.
@@ -115,29 +576,38 @@ class RestClient(object):
         :param path: Sub-URI or absolute URL path to the resource.
         :param data: JSON data.
         :param headers: HTTP headers as a `dict`.
-        :param timeout: Response timeout (seconds).
+        :param timeout: Response timeout (seconds), cut down to the
+            time left till the current deadline if any.
         :param requests_options: `requests` library options.
         :returns: `requests` library response object.
         :raises: NetworkError
+        :raises: DeadlineExceededError
         :raises: HTTPError
         """
-        url = path if urlparse.urlparse(path).netloc else urlparse.urljoin(
-            self._url, path)
+        url = self._get_url(path)
 
         headers = headers or {}
 
+        timeout = deadline.get_timeout(method, url, timeout)
+
         LOG.debug('HTTP request: %s %s; headers: %s; body: %s; timeout: %s; '
                   'session arguments: %s;', method, url, headers, data,
                   timeout, requests_options)
 
         try:
             response = self._session.request(
-                method, url, json=data, headers=headers,
+                method, url, json=data, headers=headers, timeout=timeout,
                 **requests_options)
 
-        except requests.ConnectionError as e:
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if deadline.exceeded():
+                raise exceptions.DeadlineExceededError(method=method, url=url)
+
             raise exceptions.NetworkError(url=url, error=e)
 
+        finally:
+            self._invalidate_modified(method, url)
+
         LOG.debug('HTTP response for %s %s: status code: %s',
                   method, url, response.status_code)
 
@@ -145,10 +615,23 @@ class RestClient(object):
 
         return response
 
+    def _get_request_key(self, path, params=None):
+        """Turn resource path and query parameters into request URL."""
+        return requests.Request(
+            'GET', self._get_url(path), params=params).prepare().url
+
     def get(self, path='', data=None, headers=None,
             timeout=60, **requests_options):
         """Call HTTP GET method.
 
+        If responses cache is enabled, makes conditional request
+        for the previously fetched resource and reuses cached
+        response if the resource has not changed.
+
+        If requests coalescing is enabled, concurrent requests for
+        the same URL and with the same headers share one request
+        in flight and its response object.
+
         :param path: Sub-URI or absolute URL path to the resource.
         :param data: JSON data.
         :param headers: HTTP headers as a `dict`.
@@ -158,10 +641,51 @@ class RestClient(object):
         :raises: NetworkError
         :raises: HTTPError
         """
-        return self._http_call(
-            'GET', path, data=data, headers=headers, timeout=timeout,
+        if (self._single_flight is None or data is not None or
+                set(requests_options) - {'params'}):
+            return self._get(
+                path, data=data, headers=headers, timeout=timeout,
+                **requests_options)
+
+        key = ('GET',
+               self._get_request_key(path, requests_options.get('params')),
+               tuple(sorted((headers or {}).items())))
+
+        return self._single_flight.call(
+            key, self._get, path, headers=headers, timeout=timeout,
             **requests_options)
 
+    def _get(self, path='', data=None, headers=None,
+             timeout=60, **requests_options):
+        """Call HTTP GET method, reusing cached response if any."""
+        if self._cache is None or data is not None:
+            return self._http_call(
+                'GET', path, data=data, headers=headers, timeout=timeout,
+                **requests_options)
+
+        key = self._get_request_key(path, requests_options.get('params'))
+
+        response = self._http_call(
+            'GET', path, timeout=timeout,
+            headers=dict(self._cache.validators(key), **(headers or {})),
+            **requests_options)
+
+        if response.status_code == http_client.NOT_MODIFIED:
+            cached_response = self._cache.fetch(key)
+            if cached_response is not None:
+                LOG.debug('Reusing cached response for %s', key)
+                return cached_response
+
+            # Cached response has been evicted in the meantime
+            response = self._http_call(
+                'GET', path, headers=headers, timeout=timeout,
+                **requests_options)
+
+        if response.status_code != http_client.OK:
+            return response
+
+        return self._cache.store(key, response)
+
     def post(self, path='', data=None, headers=None,
              timeout=60, **requests_options):
         """Call HTTP POST method.
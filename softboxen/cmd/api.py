@@ -11,7 +11,9 @@ import sys
 
 from softboxen.api import app
 from softboxen.api import db
-from softboxen.api import views  # noqa
+from softboxen.api import export
+from softboxen.api import migrate
+from softboxen.api import views
 
 DESCRIPTION = """\
 Softboxen CLI simulator REST API.
@@ -33,6 +35,19 @@ def parse_args():
              'This switch makes sense only when running this tool for the '
              'first time.')
 
+    parser.add_argument(
+        '--upgrade-db',
+        action='store_true',
+        help='Create tables and indexes missing from REST API server DB '
+             'keeping the data intact. This switch makes sense after '
+             'upgrading softboxen.')
+
+    parser.add_argument(
+        '--prune-changes', metavar='<COUNT>', type=int,
+        help='Drop all but the latest COUNT records from REST API change '
+             'feed and exit. The feed can also be kept pruned on every '
+             'write via config variable SOFTBOXEN_CHANGES_RETENTION.')
+
     parser.add_argument(
         '--config', type=str,
         help='Config file path. Can also be set via environment variable '
@@ -50,6 +65,22 @@ def parse_args():
              'set via config variable SOFTBOXEN_LISTEN_PORT. '
              'Default is 5000.')
 
+    parser.add_argument(
+        '--unix-socket', metavar='<PATH>', type=str,
+        help='Unix domain socket for REST API server to listen on '
+             'instead of TCP port. Can also be set via config variable '
+             'SOFTBOXEN_LISTEN_SOCKET. REST API client can reach the '
+             'server by `http+unix://` URL e.g. `softboxen-cli '
+             '--service-root http+unix://%%2Frun%%2Fsoftboxen.sock/'
+             'softboxen/v1/`.')
+
+    parser.add_argument(
+        '--export-static', metavar='<DIR>', type=str,
+        help='Dump all REST API documents into files under this '
+             'directory and exit. The files can be served read-only '
+             'by REST API client, e.g. `softboxen-cli --service-root '
+             'file:///DIR/softboxen/v1/root.json`.')
+
     return parser.parse_args()
 
 
@@ -70,13 +101,35 @@ def main():
     if args.port:
         app.config['SOFTBOXEN_LISTEN_PORT'] = args.port
 
+    if args.unix_socket:
+        app.config['SOFTBOXEN_LISTEN_SOCKET'] = args.unix_socket
+
     if args.recreate_db:
         db.drop_all()
         db.create_all()
         return 0
 
-    app.run(host=app.config.get('SOFTBOXEN_LISTEN_IP'),
-            port=app.config.get('SOFTBOXEN_LISTEN_PORT'))
+    if args.upgrade_db:
+        migrate.upgrade_db()
+        return 0
+
+    if args.prune_changes is not None:
+        pruned = views.prune_changes(db.session, args.prune_changes)
+        db.session.commit()
+        app.logger.info('Pruned %d change feed records', pruned)
+        return 0
+
+    if args.export_static:
+        export.export_static(args.export_static)
+        return 0
+
+    unix_socket = app.config.get('SOFTBOXEN_LISTEN_SOCKET')
+    if unix_socket:
+        app.run(host='unix://' + os.path.abspath(unix_socket))
+
+    else:
+        app.run(host=app.config.get('SOFTBOXEN_LISTEN_IP'),
+                port=app.config.get('SOFTBOXEN_LISTEN_PORT'))
 
     return 0
 
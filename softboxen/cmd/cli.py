@@ -12,6 +12,7 @@ from urllib.parse import urlparse
 
 from softboxen import __version__
 from softboxen import exceptions
+from softboxen import jsoncodec
 from softboxen.cli import factory
 from softboxen.client import rest_client
 from softboxen.client.resources import root
@@ -31,12 +32,58 @@ def main():
     parser.add_argument(
         '--service-root', metavar='<URL>', type=str,
         help='URL of Softboxen REST API service root. '
-             'Example: https://example.com/softboxen/v1/root.json')
+             'Example: https://example.com/softboxen/v1/root.json. '
+             'REST API server listening on Unix domain socket is reached '
+             'by percent-encoded socket path e.g. '
+             'http+unix://%%2Frun%%2Fsoftboxen.sock/softboxen/v1/')
 
     parser.add_argument(
         '--insecure', action='store_true',
         help='Disable TLS X.509 validation.')
 
+    parser.add_argument(
+        '--keep-alive', action='store_true',
+        help='Reuse persistent HTTP connections to REST API server.')
+
+    parser.add_argument(
+        '--pool-size', metavar='<NUMBER>', type=int, default=10,
+        help='Maximum number of persistent connections to keep open '
+             'to REST API server. Only has effect with --keep-alive.')
+
+    parser.add_argument(
+        '--idle-timeout', metavar='<SECONDS>', type=float,
+        help='Close persistent connections to REST API server idle for '
+             'this long. Only has effect with --keep-alive.')
+
+    parser.add_argument(
+        '--identity-map-size', metavar='<NUMBER>', type=int, default=0,
+        help='Maximum number of REST API resource objects to reuse '
+             'rather than fetching them over again. Zero disables '
+             'resource objects reuse.')
+
+    parser.add_argument(
+        '--identity-map-ttl', metavar='<SECONDS>', type=float,
+        help='Fetch reused REST API resources over again once they '
+             'are this old. Only has effect with --identity-map-size.')
+
+    parser.add_argument(
+        '--file-cache-size', metavar='<NUMBER>', type=int, default=0,
+        help='Maximum number of REST API documents read from local files '
+             'to keep parsed until the files change. Only has effect '
+             'with file:// --service-root. Zero disables the cache.')
+
+    parser.add_argument(
+        '--json-codec', metavar='<NAME>', type=str,
+        choices=[codec.name for codec in jsoncodec.CODECS],
+        help='JSON library to parse REST API documents with. '
+             'Default is the fastest installed one.')
+
+    parser.add_argument(
+        '--command-deadline', metavar='<SECONDS>', type=float,
+        help='Time budget for all REST API calls made while processing '
+             'one CLI command. The command fails once the budget is '
+             'exhausted. Default is no limit.')
+
     parser.add_argument(
         '--template-root', metavar='<DIR>', type=str,
         help='Top directory of CLI command loop Jinja2 templates')
@@ -75,6 +122,13 @@ def main():
     conn = rest_client.RestClient(
         '%s://%s%s/' % (service_root.scheme, service_root.netloc, prefix),
         verify=not args.insecure,
+        keep_alive=args.keep_alive,
+        pool_size=args.pool_size,
+        idle_timeout=args.idle_timeout,
+        identity_map_size=args.identity_map_size,
+        identity_map_ttl=args.identity_map_ttl,
+        file_cache_size=args.file_cache_size,
+        json_codec=args.json_codec
     )
 
     root_resource = root.Root(conn, path=filename)
@@ -89,15 +143,15 @@ def main():
         parser.error('--box-uuid is required')
         return
 
-    for model in root_resource.boxen:
-        if model.uuid == args.box_uuid:
-            LOG.debug('Found requested box with UUID %s', model.uuid)
-            break
+    try:
+        model = root_resource.boxen.find_by_field_value('uuid', args.box_uuid)
 
-    else:
+    except exceptions.InvalidInputError:
         parser.error('Requested box with UUID %s not found' % args.box_uuid)
         return
 
+    LOG.debug('Found requested box with UUID %s', model.uuid)
+
     try:
         cli = factory.get_box(model.vendor, model.model, model.version)
 
@@ -109,10 +163,15 @@ def main():
     stdout = os.fdopen(sys.stdout.fileno(), 'wb', 0)
 
     command_processor = cli(
-        model, stdin, stdout, template_root=args.template_root)
+        model, stdin, stdout, template_root=args.template_root,
+        command_deadline=args.command_deadline)
 
     command_processor.loop()
 
+    LOG.debug('REST API connection pool statistics: %s', conn.pool_stats())
+    LOG.debug('REST API resource objects identity map statistics: %s',
+              conn.identity_map_stats())
+
 
 if __name__ == '__main__':
     sys.exit(main())
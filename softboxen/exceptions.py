@@ -35,6 +35,12 @@ class NetworkError(SoftboxenError):
     message = 'Unable to connect to %(url)s. Error: %(error)s'
 
 
+class DeadlineExceededError(NetworkError):
+    """Raise when operation deadline passes before REST API call ends."""
+
+    message = 'Deadline exceeded calling %(method)s %(url)s'
+
+
 class MissingAttributeError(SoftboxenError):
     """Raise on missing resource attribute."""
 
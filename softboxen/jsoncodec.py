@@ -0,0 +1,136 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+# JSON encoding and decoding by the fastest available library
+#
+import json
+
+from softboxen import exceptions
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+
+except ImportError:
+    ujson = None
+
+
+class Codec(object):
+    """JSON codec based on Python standard library `json` module."""
+
+    name = 'json'
+
+    available = True
+
+    @staticmethod
+    def loads(data):
+        """Parse JSON document.
+
+        :param data: serialized JSON document as `str`, `bytes` or
+            any other buffer e.g. memory-mapped file
+        :returns: parsed JSON document
+        :raises: ValueError on malformed document
+        """
+        if not isinstance(data, (str, bytes, bytearray)):
+            data = str(data, 'utf-8')
+
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj, default=None, sort_keys=False, indent=None):
+        """Serialize JSON document.
+
+        :param obj: JSON document in form of Python types
+        :param default: a callable turning otherwise unserializable
+            objects into serializable ones
+        :param sort_keys: sort object members by key
+        :param indent: pretty-print the document with this indentation
+        :returns: serialized JSON document as `str`
+        """
+        return json.dumps(
+            obj, default=default, sort_keys=sort_keys, indent=indent)
+
+
+class OrjsonCodec(Codec):
+    """JSON codec based on `orjson` library.
+
+    Pretty-printed documents are always indented by two spaces.
+    """
+
+    name = 'orjson'
+
+    available = orjson is not None
+
+    @staticmethod
+    def loads(data):
+        if not isinstance(data, (str, bytes, bytearray, memoryview)):
+            data = memoryview(data)
+
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumps(obj, default=None, sort_keys=False, indent=None):
+        option = 0
+
+        if default is not None:
+            # Let the caller format dates the way it always did
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+
+class UjsonCodec(Codec):
+    """JSON codec based on `ujson` library."""
+
+    name = 'ujson'
+
+    available = ujson is not None
+
+    @staticmethod
+    def loads(data):
+        if not isinstance(data, (str, bytes)):
+            data = str(data, 'utf-8')
+
+        return ujson.loads(data)
+
+    @staticmethod
+    def dumps(obj, default=None, sort_keys=False, indent=None):
+        return ujson.dumps(
+            obj, default=default, sort_keys=sort_keys, indent=indent or 0,
+            escape_forward_slashes=False)
+
+
+CODECS = (OrjsonCodec, UjsonCodec, Codec)
+"""JSON codecs from the fastest to the slowest one"""
+
+
+def get_codec(name=None):
+    """Return JSON codec.
+
+    :param name: JSON codec name i.e. `orjson`, `ujson` or `json`,
+        the fastest available codec is returned if not given
+    :returns: JSON codec class
+    :raises: InvalidInputError if the codec is not available
+    """
+    for codec in CODECS:
+        if codec.available and name in (None, codec.name):
+            return codec
+
+    raise exceptions.InvalidInputError(
+        error='JSON codec %s is not available, available codecs are: '
+              '%s' % (name, ', '.join(
+                  codec.name for codec in CODECS if codec.available)))
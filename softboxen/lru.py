@@ -0,0 +1,95 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+# Least recently used cache shared by REST API client and server caches
+#
+import collections
+import threading
+import time
+
+
+class LRUCache(object):
+    """Thread-safe LRU cache keeping usage statistics.
+
+    Base class for the caches of responses, documents and resource
+    objects. Subclasses implement their lookup policies on top of the
+    `_get()` and `_put()` primitives, calling them while holding
+    `_lock`, and account cache `_hits` and `_misses` as they see fit.
+
+    :param size: The maximum number of entries to keep.
+    :param ttl: Drop entries older than this many seconds. `None`
+        keeps the entries until they get evicted or dropped.
+    """
+
+    def __init__(self, size, ttl=None):
+        self._size = size
+        self._ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        """Return cache entry marking it the most recently used.
+
+        Entries older than `ttl` are dropped. Must be called
+        holding `_lock`.
+
+        :param key: cache key
+        :returns: cache entry or `None` if not cached or expired
+        """
+        item = self._entries.get(key)
+        if item is None:
+            return
+
+        entry, stored = item
+
+        if self._ttl is not None and time.monotonic() - stored > self._ttl:
+            del self._entries[key]
+            self._evictions += 1
+            return
+
+        self._entries.move_to_end(key)
+
+        return entry
+
+    def _put(self, key, entry):
+        """Store cache entry evicting the least recently used ones.
+
+        Must be called holding `_lock`.
+
+        :param key: cache key
+        :param entry: cache entry
+        """
+        self._entries[key] = entry, time.monotonic()
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Drop all cache entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Report cache usage.
+
+        :returns: a `dict` of cache `size`, `hits`, `misses` and
+            `evictions` counters
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
@@ -7,7 +7,10 @@
 import unittest
 
 suite = unittest.TestLoader().loadTestsFromNames(
-    ['tests.unit.client.__main__.suite']
+    ['tests.unit.test_jsoncodec.suite',
+     'tests.unit.test_lru.suite',
+     'tests.unit.api.__main__.suite',
+     'tests.unit.client.__main__.suite']
 )
 
 
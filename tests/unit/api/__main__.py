@@ -0,0 +1,20 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import unittest
+
+suite = unittest.TestLoader().loadTestsFromNames(
+    ['tests.unit.api.test_cache.suite',
+     'tests.unit.api.test_export.suite',
+     'tests.unit.api.test_migrate.suite',
+     'tests.unit.api.test_schemas.suite',
+     'tests.unit.api.test_views.suite']
+)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
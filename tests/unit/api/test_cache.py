@@ -0,0 +1,117 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from softboxen import exceptions
+from softboxen.api import cache
+
+
+class RevisionsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(RevisionsTestCase, self).setUp()
+        self.revisions = cache.Revisions()
+
+    def test_bump(self):
+        self.assertEqual(0, self.revisions.get(1))
+
+        self.revisions.bump([1, cache.BOXEN])
+
+        self.assertEqual(1, self.revisions.get(1))
+        self.assertEqual(1, self.revisions.get(cache.BOXEN))
+        self.assertEqual(0, self.revisions.get(2))
+
+    def test_epoch(self):
+        self.assertNotEqual(self.revisions.epoch, cache.Revisions().epoch)
+
+
+class SharedRevisionsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(SharedRevisionsTestCase, self).setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'revisions')
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super(SharedRevisionsTestCase, self).tearDown()
+
+    def test_shared(self):
+        revisions = cache.SharedRevisions(self.path)
+        other_revisions = cache.SharedRevisions(self.path)
+
+        self.assertEqual(revisions.epoch, other_revisions.epoch)
+
+        revisions.bump([1, cache.BOXEN])
+        other_revisions.bump([1])
+
+        self.assertEqual(2, revisions.get(1))
+        self.assertEqual(2, other_revisions.get(1))
+        self.assertEqual(1, other_revisions.get(cache.BOXEN))
+        self.assertEqual(0, other_revisions.get(2))
+
+    @mock.patch.object(cache, 'fcntl', None)
+    def test_unsupported(self):
+        self.assertRaises(
+            exceptions.InvalidParameterValueError,
+            cache.SharedRevisions, self.path)
+
+    def test_collision(self):
+        revisions = cache.SharedRevisions(self.path)
+
+        revisions.bump([1])
+
+        self.assertEqual(1, revisions.get(1 + revisions.SLOTS - 1))
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+        self.cache = cache.ResponseCache(2, cache.Revisions())
+
+    def test_fetch(self):
+        self.assertIsNone(self.cache.fetch('/a', 0))
+
+        self.cache.store('/a', 0, b'{}', 'application/json')
+
+        entry = self.cache.fetch('/a', 0)
+
+        self.assertEqual(b'{}', entry.data)
+        self.assertEqual('application/json', entry.mimetype)
+
+        self.assertEqual(
+            {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0},
+            self.cache.stats())
+
+    def test_fetch_outdated(self):
+        self.cache.store('/a', 0, b'{}', 'application/json')
+
+        self.assertIsNone(self.cache.fetch('/a', 1))
+
+    def test_evict(self):
+        self.cache.store('/a', 0, b'a', 'application/json')
+        self.cache.store('/b', 0, b'b', 'application/json')
+
+        self.cache.fetch('/a', 0)
+
+        self.cache.store('/c', 0, b'c', 'application/json')
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.fetch('/b', 0))
+        self.assertIsNotNone(self.cache.fetch('/a', 0))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,182 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from softboxen.api import app
+from softboxen.api import db
+from softboxen.api import export
+from softboxen.api import models
+from softboxen.api import views
+from softboxen.client import rest_client
+from softboxen.client.resources import root
+
+
+class ExportStaticTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(ExportStaticTestCase, self).setUp()
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.create_all()
+
+        box = models.Box(
+            vendor='cisco', model='5300', version='1', hostname='rt-1')
+        port = models.Port(box=box, name='eth0')
+        db.session.add(port)
+        db.session.add(models.Route(box=box, dst='10.0.0.0/8'))
+        db.session.flush()
+
+        db.session.add(models.VlanPort(
+            box_id=box.id, port_id=port.id, role='trunk', vlan_num=10))
+        db.session.commit()
+
+        self.box_uuid = box.uuid
+
+        db.session.remove()
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.mirror = os.path.join(
+            self.directory, views.PREFIX.lstrip('/'))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        super(ExportStaticTestCase, self).tearDown()
+
+    def _get_root(self):
+        conn = rest_client.RestClient(
+            'file://%s/' % self.mirror, file_cache_size=10)
+
+        return root.Root(conn, path=export.ROOT_FILE)
+
+    def test_export(self):
+        exported = export.export_static(self.directory)
+
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.mirror, export.ROOT_FILE)))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.mirror, 'changes.json')))
+
+        files = [
+            file_name for _, _, file_names in os.walk(self.mirror)
+            for file_name in file_names]
+
+        self.assertEqual(exported, len(files))
+
+    def test_read_back(self):
+        export.export_static(self.directory)
+
+        box = self._get_root().boxen.find_by_field_value(
+            'uuid', self.box_uuid)
+
+        self.assertEqual('rt-1', box.hostname)
+        self.assertEqual(
+            ['10.0.0.0/8'], [route.dst for route in box.routes])
+
+        ports = list(box.ports)
+
+        self.assertEqual(['eth0'], [port.name for port in ports])
+        self.assertEqual(
+            [10], [vlan_port.vlan_num for vlan_port in ports[0].trunk_vlans])
+
+    def test_export_again(self):
+        export.export_static(self.directory)
+
+        root_file = os.path.join(self.mirror, export.ROOT_FILE)
+
+        with open(root_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+
+            with app.app_context():
+                models.Box.query.first().hostname = 'rt-2'
+                db.session.commit()
+
+            export.export_static(self.directory)
+
+            # Open file keeps its contents, new one is moved into place
+            self.assertEqual(stat.st_size, len(f.read()))
+
+        self.assertNotEqual(stat.st_ino, os.stat(root_file).st_ino)
+
+        box = self._get_root().boxen.find_by_field_value(
+            'uuid', self.box_uuid)
+
+        self.assertEqual('rt-2', box.hostname)
+
+        self.assertFalse([
+            file_name for _, _, file_names in os.walk(self.mirror)
+            for file_name in file_names if file_name.endswith('.tmp')])
+
+    def test_export_deleted(self):
+        export.export_static(self.directory)
+
+        other_file = os.path.join(self.mirror, 'README')
+
+        with open(other_file, 'w') as f:
+            f.write('softboxen')
+
+        with app.app_context():
+            box = models.Box.query.first()
+            box_file = os.path.join(
+                self.mirror, export.get_file_path(
+                    views.PREFIX + '/boxen/%s' % box.id))
+
+            self.assertTrue(os.path.isfile(box_file))
+
+            for model in (models.VlanPort, models.Port, models.Route):
+                model.query.delete()
+
+            db.session.delete(box)
+            db.session.commit()
+
+        exported = export.export_static(self.directory)
+
+        files = [
+            os.path.join(dir_path, file_name)
+            for dir_path, _, file_names in os.walk(self.mirror)
+            for file_name in file_names]
+
+        self.assertEqual(exported + 1, len(files))
+        self.assertIn(other_file, files)
+        self.assertNotIn(box_file, files)
+        self.assertFalse(os.path.exists(os.path.splitext(box_file)[0]))
+
+        boxen = self._get_root().boxen
+
+        self.assertEqual([], boxen.members_identities)
+
+    def test_write_failed(self):
+        file_path = os.path.join(self.mirror, export.ROOT_FILE)
+
+        export.write_file(file_path, {'description': 'softboxen'})
+
+        with mock.patch.object(
+                export.json, 'dump', autospec=True,
+                side_effect=ValueError('unserializable')):
+            self.assertRaises(
+                ValueError, export.write_file, file_path, {})
+
+        self.assertEqual([export.ROOT_FILE], os.listdir(self.mirror))
+
+        conn = rest_client.RestClient('file://%s/' % self.mirror)
+
+        self.assertEqual(
+            {'description': 'softboxen'},
+            conn.get(export.ROOT_FILE).json())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
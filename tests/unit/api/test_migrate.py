@@ -0,0 +1,95 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import sys
+import unittest
+
+import sqlalchemy
+
+from softboxen.api import app
+from softboxen.api import db
+from softboxen.api import migrate
+from softboxen.api import models
+
+
+class UpgradeDbTestCase(unittest.TestCase):
+    """Upgrade DB created by softboxen lacking recent indexes and tables."""
+
+    def setUp(self):
+        super(UpgradeDbTestCase, self).setUp()
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.create_all()
+
+        db.session.add(models.Box(vendor='cisco', model='5300', version='1'))
+        db.session.commit()
+        db.session.remove()
+
+        # roll the schema back to the one preceding the upgrade
+        models.Change.__table__.drop(bind=db.engine)
+
+        self.declared = set()
+
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                self.declared.add(index.name)
+
+                if table.name != models.Change.__tablename__:
+                    index.drop(bind=db.engine)
+
+        db.engine.execute(
+            'CREATE INDEX ix_box_obsolete ON box (hostname)')
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        super(UpgradeDbTestCase, self).tearDown()
+
+    @staticmethod
+    def _get_schema():
+        return sorted(db.engine.execute(
+            'SELECT type, name, tbl_name, sql FROM sqlite_master'))
+
+    def test_upgrade(self):
+        inspector = sqlalchemy.inspect(db.engine)
+
+        self.assertNotIn(
+            models.Change.__tablename__, inspector.get_table_names())
+
+        created = migrate.upgrade_db()
+
+        self.assertEqual(
+            self.declared - set(
+                index.name for index in models.Change.__table__.indexes),
+            set(created))
+
+        inspector = sqlalchemy.inspect(db.engine)
+
+        self.assertIn(
+            models.Change.__tablename__, inspector.get_table_names())
+
+        existing = set(
+            index['name'] for table in inspector.get_table_names()
+            for index in inspector.get_indexes(table))
+
+        self.assertLessEqual(self.declared, existing)
+        self.assertNotIn('ix_box_obsolete', existing)
+
+        self.assertEqual(1, models.Box.query.count())
+
+    def test_upgrade_twice(self):
+        migrate.upgrade_db()
+
+        schema = self._get_schema()
+
+        self.assertEqual([], migrate.upgrade_db())
+        self.assertEqual(schema, self._get_schema())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
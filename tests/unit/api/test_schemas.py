@@ -0,0 +1,134 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import collections
+import sys
+import types
+import unittest
+from unittest import mock
+
+import flask
+
+from softboxen.api import app
+from softboxen.api import schemas
+from softboxen.api import views  # noqa
+
+
+Obj = collections.namedtuple('Obj', ['box_id', 'port_id', 'role', 'id'])
+
+
+class URLForTestCase(unittest.TestCase):
+
+    OBJS = [
+        Obj(1, 2, 'trunk', 3),
+        Obj(10, 200, 'a b/%c?', 3000),
+        Obj('x y', 'ü', 'native', True)
+    ]
+
+    def _get_params(self, endpoint):
+        rule = next(app.url_map.iter_rules(endpoint))
+        return {arg: '<%s>' % arg for arg in rule.arguments}
+
+    def _check(self, **kwargs):
+        for rule in app.url_map.iter_rules():
+            if rule.endpoint == 'static':
+                continue
+
+            params = self._get_params(rule.endpoint)
+
+            for obj in self.OBJS:
+                with app.test_request_context('/', **kwargs):
+                    field = schemas.URLFor(rule.endpoint, **params)
+
+                    expected = flask.url_for(rule.endpoint, **{
+                        arg: getattr(obj, arg) for arg in params})
+
+                    with self.subTest(endpoint=rule.endpoint, obj=obj):
+                        self.assertEqual(
+                            expected, field.serialize('link', obj))
+
+    def test_links(self):
+        self._check()
+
+    def test_links_script_root(self):
+        self._check(base_url='http://localhost:5000/app/')
+
+    def test_constant_params(self):
+        field = schemas.URLFor(
+            'show_vlan_ports', box_id='<box_id>', port_id='<port_id>',
+            role='a b')
+
+        with app.test_request_context('/'):
+            self.assertEqual(
+                flask.url_for(
+                    'show_vlan_ports', box_id=1, port_id=2, role='a b'),
+                field.serialize('link', self.OBJS[0]))
+
+    def test_none_attribute(self):
+        field = schemas.URLFor('show_box', id='<id>')
+
+        with app.test_request_context('/'):
+            self.assertIsNone(
+                field.serialize('link', Obj(None, None, None, None)))
+
+    def test_missing_attribute(self):
+        field = schemas.URLFor('show_box', id='<uuid>')
+
+        with app.test_request_context('/'):
+            self.assertRaises(
+                AttributeError, field.serialize, 'link', self.OBJS[0])
+
+    def test_unknown_params(self):
+        field = schemas.URLFor('show_box', id='<id>', expand='members')
+
+        with app.test_request_context('/'):
+            self.assertEqual(
+                flask.url_for('show_box', id=3, expand='members'),
+                field.serialize('link', self.OBJS[0]))
+
+    def test_no_werkzeug_internals(self):
+        rule = mock.Mock(
+            spec=['subdomain', 'defaults', 'arguments'],
+            subdomain='', defaults=None, arguments={'id'})
+
+        schemas.compile_url_template.cache_clear()
+        self.addCleanup(schemas.compile_url_template.cache_clear)
+
+        with mock.patch.object(
+                app.url_map, 'iter_rules', return_value=iter([rule])):
+            self.assertIsNone(schemas.compile_url_template(
+                'show_box', (('id', '<id>'),)))
+
+            field = schemas.URLFor('show_box', id='<id>')
+
+            with app.test_request_context('/'):
+                self.assertEqual(
+                    '/softboxen/v1/boxen/3',
+                    field.serialize('link', self.OBJS[0]))
+
+    def test_no_flask_internals(self):
+        field = schemas.URLFor('show_box', id='<id>')
+
+        with mock.patch.object(
+                schemas.flask, 'globals', types.SimpleNamespace()):
+            with app.test_request_context('/'):
+                self.assertIsNone(schemas.get_url_adapter())
+                self.assertEqual(
+                    '/softboxen/v1/boxen/3',
+                    field.serialize('link', self.OBJS[0]))
+
+    def test_url_adapter(self):
+        self.assertIsNone(schemas.get_url_adapter())
+
+        with app.test_request_context('/'):
+            self.assertIsNotNone(schemas.get_url_adapter())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
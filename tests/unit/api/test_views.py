@@ -0,0 +1,837 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import sys
+import unittest
+from urllib import parse as urlparse
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+
+from softboxen.api import app
+from softboxen.api import cache
+from softboxen.api import db
+from softboxen.api import models
+from softboxen.api import views
+
+
+class StatementCounter(object):
+    """Collect SQL statements executed within the block."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.statements = []
+
+    def _count(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        sqlalchemy.event.listen(
+            self._engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *args):
+        sqlalchemy.event.remove(
+            self._engine, 'before_cursor_execute', self._count)
+
+
+class TransactionCounter(object):
+    """Collect the outcomes of DB transactions ended within the block."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.transactions = []
+
+    def _commit(self, conn):
+        self.transactions.append('commit')
+
+    def _rollback(self, conn):
+        self.transactions.append('rollback')
+
+    def __enter__(self):
+        sqlalchemy.event.listen(self._engine, 'commit', self._commit)
+        sqlalchemy.event.listen(self._engine, 'rollback', self._rollback)
+        return self
+
+    def __exit__(self, *args):
+        sqlalchemy.event.remove(self._engine, 'commit', self._commit)
+        sqlalchemy.event.remove(self._engine, 'rollback', self._rollback)
+
+
+class StatementsBudgetTestCase(unittest.TestCase):
+    """Make sure views do not issue SQL statements per serialized object.
+
+    Each view is called for a small and a large box, both calls must
+    fit into the same budget of SQL statements.
+    """
+
+    BUDGETS = [
+        ('/boxen?expand=members', 1),
+        ('/boxen/%(box_id)s', 1),
+        ('/boxen/%(box_id)s/snapshot', 7),
+        ('/boxen/%(box_id)s/credentials?expand=members', 1),
+        ('/boxen/%(box_id)s/routes?expand=members', 1),
+        ('/boxen/%(box_id)s/ports?expand=members', 1),
+        ('/boxen/%(box_id)s/ports?expand=members&limit=2', 2),
+        ('/boxen/%(box_id)s/ports?expand=members.access_vlan,'
+         'members.trunk_vlans,members.trunk_native_vlan', 4),
+        ('/boxen/%(box_id)s/ports/%(port_id)s', 1),
+        ('/boxen/%(box_id)s/ports/%(port_id)s/vlan/trunk?expand=members', 1),
+        ('/boxen/%(box_id)s/ports/%(port_id)s/vlan/trunk?expand=members'
+         '&limit=1', 2),
+        ('/boxen/%(box_id)s/ports/%(port_id)s/vlan/trunk/%(vlan_port_id)s',
+         1),
+        ('/changes?since=0', 2)
+    ]
+
+    def setUp(self):
+        super(StatementsBudgetTestCase, self).setUp()
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.create_all()
+
+        self.boxen = [self._populate(2), self._populate(10)]
+
+        db.session.remove()
+
+        self.client = app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        super(StatementsBudgetTestCase, self).tearDown()
+
+    @staticmethod
+    def _populate(ports):
+        box = models.Box(vendor='cisco', model='5300', version='1')
+        db.session.add(box)
+
+        for idx in range(2):
+            db.session.add(models.Credential(box=box, user='user%d' % idx))
+            db.session.add(models.Route(box=box, dst='10.0.%d.0/24' % idx))
+
+        for idx in range(ports):
+            port = models.Port(box=box, name='eth%d' % idx)
+            db.session.add(port)
+            db.session.flush()
+
+            for role, vlan_num in (('access', 1), ('trunk', 2),
+                                   ('trunk', 3), ('native', 4)):
+                vlan_port = models.VlanPort(
+                    box_id=box.id, port_id=port.id, role=role,
+                    vlan_num=vlan_num)
+                db.session.add(vlan_port)
+
+        db.session.commit()
+
+        return {
+            'box_id': box.id,
+            'port_id': port.id,
+            'vlan_port_id': vlan_port.id - 1
+        }
+
+    def assertStatementsBudget(self, path, budget):
+        with StatementCounter(db.engine) as counter:
+            response = self.client.get(views.PREFIX + path)
+
+        self.assertEqual(200, response.status_code, response.data)
+
+        self.assertLessEqual(
+            len(counter.statements), budget,
+            'GET %s issued %d SQL statements over budget of %d:\n%s' % (
+                path, len(counter.statements), budget,
+                '\n'.join(counter.statements)))
+
+    def test_budgets(self):
+        for path, budget in self.BUDGETS:
+            for ids in self.boxen:
+                with self.subTest(path=path % ids):
+                    self.assertStatementsBudget(path % ids, budget)
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SOFTBOXEN_RESPONSE_CACHE_SIZE'] = 100
+        cache.make_response_cache.cache_clear()
+
+        db.create_all()
+
+        self.box_ids = []
+
+        for idx in range(2):
+            box = models.Box(vendor='cisco', model='5300', version='1')
+            db.session.add(box)
+            db.session.add(models.Port(box=box, name='eth0'))
+            db.session.commit()
+            self.box_ids.append(box.id)
+
+        db.session.remove()
+
+        self.client = app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        app.config['SOFTBOXEN_RESPONSE_CACHE_SIZE'] = 0
+        cache.make_response_cache.cache_clear()
+        super(ResponseCacheTestCase, self).tearDown()
+
+    def _get(self, path, **kwargs):
+        with StatementCounter(db.engine) as counter:
+            response = self.client.get(views.PREFIX + path, **kwargs)
+
+        return response, len(counter.statements)
+
+    def test_cached(self):
+        path = '/boxen/%s/ports?expand=members' % self.box_ids[0]
+
+        response, statements = self._get(path)
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(statements)
+
+        cached_response, statements = self._get(path)
+
+        self.assertEqual(200, cached_response.status_code)
+        self.assertEqual(0, statements)
+        self.assertEqual(response.data, cached_response.data)
+        self.assertEqual(response.headers, cached_response.headers)
+
+    def test_etag(self):
+        path = '/boxen/%s' % self.box_ids[0]
+
+        response, _ = self._get(path)
+
+        etag, weak = response.get_etag()
+
+        self.assertFalse(weak)
+
+        response, statements = self._get(
+            path, headers={'If-None-Match': '"%s"' % etag})
+
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(0, statements)
+
+    def test_invalidate(self):
+        path = '/boxen/%s/ports' % self.box_ids[0]
+        other_path = '/boxen/%s/ports' % self.box_ids[1]
+
+        response, _ = self._get(path)
+        self._get(other_path)
+
+        self.client.post(
+            views.PREFIX + path, json={'name': 'eth1'})
+
+        new_response, _ = self._get(path)
+
+        self.assertEqual(2, new_response.get_json()['count'])
+        self.assertNotEqual(response.get_etag(), new_response.get_etag())
+
+        _, statements = self._get(other_path)
+
+        self.assertEqual(0, statements)
+
+    def test_invalidate_boxen(self):
+        response, _ = self._get('/boxen')
+
+        self.assertEqual(2, response.get_json()['count'])
+
+        response = self.client.post(views.PREFIX + '/boxen', json={
+            'vendor': 'cisco', 'model': '5300', 'version': '1'})
+
+        box_id = response.get_json()['id']
+
+        response, _ = self._get('/boxen/%s' % box_id)
+
+        self.assertEqual(200, response.status_code)
+
+        response, _ = self._get('/boxen')
+
+        self.assertEqual(3, response.get_json()['count'])
+
+        self.client.delete(views.PREFIX + '/boxen/%s' % box_id)
+
+        response, _ = self._get('/boxen')
+
+        self.assertEqual(2, response.get_json()['count'])
+
+        response, _ = self._get('/boxen/%s' % box_id)
+
+        self.assertEqual(404, response.status_code)
+
+    def test_boxen_expand_sub_collections(self):
+        path = '/boxen?expand=members.ports'
+
+        response, _ = self._get(path)
+
+        box_doc = response.get_json()['_embedded']['members'][0]
+        etag, _ = response.get_etag()
+
+        self.assertEqual(
+            1, len(box_doc['_embedded']['ports']['members']))
+
+        self.client.post(
+            views.PREFIX + '/boxen/%s/ports' % self.box_ids[0],
+            json={'name': 'eth1'})
+
+        response, _ = self._get(
+            path, headers={'If-None-Match': '"%s"' % etag})
+
+        self.assertEqual(200, response.status_code)
+
+        box_doc = response.get_json()['_embedded']['members'][0]
+
+        self.assertEqual(
+            2, len(box_doc['_embedded']['ports']['members']))
+
+    def test_rollback(self):
+        path = '/boxen/%s/ports' % self.box_ids[0]
+
+        self._get(path)
+
+        with app.app_context():
+            db.session.add(models.Port(box_id=self.box_ids[0], name='eth1'))
+            db.session.flush()
+            db.session.rollback()
+
+        _, statements = self._get(path)
+
+        self.assertEqual(0, statements)
+
+
+class ViewsTestCase(unittest.TestCase):
+    """Run REST API views against an empty in-memory database."""
+
+    def setUp(self):
+        super(ViewsTestCase, self).setUp()
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.create_all()
+
+        self.client = app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        super(ViewsTestCase, self).tearDown()
+
+    def _add_box(self, ports=0):
+        box = models.Box(vendor='cisco', model='5300', version='1')
+        db.session.add(box)
+
+        for idx in range(ports):
+            db.session.add(models.Port(box=box, name='eth%d' % idx))
+
+        db.session.commit()
+
+        box_id = box.id
+
+        db.session.remove()
+
+        return box_id
+
+
+class PaginationTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super(PaginationTestCase, self).setUp()
+        self.box_id = self._add_box(ports=5)
+        self.path = views.PREFIX + '/boxen/%s/ports' % self.box_id
+
+    def _get_page(self, url, **query):
+        response = self.client.get(url, query_string=query or None)
+
+        self.assertEqual(200, response.status_code, response.data)
+
+        return response.get_json()
+
+    def test_walk_pages(self):
+        names = []
+        pages = 0
+
+        url = self.path + '?limit=2&expand=members'
+
+        while url:
+            json_doc = self._get_page(url)
+
+            self.assertEqual(5, json_doc['count'])
+            self.assertLessEqual(len(json_doc['members']), 2)
+
+            names.extend(
+                member['name'] for member in json_doc['_embedded']['members'])
+
+            url = json_doc['_links'].get('next')
+            pages += 1
+
+        self.assertEqual(3, pages)
+        self.assertEqual(['eth%d' % idx for idx in range(5)], names)
+
+    def test_unpaged(self):
+        json_doc = self._get_page(self.path)
+
+        self.assertEqual(5, json_doc['count'])
+        self.assertEqual(5, len(json_doc['members']))
+        self.assertNotIn('next', json_doc['_links'])
+
+    def test_limit_exact(self):
+        json_doc = self._get_page(self.path, limit=5)
+
+        self.assertEqual(5, len(json_doc['members']))
+        self.assertNotIn('next', json_doc['_links'])
+
+        json_doc = self._get_page(self.path, limit=4)
+
+        self.assertEqual(4, len(json_doc['members']))
+        self.assertIn('next', json_doc['_links'])
+
+    def test_after(self):
+        json_doc = self._get_page(self.path, limit=2)
+
+        last_id = int(json_doc['members'][-1]['_links']['self'].split('/')[-1])
+
+        json_doc = self._get_page(self.path, limit=10, after=last_id)
+
+        self.assertEqual(5, json_doc['count'])
+        self.assertEqual(3, len(json_doc['members']))
+        self.assertNotIn('next', json_doc['_links'])
+
+    def test_after_last(self):
+        json_doc = self._get_page(self.path, limit=2, after=1000)
+
+        self.assertEqual(5, json_doc['count'])
+        self.assertEqual([], json_doc['members'])
+        self.assertNotIn('next', json_doc['_links'])
+
+    def test_count_search(self):
+        json_doc = self._get_page(
+            self.path + '?limit=1&name=eth1&name=ETH3&name=eth4')
+
+        self.assertEqual(3, json_doc['count'])
+        self.assertEqual(1, len(json_doc['members']))
+
+    def test_next_link_args(self):
+        json_doc = self._get_page(
+            self.path + '?limit=1&name=eth1&name=eth3'
+                        '&fields=name&expand=members')
+
+        url = urlparse.urlparse(json_doc['_links']['next'])
+
+        self.assertEqual(self.path, url.path)
+
+        query = urlparse.parse_qs(url.query)
+
+        expected = {
+            'limit': ['1'],
+            'name': ['eth1', 'eth3'],
+            'fields': ['name'],
+            'expand': ['members'],
+            'after': [json_doc['members'][0]['_links']['self'].split('/')[-1]]
+        }
+
+        self.assertEqual(expected, query)
+
+        json_doc = self._get_page(json_doc['_links']['next'])
+
+        self.assertEqual(
+            [{'name': 'eth3',
+              '_links': {'self': json_doc['members'][0]['_links']['self'],
+                         'collection': self.path}}],
+            json_doc['_embedded']['members'])
+        self.assertNotIn('next', json_doc['_links'])
+
+    def test_bad_args(self):
+        for query in ({'limit': 0}, {'limit': 'x'}, {'limit': 1, 'after': -1}):
+            with self.subTest(query=query):
+                response = self.client.get(self.path, query_string=query)
+
+                self.assertEqual(400, response.status_code)
+
+
+class BulkCreateTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super(BulkCreateTestCase, self).setUp()
+        self.box_id = self._add_box(ports=1)
+
+        with app.app_context():
+            self.port_id = models.Port.query.first().id
+
+    def _count(self, model):
+        with app.app_context():
+            return model.query.count()
+
+    def _post(self, path, json_doc):
+        with TransactionCounter(db.engine) as counter:
+            response = self.client.post(views.PREFIX + path, json=json_doc)
+
+        return response, counter.transactions
+
+    def test_bulk_create(self):
+        box_path = '/boxen/%s' % self.box_id
+
+        requests = [
+            (models.Box, '/boxen',
+             {'vendor': 'cisco', 'model': '5300', 'version': '1'}),
+            (models.Credential, box_path + '/credentials',
+             {'user': 'admin'}),
+            (models.Port, box_path + '/ports', {'name': 'eth1'}),
+            (models.VlanPort,
+             box_path + '/ports/%s/vlan/trunk' % self.port_id,
+             {'vlan_num': 10}),
+            (models.Route, box_path + '/routes', {'dst': '10.0.0.0/8'})
+        ]
+
+        for model, path, json_doc in requests:
+            with self.subTest(path=path):
+                initial_count = self._count(model)
+
+                response, transactions = self._post(path, [json_doc] * 3)
+
+                self.assertEqual(201, response.status_code, response.data)
+                self.assertEqual(3, len(response.get_json()))
+                self.assertEqual(1, transactions.count('commit'))
+                self.assertEqual(initial_count + 3, self._count(model))
+
+    def test_rollback_db_error(self):
+        json_doc = [
+            {'vendor': 'cisco', 'model': '5300', 'version': '1'},
+            {'vendor': 'cisco', 'model': '5300'}
+        ]
+
+        response, transactions = self._post('/boxen', json_doc)
+
+        self.assertEqual(400, response.status_code)
+        self.assertNotIn('commit', transactions)
+        self.assertEqual(1, self._count(models.Box))
+
+    def test_rollback_invalid_item(self):
+        json_doc = [{'name': 'eth1'}, {'name': 'eth2', 'speed_mbps': 1}]
+
+        response, transactions = self._post(
+            '/boxen/%s/ports' % self.box_id, json_doc)
+
+        self.assertEqual(400, response.status_code)
+        self.assertNotIn('commit', transactions)
+        self.assertEqual(1, self._count(models.Port))
+
+
+class ChangesTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super(ChangesTestCase, self).setUp()
+        self.path = views.PREFIX + '/changes'
+
+    def _get_changes(self, url=None, **query):
+        response = self.client.get(
+            url or self.path, query_string=query or None)
+
+        self.assertEqual(200, response.status_code, response.data)
+
+        return response.get_json()
+
+    def _populate(self):
+        with app.app_context():
+            box = models.Box(vendor='cisco', model='5300', version='1')
+            port = models.Port(box=box, name='eth0')
+            db.session.add(port)
+            db.session.flush()
+
+            db.session.add(models.VlanPort(
+                box_id=box.id, port_id=port.id, role='access', vlan_num=1))
+            db.session.commit()
+
+            return box.id, port.id
+
+    def test_empty(self):
+        json_doc = self._get_changes(since=0)
+
+        self.assertEqual(0, json_doc['revision'])
+        self.assertEqual([], json_doc['changes'])
+
+    def test_create(self):
+        box_id, port_id = self._populate()
+
+        json_doc = self._get_changes(since=0)
+
+        box_path = views.PREFIX + '/boxen/%s' % box_id
+
+        expected = [
+            {'action': 'create', 'path': box_path, 'revision': 1},
+            {'action': 'create',
+             'path': box_path + '/ports/%s' % port_id, 'revision': 2},
+            {'action': 'create',
+             'path': box_path + '/ports/%s/vlan/access/1' % port_id,
+             'revision': 3}
+        ]
+
+        self.assertEqual(expected, json_doc['changes'])
+        self.assertEqual(3, json_doc['revision'])
+
+    def test_update(self):
+        box_id, port_id = self._populate()
+
+        with app.app_context():
+            port = models.Port.query.get(port_id)
+            port.name = 'eth1'
+            db.session.commit()
+
+            # unchanged objects are not logged
+            port.name = port.name
+            db.session.commit()
+
+        json_doc = self._get_changes(since=3)
+
+        expected = [
+            {'action': 'update',
+             'path': views.PREFIX + '/boxen/%s/ports/%s' % (box_id, port_id),
+             'revision': 4}
+        ]
+
+        self.assertEqual(expected, json_doc['changes'])
+
+    def test_delete(self):
+        box_id, port_id = self._populate()
+
+        response = self.client.delete(views.PREFIX + '/boxen/%s' % box_id)
+
+        self.assertEqual(204, response.status_code, response.data)
+
+        json_doc = self._get_changes(since=3)
+
+        box_path = views.PREFIX + '/boxen/%s' % box_id
+
+        expected = [
+            {'action': 'delete',
+             'path': box_path + '/ports/%s/vlan/access/1' % port_id,
+             'revision': 4},
+            {'action': 'delete',
+             'path': box_path + '/ports/%s' % port_id, 'revision': 5},
+            {'action': 'delete', 'path': box_path, 'revision': 6}
+        ]
+
+        self.assertEqual(expected, json_doc['changes'])
+        self.assertEqual(6, json_doc['revision'])
+
+    def test_since(self):
+        self._populate()
+
+        json_doc = self._get_changes()
+
+        self.assertEqual(3, json_doc['revision'])
+        self.assertEqual([], json_doc['changes'])
+
+        json_doc = self._get_changes(since=1)
+
+        self.assertEqual(
+            [2, 3], [change['revision'] for change in json_doc['changes']])
+
+        json_doc = self._get_changes(since=3)
+
+        self.assertEqual(3, json_doc['revision'])
+        self.assertEqual([], json_doc['changes'])
+
+    def test_limit(self):
+        self._populate()
+        self._populate()
+
+        revisions = []
+        pages = 0
+
+        url = self.path + '?since=0&limit=4'
+
+        while url:
+            json_doc = self._get_changes(url)
+
+            revisions.extend(
+                change['revision'] for change in json_doc['changes'])
+
+            self.assertEqual(revisions[-1], json_doc['revision'])
+
+            url = json_doc['_links'].get('next')
+            pages += 1
+
+        self.assertEqual(2, pages)
+        self.assertEqual(list(range(1, 7)), revisions)
+
+    def test_next_link(self):
+        self._populate()
+
+        json_doc = self._get_changes(since=0, limit=2)
+
+        url = urlparse.urlparse(json_doc['_links']['next'])
+
+        self.assertEqual(self.path, url.path)
+        self.assertEqual(
+            {'since': ['2'], 'limit': ['2']}, urlparse.parse_qs(url.query))
+
+    def test_bad_args(self):
+        for query in ({'since': -1}, {'since': 'x'}, {'limit': 0}):
+            with self.subTest(query=query):
+                response = self.client.get(self.path, query_string=query)
+
+                self.assertEqual(400, response.status_code)
+
+    def test_retention(self):
+        app.config['SOFTBOXEN_CHANGES_RETENTION'] = 2
+        self.addCleanup(
+            app.config.__setitem__, 'SOFTBOXEN_CHANGES_RETENTION', 0)
+
+        self._populate()
+
+        json_doc = self._get_changes(since=1)
+
+        self.assertEqual(3, json_doc['revision'])
+        self.assertEqual(
+            [2, 3], [change['revision'] for change in json_doc['changes']])
+
+        response = self.client.get(self.path, query_string={'since': 0})
+
+        self.assertEqual(410, response.status_code)
+
+    def test_prune(self):
+        self._populate()
+
+        with app.app_context():
+            self.assertEqual(2, views.prune_changes(db.session, 1))
+            db.session.commit()
+
+        self.assertEqual(3, self._get_changes()['revision'])
+
+        json_doc = self._get_changes(since=2)
+
+        self.assertEqual(
+            [3], [change['revision'] for change in json_doc['changes']])
+
+        for since in (0, 1):
+            with self.subTest(since=since):
+                response = self.client.get(
+                    self.path, query_string={'since': since})
+
+                self.assertEqual(410, response.status_code)
+
+    def test_prune_empty(self):
+        with app.app_context():
+            self.assertEqual(0, views.prune_changes(db.session, 1))
+
+
+class SearchTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super(SearchTestCase, self).setUp()
+        self.box_id = self._add_box(ports=2)
+
+        with app.app_context():
+            box = models.Box.query.get(self.box_id)
+            self.box_uuid = box.uuid
+
+            port = box.ports.filter_by(name='eth1').first()
+            port.name = 'Eth1'
+            port.mtu = 9000
+            db.session.commit()
+
+    def _search(self, path, **query):
+        response = self.client.get(
+            views.PREFIX + path, query_string=query)
+
+        self.assertEqual(200, response.status_code, response.data)
+
+        return [member['_links']['self']
+                for member in response.get_json()['members']]
+
+    def _get_query_plan(self, model, query, **search):
+        with app.test_request_context('/', query_string=search):
+            statement = views.search_model(model, query).statement
+
+            sql = str(statement.compile(
+                dialect=db.engine.dialect,
+                compile_kwargs={'literal_binds': True}))
+
+        return ' '.join(
+            row[-1] for row in db.engine.execute(
+                'EXPLAIN QUERY PLAN ' + sql))
+
+    def test_name_ignore_case(self):
+        ports_path = '/boxen/%s/ports' % self.box_id
+
+        for name in ('eth1', 'ETH1', 'Eth1'):
+            with self.subTest(name=name):
+                members = self._search(ports_path, name=name)
+
+                self.assertEqual(1, len(members))
+
+        self.assertEqual(
+            self._search(ports_path, name='eth0'),
+            self._search(ports_path, name='ETH0'))
+
+        self.assertEqual([], self._search(ports_path, name='eth'))
+
+    def test_uuid_ignore_case(self):
+        for uuid in (self.box_uuid.lower(), self.box_uuid.upper()):
+            with self.subTest(uuid=uuid):
+                self.assertEqual(
+                    [views.PREFIX + '/boxen/%s' % self.box_id],
+                    self._search('/boxen', uuid=uuid))
+
+    def test_several_terms(self):
+        members = self._search(
+            '/boxen/%s/ports' % self.box_id, name=['ETH0', 'eth1'])
+
+        self.assertEqual(2, len(members))
+
+    def test_exact_value(self):
+        ports_path = '/boxen/%s/ports' % self.box_id
+
+        self.assertEqual(1, len(self._search(ports_path, mtu='9000')))
+        self.assertEqual(1, len(self._search(ports_path, mtu='1500')))
+        self.assertEqual([], self._search(ports_path, mtu='900'))
+
+        self.assertEqual([], self._search('/boxen', vendor='cisco '))
+        self.assertEqual([], self._search('/boxen', vendor='cis'))
+
+    def test_unknown_column(self):
+        response = self.client.get(
+            views.PREFIX + '/boxen', query_string={'colour': 'red'})
+
+        self.assertEqual(404, response.status_code)
+
+    def test_ports_name_index(self):
+        plan = self._get_query_plan(
+            models.Port, models.Port.query.filter_by(box_id=self.box_id),
+            name='ETH1')
+
+        self.assertIn('ix_port_box_id_name_nocase', plan)
+
+    def test_boxen_uuid_index(self):
+        plan = self._get_query_plan(
+            models.Box, models.Box.query, uuid=self.box_uuid.upper())
+
+        self.assertIn('ix_box_uuid_nocase', plan)
+
+    def test_unindexed_scan(self):
+        plan = self._get_query_plan(
+            models.Box, models.Box.query, vendor='Cisco')
+
+        self.assertNotIn('INDEX', plan)
+
+    def test_nocase_compile(self):
+        self.assertEqual(
+            'port.name COLLATE NOCASE',
+            str(models.NoCase(models.Port.name).compile(
+                dialect=sqlite.dialect())))
+
+        self.assertEqual(
+            'lower(port.name)',
+            str(models.NoCase(models.Port.name).compile(
+                dialect=postgresql.dialect())))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
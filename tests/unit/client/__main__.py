@@ -8,7 +8,11 @@
 import unittest
 
 suite = unittest.TestLoader().loadTestsFromNames(
-    ['tests.unit.client.resources.box.__main__.suite']
+    ['tests.unit.client.test_async_rest_client.suite',
+     'tests.unit.client.test_cache.suite',
+     'tests.unit.client.test_deadline.suite',
+     'tests.unit.client.test_replica.suite',
+     'tests.unit.client.resources.box.__main__.suite']
 )
 
 
@@ -5,13 +5,16 @@
 # License: https://github.com/etingof/softboxen/LICENSE.rst
 #
 
+import asyncio
 import json
 import sys
 import unittest
 from unittest import mock
 
+from softboxen import exceptions
 from softboxen.client.resources.box import box
 from softboxen.client.resources.box import credentials
+from softboxen.client.resources.box import port
 from softboxen.client.resources.box import route
 
 
@@ -72,6 +75,86 @@ class BoxTestCase(unittest.TestCase):
         self.conn.get.return_value.json.assert_called_once_with()
 
 
+class BoxSnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(BoxSnapshotTestCase, self).setUp()
+
+        self.conn = mock.Mock()
+
+        with open('tests/unit/client/resources/samples/'
+                  'box_snapshot.json') as f:
+            self.json_doc = json.load(f)
+
+    def test_from_snapshot(self):
+        snapshot = box.Box.from_snapshot(self.json_doc)
+
+        self.assertEqual('/softboxen/v1/boxen/1', snapshot.path)
+        self.assertEqual('cisco', snapshot.vendor)
+
+        self.assertEqual(
+            ['admin'], [member.user for member in snapshot.credentials])
+        self.assertEqual(
+            ['10.0.0.254'], [member.gw for member in snapshot.routes])
+
+        ports = list(snapshot.ports)
+        self.assertEqual(['eth0'], [member.name for member in ports])
+        self.assertEqual(
+            '/softboxen/v1/boxen/1/ports/1/vlan/access',
+            ports[0].access_vlan.path)
+
+    def test_from_snapshot_offline(self):
+        json_doc = dict(self.json_doc)
+        del json_doc['_embedded']
+
+        snapshot = box.Box.from_snapshot(json_doc)
+
+        self.assertRaises(exceptions.NetworkError, lambda: snapshot.ports)
+
+    def test_from_snapshot_connection(self):
+        snapshot = box.Box.from_snapshot(self.json_doc, self.conn)
+
+        snapshot.delete()
+
+        self.conn.delete.assert_called_once_with(
+            path='/softboxen/v1/boxen/1')
+
+    def test_get_snapshot(self):
+        self.conn.get.return_value.json.return_value = self.json_doc
+
+        snapshot = box.Box(self.conn, '/softboxen/v1/boxen/1').get_snapshot()
+
+        self.assertEqual(self.json_doc, snapshot)
+        self.conn.get.assert_called_with(
+            path='/softboxen/v1/boxen/1/snapshot')
+
+    def test_restore_snapshot(self):
+        self.conn.get.return_value.json.return_value = self.json_doc
+        self.conn.post.return_value.json.return_value = self.json_doc
+
+        restored = box.Box(
+            self.conn, '/softboxen/v1/boxen/1').restore_snapshot(
+                self.json_doc)
+
+        self.conn.post.assert_called_once_with(
+            path='/softboxen/v1/boxen/1/snapshot', data=self.json_doc)
+        self.assertEqual('/softboxen/v1/boxen/1', restored.path)
+        self.assertEqual(1, len(restored.ports))
+        self.conn.invalidate.assert_called_once_with('/softboxen/v1/boxen/1')
+
+    def test_restore_snapshot_failed(self):
+        self.conn.get.return_value.json.return_value = self.json_doc
+        self.conn.post.side_effect = exceptions.NetworkError(
+            url='/softboxen/v1/boxen/1/snapshot', error='timed out')
+
+        self.assertRaises(
+            exceptions.NetworkError,
+            box.Box(self.conn, '/softboxen/v1/boxen/1').restore_snapshot,
+            self.json_doc)
+
+        self.conn.invalidate.assert_not_called()
+
+
 class BoxCollectionTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -112,6 +195,83 @@ class BoxCollectionTestCase(unittest.TestCase):
         self.assertEqual(1, len(members))
 
 
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+
+    finally:
+        loop.close()
+
+
+class AsyncBoxTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncBoxTestCase, self).setUp()
+
+        self.conn = mock.Mock()
+
+        with open('tests/unit/client/resources/samples/box.json') as f:
+            self.json_doc = json.load(f)
+
+        async def get(path):
+            return self.conn.get.return_value
+
+        self.conn.get.side_effect = get
+        self.conn.get.return_value.json.return_value = self.json_doc
+
+        self.box = run(box.AsyncBox(self.conn, '/softboxen/v1/boxen/1').load())
+
+    def test__parse_attributes(self):
+        self.assertEqual('cisco', self.box.vendor)
+        self.assertEqual('123e4567-e89b-12d3-a456-426655440000', self.box.uuid)
+        self.assertEqual('/softboxen/v1/boxen/1', self.box.path)
+
+    def test_ports(self):
+        with open('tests/unit/client/resources/samples/'
+                  'port_collection.json') as f:
+            self.conn.get.return_value.json.return_value = json.load(f)
+
+        expected = self.box.ports
+
+        self.assertIsInstance(expected, port.AsyncPortCollection)
+        self.assertEqual('/softboxen/v1/boxen/1/ports', expected.path)
+
+        run(expected.load())
+
+        self.conn.get.assert_called_with(path='/softboxen/v1/boxen/1/ports')
+        self.assertEqual(
+            ['/softboxen/v1/boxen/1/ports/1'], expected.members_identities)
+
+    def test_routes(self):
+        self.assertIsInstance(self.box.routes, route.AsyncRouteCollection)
+
+    def test_credentials(self):
+        self.assertIsInstance(
+            self.box.credentials, credentials.AsyncCredentialsCollection)
+
+    def test_restore_snapshot(self):
+        with open('tests/unit/client/resources/samples/'
+                  'box_snapshot.json') as f:
+            json_doc = json.load(f)
+
+        async def post(path, data):
+            return self.conn.post.return_value
+
+        self.conn.post.side_effect = post
+        self.conn.post.return_value.json.return_value = json_doc
+        self.conn.get.return_value.json.return_value = json_doc
+
+        box_ = run(box.AsyncBox(self.conn, '/softboxen/v1/boxen/1').load())
+
+        restored = run(box_.restore_snapshot(json_doc))
+
+        self.conn.post.assert_called_once_with(
+            path='/softboxen/v1/boxen/1/snapshot', data=json_doc)
+        self.conn.invalidate.assert_called_once_with('/softboxen/v1/boxen/1')
+        self.assertEqual('/softboxen/v1/boxen/1', restored.path)
+
+
 suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
 
 if __name__ == '__main__':
@@ -5,12 +5,15 @@
 # License: https://github.com/etingof/softboxen/LICENSE.rst
 #
 
+import asyncio
 import copy
 import unittest
 from http import client as http_client
 from unittest import mock
 
 from softboxen import exceptions
+from softboxen.client import cache
+from softboxen.client import deadline
 from softboxen.client.resources import base
 
 
@@ -51,6 +54,30 @@ class ResourceTestCase(unittest.TestCase):
 
         self.conn.get.assert_called_once_with(path='//softboxen/1')
 
+    def test_create_many(self):
+        self.conn.post.side_effect = lambda path, data: mock.Mock(
+            json=mock.Mock(return_value=[
+                {'_links': {'self': '//softboxen/%s' % item['id']}}
+                for item in data]))
+
+        resources = base.Resource.create_many(
+            self.conn, '//softboxen', ({'id': idx} for idx in range(5)),
+            chunk_size=2)
+
+        self.conn.post.assert_has_calls([
+            mock.call(path='//softboxen', data=[{'id': 0}, {'id': 1}]),
+            mock.call(path='//softboxen', data=[{'id': 2}, {'id': 3}]),
+            mock.call(path='//softboxen', data=[{'id': 4}])])
+        self.assertEqual(
+            ['//softboxen/%s' % idx for idx in range(5)],
+            [resource.path for resource in resources])
+        self.assertFalse(self.conn.get.called)
+
+    def test_create_many_empty(self):
+        self.assertEqual(
+            [], base.Resource.create_many(self.conn, '//softboxen', []))
+        self.assertFalse(self.conn.post.called)
+
     def test_delete(self):
         self.base_resource.delete()
         self.conn.delete.assert_called_once_with(path='//softboxen')
@@ -111,6 +138,447 @@ class ResourceCollectionBaseTestCase(unittest.TestCase):
             self.assertTrue(val.identity in ('1', '2'))
 
 
+class EmbeddedResourceCollectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(EmbeddedResourceCollectionTestCase, self).setUp()
+        self.conn = mock.MagicMock()
+        self.json_doc = {
+            'members': [
+                {'_links': {'self': '/softboxen/1'}},
+                {'_links': {'self': '/softboxen/2'}}
+            ],
+            '_embedded': {
+                'members': [
+                    {'_links': {'self': '/softboxen/1'}, 'Name': 'one'}
+                ]
+            }
+        }
+        self.conn.get.return_value.json.return_value = self.json_doc
+
+    def test_expand(self):
+        with mock.patch.object(
+                TestNamedResourceCollection, 'EXPAND',
+                ('members', 'members.ports')):
+            TestNamedResourceCollection(self.conn, '/softboxen')
+
+        self.conn.get.assert_called_once_with(
+            path='/softboxen', params={'expand': 'members,members.ports'})
+
+    def test_embedded_members(self):
+        collection = TestNamedResourceCollection(self.conn, '/softboxen')
+        self.conn.get.reset_mock()
+
+        member = collection.get_member('/softboxen/1')
+
+        self.assertEqual('one', member.name)
+        self.assertFalse(self.conn.get.called)
+
+        collection.get_member('/softboxen/2')
+
+        self.conn.get.assert_called_once_with(path='/softboxen/2')
+
+    def test_json_doc(self):
+        collection = TestNamedResourceCollection(
+            self.conn, '/softboxen', json_doc=self.json_doc)
+
+        self.assertFalse(self.conn.get.called)
+        self.assertEqual(2, len(collection))
+
+
+class PrefetchResourceCollectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(PrefetchResourceCollectionTestCase, self).setUp()
+        self.conn = mock.MagicMock()
+        self.test_resource_collection = TestResourceCollection(self.conn)
+        self.test_resource_collection.members_identities = [
+            str(x) for x in range(10)]
+
+    def test_prefetch_order(self):
+        members = list(
+            self.test_resource_collection.iter_members(workers=4))
+
+        self.assertEqual(
+            [str(x) for x in range(10)], [m.identity for m in members])
+        self.assertEqual(11, self.conn.get.call_count)
+
+    def test_prefetch_window(self):
+        members = self.test_resource_collection.iter_members(
+            workers=2, window=3)
+
+        next(members)
+        members.close()
+
+        self.assertLessEqual(self.conn.get.call_count, 1 + 4)
+
+    def test_prefetch_class_default(self):
+        with mock.patch.object(
+                TestResourceCollection, 'PREFETCH_WORKERS', 3):
+            with mock.patch.object(
+                    base.futures, 'ThreadPoolExecutor',
+                    wraps=base.futures.ThreadPoolExecutor) as mock_pool:
+                members = list(self.test_resource_collection)
+
+        mock_pool.assert_called_once_with(max_workers=3)
+        self.assertEqual(10, len(members))
+
+    def test_prefetch_error(self):
+        def get(path):
+            if path == '/softboxen/5':
+                raise exceptions.ResourceNotFoundError(
+                    method='GET', url=path,
+                    response=mock.MagicMock(
+                        status_code=http_client.NOT_FOUND))
+
+            return mock.MagicMock()
+
+        self.conn.get.side_effect = get
+
+        members = self.test_resource_collection.iter_members(workers=4)
+
+        for idx in range(5):
+            self.assertEqual(str(idx), next(members).identity)
+
+        self.assertRaises(exceptions.ResourceNotFoundError, next, members)
+
+    def test_prefetch_deadline(self):
+        remaining = []
+
+        def get(path):
+            if path != '/softboxen':
+                remaining.append(deadline.remaining())
+
+            return mock.MagicMock()
+
+        self.conn.get.side_effect = get
+
+        with deadline.deadline(60):
+            members = list(
+                self.test_resource_collection.iter_members(workers=4))
+
+        self.assertEqual(10, len(members))
+        self.assertEqual(10, len(remaining))
+        self.assertNotIn(None, remaining)
+
+
+class TestPagedResourceCollection(base.ResourceCollection):
+
+    PAGE_SIZE = 2
+
+    @property
+    def _resource_type(self):
+        return TestNamedResource
+
+
+class PagedResourceCollectionTestCase(unittest.TestCase):
+
+    DOCUMENTS = {
+        '/softboxen': {
+            'members': [
+                {'_links': {'self': '/softboxen/1'}},
+                {'_links': {'self': '/softboxen/2'}}
+            ],
+            'count': 3,
+            '_links': {
+                'self': '/softboxen',
+                'next': '/softboxen?limit=2&after=2'
+            }
+        },
+        '/softboxen?limit=2&after=2': {
+            'members': [
+                {'_links': {'self': '/softboxen/3'}}
+            ],
+            '_embedded': {
+                'members': [
+                    {'Name': 'three', '_links': {'self': '/softboxen/3'}}
+                ]
+            },
+            'count': 3,
+            '_links': {
+                'self': '/softboxen'
+            }
+        },
+        '/softboxen/1': {'Name': 'one'},
+        '/softboxen/2': {'Name': 'two'}
+    }
+
+    def setUp(self):
+        super(PagedResourceCollectionTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.conn.get.side_effect = lambda path, params=None: mock.Mock(
+            json=mock.Mock(return_value=self.DOCUMENTS[path]))
+        self.collection = TestPagedResourceCollection(
+            self.conn, '/softboxen')
+
+    def test_first_page(self):
+        self.conn.get.assert_called_once_with(
+            path='/softboxen', params={'limit': 2})
+        self.assertEqual(
+            ['/softboxen/1', '/softboxen/2'],
+            self.collection.members_identities)
+        self.assertEqual(3, len(self.collection))
+
+    def test_iter_members(self):
+        members = iter(self.collection)
+
+        self.assertEqual('one', next(members).name)
+        self.assertEqual('two', next(members).name)
+        self.assertEqual(3, self.conn.get.call_count)
+
+        self.assertEqual('three', next(members).name)
+        self.conn.get.assert_called_with(path='/softboxen?limit=2&after=2')
+        self.assertEqual(4, self.conn.get.call_count)
+
+        self.assertRaises(StopIteration, next, members)
+
+    def test_iter_members_prefetch(self):
+        names = [member.name for member in
+                 self.collection.iter_members(workers=2)]
+
+        self.assertEqual(['one', 'two', 'three'], names)
+
+    def test_find_on_next_page(self):
+        self.conn.get.side_effect = [
+            exceptions.ResourceNotFoundError(
+                method='GET', url='/softboxen',
+                response=mock.MagicMock(status_code=http_client.NOT_FOUND)),
+            mock.Mock(json=mock.Mock(
+                return_value=self.DOCUMENTS['/softboxen/1'])),
+            mock.Mock(json=mock.Mock(
+                return_value=self.DOCUMENTS['/softboxen/2'])),
+            mock.Mock(json=mock.Mock(
+                return_value=self.DOCUMENTS['/softboxen?limit=2&after=2']))
+        ]
+
+        member = self.collection.find_by_field_value('name', 'three')
+
+        self.assertEqual('/softboxen/3', member.path)
+
+
+class TestNamedResource(base.Resource):
+
+    name = base.Field('Name')
+    size = base.Field('Size', converter=int)
+
+    @property
+    def ports(self):
+        return self._get_sub_resource(TestNamedResourceCollection, 'ports')
+
+
+class TestNamedResourceCollection(base.ResourceCollection):
+
+    @property
+    def _resource_type(self):
+        return TestNamedResource
+
+
+class FindResourceCollectionTestCase(unittest.TestCase):
+
+    DOCUMENTS = {
+        '/softboxen': {
+            'members': [
+                {'_links': {'self': '/softboxen/1'}},
+                {'_links': {'self': '/softboxen/2'}}
+            ]
+        },
+        '/softboxen/1': {'Name': 'one', 'Size': '1'},
+        '/softboxen/2': {'Name': 'Two', 'Size': '2'}
+    }
+
+    def setUp(self):
+        super(FindResourceCollectionTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.conn.get.side_effect = self._get
+        self.collection = TestNamedResourceCollection(self.conn, '/softboxen')
+        self.conn.get.reset_mock()
+
+    def _get(self, path, params=None):
+        json_doc = self.DOCUMENTS[path]
+
+        if params:
+            members = [
+                member for member in json_doc['members']
+                if self.DOCUMENTS[member['_links']['self']][
+                    'Name'].lower() == params['Name'].lower()
+            ]
+
+            json_doc = {'members': members}
+
+            if params.get('expand') == 'members':
+                json_doc['_embedded'] = {
+                    'members': [
+                        dict(self.DOCUMENTS[member['_links']['self']],
+                             **member)
+                        for member in members
+                    ]
+                }
+
+        return mock.Mock(**{'json.return_value': json_doc})
+
+    def test_find_pushdown(self):
+        member = self.collection.find_by_field_value('name', 'Two')
+
+        self.assertEqual('/softboxen/2', member.path)
+        self.assertEqual('Two', member.name)
+        self.conn.get.assert_called_once_with(
+            path='/softboxen', params={'Name': 'Two', 'expand': 'members'})
+
+    def test_find_case_sensitive(self):
+        self.assertRaises(
+            exceptions.InvalidInputError,
+            self.collection.find_by_field_value, 'name', 'two')
+
+    def test_find_ignore_case(self):
+        member = self.collection.find_by_field_value(
+            'name', 'two', ignore_case=True)
+
+        self.assertEqual('/softboxen/2', member.path)
+
+    def test_find_multiple_fields(self):
+        member = self.collection.find_by_field_values(name='Two', size=2)
+
+        self.assertEqual('/softboxen/2', member.path)
+        self.conn.get.assert_called_once_with(
+            path='/softboxen', params={'Name': 'Two', 'expand': 'members'})
+
+    def test_find_scan(self):
+        member = self.collection.find_by_field_value('size', 2)
+
+        self.assertEqual('/softboxen/2', member.path)
+        self.conn.get.assert_has_calls([
+            mock.call(path='/softboxen/1'),
+            mock.call(path='/softboxen/2')])
+
+    def test_embedded_sub_resource(self):
+        ports = {
+            'members': [{'_links': {'self': '/softboxen/1/ports/1'}}]
+        }
+
+        resource = TestNamedResource(
+            self.conn, '/softboxen/1', json_doc={
+                'ports': {'_links': {'self': '/softboxen/1/ports'}},
+                '_embedded': {'ports': ports}
+            })
+
+        collection = resource.ports
+
+        self.assertFalse(self.conn.get.called)
+        self.assertEqual('/softboxen/1/ports', collection.path)
+        self.assertEqual(
+            ['/softboxen/1/ports/1'], collection.members_identities)
+
+    def test_find_search_unsupported(self):
+        self.conn.get.side_effect = [
+            exceptions.ResourceNotFoundError(
+                method='GET', url='/softboxen',
+                response=mock.MagicMock(status_code=http_client.NOT_FOUND)),
+            self._get('/softboxen/1'),
+            self._get('/softboxen/2')
+        ]
+
+        member = self.collection.find_by_field_value('name', 'Two')
+
+        self.assertEqual('/softboxen/2', member.path)
+        self.assertEqual(3, self.conn.get.call_count)
+
+
+class SparseNamedResource(TestNamedResource):
+
+    SPARSE_FIELDS = True
+
+    LINK_FIELDS = ('ports',)
+
+
+class SparseNamedResourceCollection(base.ResourceCollection):
+
+    EXPAND = ('members',)
+
+    @property
+    def _resource_type(self):
+        return SparseNamedResource
+
+
+class SparseFieldsResourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(SparseFieldsResourceTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.conn.get.return_value.json.return_value = {}
+
+    def test_fieldset(self):
+        self.assertEqual('Name,Size,ports', SparseNamedResource._fieldset)
+
+    def test_load(self):
+        SparseNamedResource(self.conn, '/softboxen/1')
+
+        self.conn.get.assert_called_once_with(
+            path='/softboxen/1', params={'fields': 'Name,Size,ports'})
+
+    def test_load_all_fields(self):
+        TestNamedResource(self.conn, '/softboxen/1')
+
+        self.conn.get.assert_called_once_with(path='/softboxen/1')
+
+    def test_load_collection(self):
+        SparseNamedResourceCollection(self.conn, '/softboxen')
+
+        self.conn.get.assert_called_once_with(
+            path='/softboxen', params={
+                'expand': 'members', 'fields': 'Name,Size,ports'})
+
+
+class IdentityMapResourceTestCase(unittest.TestCase):
+
+    DOCUMENTS = {
+        '/softboxen/1': {
+            'Name': 'one',
+            'ports': {'_links': {'self': '/softboxen/1/ports'}}
+        },
+        '/softboxen/1/ports': {
+            'members': [{'_links': {'self': '/softboxen/1/ports/1'}}]
+        },
+        '/softboxen/1/ports/1': {'Name': 'eth0'}
+    }
+
+    def setUp(self):
+        super(IdentityMapResourceTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.conn.identity_map = cache.IdentityMap(10)
+        self.conn.get.side_effect = lambda path: mock.Mock(
+            json=mock.Mock(return_value=self.DOCUMENTS[path]))
+        self.resource = TestNamedResource(self.conn, '/softboxen/1')
+        self.conn.get.reset_mock()
+
+    def test_sub_resource_reused(self):
+        ports = self.resource.ports
+
+        self.assertIs(ports, self.resource.ports)
+        self.conn.get.assert_called_once_with(path='/softboxen/1/ports')
+
+    def test_member_reused(self):
+        ports = self.resource.ports
+
+        self.assertIs(
+            ports.get_member('/softboxen/1/ports/1'),
+            ports.get_member('/softboxen/1/ports/1'))
+        self.assertEqual(2, self.conn.get.call_count)
+
+    def test_invalidated(self):
+        ports = self.resource.ports
+
+        self.conn.identity_map.invalidate('/softboxen/1/ports')
+
+        self.assertIsNot(ports, self.resource.ports)
+        self.assertEqual(2, self.conn.get.call_count)
+
+    def test_no_identity_map(self):
+        self.conn.identity_map = None
+
+        self.assertIsNot(self.resource.ports, self.resource.ports)
+        self.assertEqual(2, self.conn.get.call_count)
+
+
 class TestCollectionField(base.CollectionField):
     string = base.Field('String', required=True)
     integer = base.Field('Integer', converter=int)
@@ -164,6 +632,14 @@ class FullResourceTestCase(unittest.TestCase):
             'box one', self.test_resource.collection_field[0].string)
         self.assertEqual(2, self.test_resource.collection_field[1].integer)
 
+    def test_fields_table(self):
+        self.assertEqual(
+            ['collection_field', 'enumeration_field', 'integer', 'string'],
+            [attr for attr, _ in FullResource._fields])
+        self.assertEqual(
+            ['integer', 'string'],
+            [attr for attr, _ in TestCollectionField._subfields])
+
     def test_missing_required(self):
         del self.json['String']
         self.assertRaisesRegex(
@@ -176,3 +652,274 @@ class FullResourceTestCase(unittest.TestCase):
             exceptions.MalformedAttributeError,
             'attribute Integer is malformed.*invalid literal for int',
             self.test_resource.load)
+
+
+class LazyFullResource(FullResource):
+
+    LAZY_FIELDS = True
+
+
+class LazyResourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(LazyResourceTestCase, self).setUp()
+        self.conn = mock.Mock()
+        self.json = copy.deepcopy(TEST_JSON)
+        self.conn.get.return_value.json.return_value = self.json
+        self.test_resource = LazyFullResource(self.conn)
+
+    def test_ok(self):
+        self.assertNotIn('string', vars(self.test_resource))
+        self.assertEqual('a string', self.test_resource.string)
+        self.assertEqual(42, self.test_resource.integer)
+        self.assertEqual(
+            'box one', self.test_resource.collection_field[0].string)
+        self.assertEqual(2, self.test_resource.collection_field[1].integer)
+        self.assertIsNone(self.test_resource.enumeration_field)
+
+    def test_memoized(self):
+        with mock.patch.object(
+                FullResource.integer, '_converter') as converter:
+            converter.return_value = 42
+
+            self.assertEqual(42, self.test_resource.integer)
+            self.assertEqual(42, self.test_resource.integer)
+
+        converter.assert_called_once_with('42')
+
+    def test_reload(self):
+        self.assertEqual('a string', self.test_resource.string)
+
+        self.json['String'] = 'another string'
+        self.test_resource.load()
+
+        self.assertEqual('another string', self.test_resource.string)
+
+    def test_missing_required(self):
+        del self.json['String']
+        self.test_resource.load()
+
+        self.assertEqual(42, self.test_resource.integer)
+        self.assertRaisesRegex(
+            exceptions.MissingAttributeError,
+            'String', getattr, self.test_resource, 'string')
+
+    def test_class_fields(self):
+        self.assertIsInstance(LazyFullResource.string, base.Field)
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+
+    finally:
+        loop.close()
+
+
+def make_async(mock_method, return_value=None):
+    async def call(*args, **kwargs):
+        return mock_method.return_value
+
+    mock_method.side_effect = call
+    mock_method.return_value = return_value or mock.Mock()
+
+
+class AsyncResourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncResourceTestCase, self).setUp()
+        self.conn = mock.Mock()
+        make_async(self.conn.get)
+        make_async(self.conn.post)
+        make_async(self.conn.delete)
+        self.conn.get.return_value.json.return_value = {}
+
+    def test_not_loaded_on_init(self):
+        base.AsyncResource(connection=self.conn, path='//softboxen')
+        self.assertFalse(self.conn.get.called)
+
+    def test_await(self):
+        resource = base.AsyncResource(connection=self.conn, path='//softboxen')
+
+        self.assertIs(resource, run(self._await(resource)))
+        self.assertIs(resource, run(self._await(resource)))
+
+        self.conn.get.assert_called_once_with(path='//softboxen')
+
+    def test_await_embedded(self):
+        resource = base.AsyncResource(
+            connection=self.conn, path='//softboxen', json_doc={})
+
+        self.assertIs(resource, run(self._await(resource)))
+
+        self.assertFalse(self.conn.get.called)
+
+    @staticmethod
+    async def _await(resource):
+        return await resource
+
+    def test_create_redir(self):
+        mock_rsp = self.conn.post.return_value
+        mock_rsp.status_code = 302
+        mock_rsp.headers = {'Location': '//softboxen/1'}
+
+        resource = run(base.AsyncResource.create(
+            connection=self.conn, path='//softboxen', field='value'))
+
+        self.conn.post.assert_called_once_with(
+            path='//softboxen',
+            allow_redirects=False,
+            data={'field': 'value'})
+
+        self.conn.get.assert_called_once_with(path='//softboxen/1')
+        self.assertEqual('//softboxen/1', resource.path)
+
+    def test_create_many(self):
+        make_async(self.conn.post, mock.Mock(json=mock.Mock(return_value=[
+            {'_links': {'self': '//softboxen/1'}}])))
+
+        resources = run(base.AsyncResource.create_many(
+            self.conn, '//softboxen', [{'field': 'value'}]))
+
+        self.conn.post.assert_called_once_with(
+            path='//softboxen', data=[{'field': 'value'}])
+        self.assertEqual(['//softboxen/1'], [r.path for r in resources])
+        self.assertFalse(self.conn.get.called)
+
+    def test_delete(self):
+        resource = base.AsyncResource(connection=self.conn, path='//softboxen')
+        run(resource.delete())
+        self.conn.delete.assert_called_once_with(path='//softboxen')
+
+
+class TestAsyncResource(base.AsyncResource):
+
+    string = base.Field('String', required=True)
+
+
+class TestAsyncResourceCollection(base.AsyncResourceCollection):
+
+    @property
+    def _resource_type(self):
+        return TestAsyncResource
+
+
+class AsyncResourceCollectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncResourceCollectionTestCase, self).setUp()
+        self.conn = mock.Mock()
+        make_async(self.conn.get)
+
+        documents = {
+            '/softboxen': {
+                'members': [
+                    {'_links': {'self': '/softboxen/1'}},
+                    {'_links': {'self': '/softboxen/2'}}
+                ]
+            },
+            '/softboxen/1': {'String': 'one'},
+            '/softboxen/2': {'String': 'two'}
+        }
+
+        async def get(path, params=None):
+            json_doc = documents[path]
+
+            if params:
+                members = [
+                    member for member in json_doc['members']
+                    if documents[member['_links']['self']][
+                        'String'].lower() == params['String'].lower()
+                ]
+
+                json_doc = {
+                    'members': members,
+                    '_embedded': {
+                        'members': [
+                            dict(documents[member['_links']['self']],
+                                 **member)
+                            for member in members
+                        ]
+                    }
+                }
+
+            return mock.Mock(**{'json.return_value': json_doc})
+
+        self.conn.get.side_effect = get
+
+        self.collection = run(
+            TestAsyncResourceCollection(self.conn, '/softboxen').load())
+
+    def test_members_identities(self):
+        self.assertEqual(2, len(self.collection))
+        self.assertEqual(
+            ['/softboxen/1', '/softboxen/2'],
+            self.collection.members_identities)
+
+    def test_async_iteration(self):
+        async def collect():
+            return [member async for member in self.collection]
+
+        members = run(collect())
+
+        self.assertEqual(['one', 'two'], [m.string for m in members])
+
+    def test_sync_iteration(self):
+        self.assertRaises(TypeError, list, self.collection)
+
+    def test_find_by_field_value(self):
+        member = run(self.collection.find_by_field_value('string', 'two'))
+        self.assertEqual('/softboxen/2', member.path)
+
+    def test_find_by_field_value_missing(self):
+        self.assertRaises(
+            exceptions.InvalidInputError, run,
+            self.collection.find_by_field_value('string', 'three'))
+
+    def test_async_iteration_not_loaded(self):
+        collection = TestAsyncResourceCollection(self.conn, '/softboxen')
+
+        async def collect():
+            return [member async for member in collection]
+
+        members = run(collect())
+
+        self.assertEqual(['one', 'two'], [m.string for m in members])
+
+    def test_find_pushdown_not_loaded(self):
+        collection = TestAsyncResourceCollection(self.conn, '/softboxen')
+        self.conn.get.reset_mock()
+
+        member = run(collection.find_by_field_value('string', 'two'))
+
+        self.assertEqual('/softboxen/2', member.path)
+        self.assertEqual('two', member.string)
+        self.conn.get.assert_called_once_with(
+            path='/softboxen', params={'String': 'two', 'expand': 'members'})
+
+    def test_find_scan_not_loaded(self):
+        get = self.conn.get.side_effect
+
+        async def get_unsearchable(path, params=None):
+            if params:
+                raise exceptions.BadRequestError(
+                    method='GET', url=path, response=mock.MagicMock(
+                        status_code=http_client.BAD_REQUEST))
+
+            return await get(path)
+
+        self.conn.get.side_effect = get_unsearchable
+
+        collection = TestAsyncResourceCollection(self.conn, '/softboxen')
+        self.conn.get.reset_mock()
+
+        member = run(collection.find_by_field_value('string', 'two'))
+
+        self.assertEqual('/softboxen/2', member.path)
+        self.assertEqual([
+            mock.call(path='/softboxen', params={
+                'String': 'two', 'expand': 'members'}),
+            mock.call(path='/softboxen'),
+            mock.call(path='/softboxen/1'),
+            mock.call(path='/softboxen/2')], self.conn.get.call_args_list)
@@ -0,0 +1,167 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from http import client as http_client
+from unittest import mock
+
+import aiohttp
+
+from softboxen import exceptions
+from softboxen.client import async_rest_client
+from softboxen.client import deadline
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+
+    finally:
+        loop.close()
+
+
+class FakeResponse(object):
+
+    def __init__(self, status, body=b'', headers=None):
+        self.status = status
+        self.reason = 'reason'
+        self.headers = headers or {}
+        self.url = 'http://softboxen.com:1234/box/path'
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class AsyncRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncRestClientTestCase, self).setUp()
+        self.conn = async_rest_client.AsyncRestClient(
+            'http://softboxen.com:1234')
+        self.session = mock.Mock(spec=aiohttp.ClientSession)
+        self.conn._session = self.session
+        self.request = self.session.request
+        self.request.return_value = FakeResponse(
+            http_client.OK, b'{"box": "data"}', {'ETag': '"1"'})
+
+    def test_get(self):
+        response = run(self.conn.get(
+            path='box/path', headers={'X-Box': 'header'}))
+
+        self.request.assert_called_once_with(
+            'GET', 'http://softboxen.com:1234/box/path', json=None,
+            headers={'X-Box': 'header'}, timeout=mock.ANY)
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual({'box': 'data'}, response.json())
+        self.assertEqual('"1"', response.headers['etag'])
+
+    def test_post(self):
+        run(self.conn.post(path='box/path', data={'box': 'data'}))
+
+        self.request.assert_called_once_with(
+            'POST', 'http://softboxen.com:1234/box/path',
+            json={'box': 'data'}, headers={}, timeout=mock.ANY)
+
+    def test_delete(self):
+        run(self.conn.delete(path='box/path'))
+
+        self.request.assert_called_once_with(
+            'DELETE', 'http://softboxen.com:1234/box/path',
+            json=None, headers={}, timeout=mock.ANY)
+
+    def test_connection_error(self):
+        self.request.side_effect = aiohttp.ClientConnectionError
+
+        self.assertRaises(
+            exceptions.NetworkError, run, self.conn.get('box/path'))
+
+    def test_deadline(self):
+        async def get():
+            with deadline.deadline(10):
+                return await self.conn.get('box/path')
+
+        run(get())
+
+        timeout = self.request.call_args[1]['timeout']
+
+        self.assertLessEqual(timeout.total, 10)
+
+    def test_deadline_exceeded(self):
+        async def get():
+            with deadline.deadline(0):
+                return await self.conn.get('box/path')
+
+        self.assertRaises(exceptions.DeadlineExceededError, run, get())
+        self.assertFalse(self.request.called)
+
+    def test_not_found_error(self):
+        self.request.return_value = FakeResponse(
+            http_client.NOT_FOUND, b'not json')
+
+        self.assertRaises(
+            exceptions.ResourceNotFoundError, run,
+            self.conn.get('box/path'))
+
+    def test_file_url(self):
+        conn = async_rest_client.AsyncRestClient(
+            'file://%s/' % os.path.abspath(
+                'tests/unit/client/resources/samples'))
+
+        response = run(conn.get('box.json'))
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual('cisco', response.json()['vendor'])
+
+    def test_file_url_executor(self):
+        conn = async_rest_client.AsyncRestClient(
+            'file://%s/' % os.path.abspath(
+                'tests/unit/client/resources/samples'))
+
+        send = conn._file_adapter.send
+        threads = []
+
+        def send_in_thread(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return send(*args, **kwargs)
+
+        with mock.patch.object(
+                conn._file_adapter, 'send', side_effect=send_in_thread):
+            response = run(conn.get('box.json'))
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.main_thread(), threads[0])
+
+    def test_close(self):
+        async def close():
+            pass
+
+        self.session.close.side_effect = close
+
+        run(self.conn.close())
+
+        self.session.close.assert_called_once_with()
+        self.assertIsNone(self.conn._session)
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
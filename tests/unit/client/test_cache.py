@@ -0,0 +1,381 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import sys
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from softboxen import exceptions
+from softboxen import lru
+from softboxen.client import cache
+from softboxen.client import deadline
+
+
+def make_response(content=b'{"box": "data"}', **headers):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers.update(headers)
+    return response
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+        self.cache = cache.ResponseCache(2, ttl=10)
+
+    def test_store_etag(self):
+        response = self.cache.store('/box/1', make_response(ETag='"1"'))
+
+        self.assertIsInstance(response, cache.CachedResponse)
+        self.assertEqual(
+            {'If-None-Match': '"1"'}, self.cache.validators('/box/1'))
+
+    def test_store_last_modified(self):
+        self.cache.store(
+            '/box/1', make_response(**{'Last-Modified': 'yesterday'}))
+
+        self.assertEqual(
+            {'If-Modified-Since': 'yesterday'},
+            self.cache.validators('/box/1'))
+
+    def test_store_no_validators(self):
+        response = make_response()
+
+        self.assertIs(response, self.cache.store('/box/1', response))
+        self.assertEqual({}, self.cache.validators('/box/1'))
+        self.assertIsNone(self.cache.fetch('/box/1'))
+
+    def test_fetch_parsed_once(self):
+        self.cache.store('/box/1', make_response(ETag='"1"'))
+
+        response = self.cache.fetch('/box/1')
+
+        self.assertEqual({'box': 'data'}, response.json())
+        self.assertIs(response.json(), self.cache.fetch('/box/1').json())
+
+    def test_lru_eviction(self):
+        self.cache.store('/box/1', make_response(ETag='"1"'))
+        self.cache.store('/box/2', make_response(ETag='"2"'))
+        self.cache.validators('/box/1')
+        self.cache.store('/box/3', make_response(ETag='"3"'))
+
+        self.assertIsNotNone(self.cache.fetch('/box/1'))
+        self.assertIsNone(self.cache.fetch('/box/2'))
+        self.assertIsNotNone(self.cache.fetch('/box/3'))
+
+    @mock.patch.object(lru.time, 'monotonic', autospec=True)
+    def test_ttl_expiration(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.cache.store('/box/1', make_response(ETag='"1"'))
+
+        mock_monotonic.return_value = 105
+        self.assertTrue(self.cache.validators('/box/1'))
+
+        mock_monotonic.return_value = 111
+        self.assertEqual({}, self.cache.validators('/box/1'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_stats(self):
+        self.cache.store('/box/1', make_response(ETag='"1"'))
+        self.cache.store('/box/2', make_response(ETag='"2"'))
+        self.cache.store('/box/3', make_response(ETag='"3"'))
+        self.cache.fetch('/box/3')
+
+        expected = {
+            'size': 2,
+            'hits': 1,
+            'misses': 3,
+            'evictions': 1
+        }
+
+        self.assertEqual(expected, self.cache.stats())
+
+    def test_invalidate(self):
+        cache_ = cache.ResponseCache(10)
+
+        for key in ('http://a/boxen', 'http://a/boxen/1',
+                    'http://a/boxen/1?fields=vendor', 'http://a/boxen/1/ports',
+                    'http://a/boxen/10'):
+            cache_.store(key, make_response(ETag='"1"'))
+
+        cache_.invalidate('http://a/boxen/1')
+
+        self.assertIsNotNone(cache_.fetch('http://a/boxen'))
+        self.assertIsNotNone(cache_.fetch('http://a/boxen/10'))
+        self.assertEqual(2, len(cache_))
+
+        cache_.invalidate()
+
+        self.assertEqual(0, len(cache_))
+
+
+class IdentityMapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(IdentityMapTestCase, self).setUp()
+        self.identity_map = cache.IdentityMap(2, ttl=10)
+
+    def test_get_put(self):
+        resource = object()
+
+        self.assertIs(resource, self.identity_map.put('/box/1', resource))
+        self.assertIs(resource, self.identity_map.get('/box/1', object))
+        self.assertIs(
+            resource, self.identity_map.get(
+                'http://softboxen.com/box/1/', object))
+
+    def test_get_other_type(self):
+        self.identity_map.put('/box/1', object())
+
+        self.assertIsNone(self.identity_map.get('/box/1', dict))
+
+    def test_lru_eviction(self):
+        self.identity_map.put('/box/1', object())
+        self.identity_map.put('/box/2', object())
+        self.identity_map.get('/box/1', object)
+        self.identity_map.put('/box/3', object())
+
+        self.assertIsNotNone(self.identity_map.get('/box/1', object))
+        self.assertIsNone(self.identity_map.get('/box/2', object))
+        self.assertIsNotNone(self.identity_map.get('/box/3', object))
+
+    @mock.patch.object(lru.time, 'monotonic', autospec=True)
+    def test_ttl_expiration(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.identity_map.put('/box/1', object())
+
+        mock_monotonic.return_value = 105
+        self.assertIsNotNone(self.identity_map.get('/box/1', object))
+
+        mock_monotonic.return_value = 111
+        self.assertIsNone(self.identity_map.get('/box/1', object))
+        self.assertEqual(0, len(self.identity_map))
+
+    def test_invalidate(self):
+        identity_map = cache.IdentityMap(10)
+        identity_map.put('/boxen', object())
+        identity_map.put('/boxen/1', object())
+        identity_map.put('/boxen/1/ports', object())
+        identity_map.put('/boxen/10', object())
+
+        identity_map.invalidate('/boxen/1')
+
+        self.assertIsNotNone(identity_map.get('/boxen', object))
+        self.assertIsNone(identity_map.get('/boxen/1', object))
+        self.assertIsNone(identity_map.get('/boxen/1/ports', object))
+        self.assertIsNotNone(identity_map.get('/boxen/10', object))
+
+        identity_map.invalidate('/boxen', nested=False)
+
+        self.assertIsNone(identity_map.get('/boxen', object))
+        self.assertIsNotNone(identity_map.get('/boxen/10', object))
+
+        identity_map.invalidate()
+
+        self.assertEqual(0, len(identity_map))
+
+    def test_stats(self):
+        self.identity_map.put('/box/1', object())
+        self.identity_map.put('/box/2', object())
+        self.identity_map.put('/box/3', object())
+        self.identity_map.get('/box/3', object)
+        self.identity_map.get('/box/1', object)
+
+        expected = {
+            'size': 2,
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1
+        }
+
+        self.assertEqual(expected, self.identity_map.stats())
+
+
+class DocumentCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(DocumentCacheTestCase, self).setUp()
+        self.cache = cache.DocumentCache(2)
+
+    def test_fetch(self):
+        doc = self.cache.store('/a.json', (1, 2, 3, 4), {'box': 'data'})
+
+        self.assertIs(doc, self.cache.fetch('/a.json', (1, 2, 3, 4)))
+
+    def test_fetch_changed(self):
+        self.cache.store('/a.json', (1, 2, 3, 4), {'box': 'data'})
+
+        self.assertIsNone(self.cache.fetch('/a.json', (1, 2, 5, 4)))
+
+    def test_fetch_missing(self):
+        self.assertIsNone(self.cache.fetch('/a.json', (1, 2, 3, 4)))
+
+    def test_evict(self):
+        self.cache.store('/a.json', (1,), {})
+        self.cache.store('/b.json', (2,), {})
+        self.cache.fetch('/a.json', (1,))
+        self.cache.store('/c.json', (3,), {})
+
+        self.assertIsNone(self.cache.fetch('/b.json', (2,)))
+        self.assertEqual({}, self.cache.fetch('/a.json', (1,)))
+        self.assertEqual(2, len(self.cache))
+
+    def test_file_identity(self):
+        stat = mock.Mock(st_dev=1, st_ino=2, st_mtime_ns=3, st_size=4)
+
+        self.assertEqual(
+            (1, 2, 3, 4), cache.DocumentCache.file_identity(stat))
+
+    def test_stats(self):
+        self.cache.store('/a.json', (1,), {})
+        self.cache.fetch('/a.json', (1,))
+        self.cache.fetch('/b.json', (2,))
+        self.cache.store('/b.json', (2,), {})
+        self.cache.store('/c.json', (3,), {})
+
+        expected = {
+            'size': 2,
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1
+        }
+
+        self.assertEqual(expected, self.cache.stats())
+
+
+class SingleFlightTestCase(unittest.TestCase):
+
+    KEY = ('GET', 'http://softboxen.com/boxen')
+
+    def setUp(self):
+        super(SingleFlightTestCase, self).setUp()
+        self.single_flight = cache.SingleFlight()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def _call_concurrently(self, func, count=5):
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(self.single_flight.call(self.KEY, func))
+
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+
+        threads[0].start()
+        self.entered.wait(5)
+
+        for thread in threads[1:]:
+            thread.start()
+
+        while self.single_flight.stats()['coalesced'] < count - 1:
+            threading.Event().wait(0.001)
+
+        self.release.set()
+
+        for thread in threads:
+            thread.join(5)
+
+        return results, errors
+
+    def test_call(self):
+        self.assertEqual(3, self.single_flight.call(self.KEY, lambda x: x, 3))
+        self.assertEqual(0, len(self.single_flight))
+
+    def test_call_coalesced(self):
+        result = object()
+        calls = []
+
+        def func():
+            calls.append(1)
+            self.entered.set()
+            self.release.wait(5)
+            return result
+
+        results, errors = self._call_concurrently(func)
+
+        self.assertEqual([1], calls)
+        self.assertEqual([result] * 5, results)
+        self.assertEqual([], errors)
+
+        expected = {
+            'calls': 1,
+            'coalesced': 4,
+            'in_flight': 0
+        }
+
+        self.assertEqual(expected, self.single_flight.stats())
+
+    def test_call_coalesced_error(self):
+        error = ValueError()
+
+        def func():
+            self.entered.set()
+            self.release.wait(5)
+            raise error
+
+        results, errors = self._call_concurrently(func, count=3)
+
+        self.assertEqual([], results)
+        self.assertEqual([error] * 3, errors)
+
+    def test_call_coalesced_deadline(self):
+        result = object()
+
+        def func():
+            self.entered.set()
+            self.release.wait(5)
+            return result
+
+        results = []
+
+        thread = threading.Thread(
+            target=lambda: results.append(
+                self.single_flight.call(self.KEY, func)))
+        thread.start()
+
+        self.entered.wait(5)
+
+        try:
+            with deadline.deadline(0.01):
+                self.assertRaises(
+                    exceptions.DeadlineExceededError,
+                    self.single_flight.call, self.KEY, func)
+
+            with deadline.deadline(0):
+                self.assertRaises(
+                    exceptions.DeadlineExceededError,
+                    self.single_flight.call, self.KEY, func)
+
+        finally:
+            self.release.set()
+            thread.join(5)
+
+        self.assertEqual([result], results)
+
+    def test_call_sequential(self):
+        self.single_flight.call(self.KEY, lambda: 1)
+        self.single_flight.call(self.KEY, lambda: 2)
+
+        self.assertEqual(
+            {'calls': 2, 'coalesced': 0, 'in_flight': 0},
+            self.single_flight.stats())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,82 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import sys
+import unittest
+from unittest import mock
+
+from softboxen import exceptions
+from softboxen.client import deadline
+
+
+@mock.patch.object(deadline.time, 'monotonic', autospec=True)
+class DeadlineTestCase(unittest.TestCase):
+
+    def test_no_deadline(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        self.assertIsNone(deadline.remaining())
+        self.assertFalse(deadline.exceeded())
+        self.assertEqual(60, deadline.get_timeout('GET', '/', 60))
+        self.assertIsNone(deadline.get_timeout('GET', '/'))
+
+    def test_deadline(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        with deadline.deadline(10):
+            mock_monotonic.return_value = 104
+
+            self.assertEqual(6, deadline.remaining())
+            self.assertEqual(6, deadline.get_timeout('GET', '/', 60))
+            self.assertEqual(2, deadline.get_timeout('GET', '/', 2))
+            self.assertEqual(6, deadline.get_timeout('GET', '/'))
+
+        self.assertIsNone(deadline.remaining())
+
+    def test_deadline_exceeded(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        with deadline.deadline(10):
+            mock_monotonic.return_value = 110
+
+            self.assertTrue(deadline.exceeded())
+            self.assertRaises(
+                exceptions.DeadlineExceededError,
+                deadline.get_timeout, 'GET', '/', 60)
+
+    def test_deadline_nested(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        with deadline.deadline(10):
+            with deadline.deadline(20):
+                self.assertEqual(10, deadline.remaining())
+
+            with deadline.deadline(5):
+                self.assertEqual(5, deadline.remaining())
+
+            with deadline.deadline(None):
+                self.assertEqual(10, deadline.remaining())
+
+            self.assertEqual(10, deadline.remaining())
+
+    def test_suspended(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        with deadline.deadline(10):
+            with deadline.suspended():
+                self.assertIsNone(deadline.remaining())
+
+                with deadline.deadline(20):
+                    self.assertEqual(20, deadline.remaining())
+
+            self.assertEqual(10, deadline.remaining())
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,248 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+
+import json
+import sys
+import unittest
+
+import requests
+
+from softboxen import exceptions
+from softboxen.client import replica
+
+
+def make_response(json_doc, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(json_doc).encode()
+    return response
+
+
+def make_link(path):
+    return {'_links': {'self': path}}
+
+
+class FakeConnection(object):
+    """Serve REST API documents from a dict."""
+
+    def __init__(self):
+        self.docs = {}
+        self.changes = []
+        self.pruned = 0
+        self.calls = []
+
+        self.put_doc('/softboxen/v1', {
+            'description': 'Softboxen',
+            'boxen': make_link('/softboxen/v1/boxen'),
+            'changes': make_link('/softboxen/v1/changes'),
+            '_links': {'self': '/softboxen/v1'}})
+        self.put_doc('/softboxen/v1/boxen', {
+            'members': [make_link('/softboxen/v1/boxen/1')],
+            '_links': {'self': '/softboxen/v1/boxen'}})
+        self.put_doc('/softboxen/v1/boxen/1', {
+            'vendor': 'cisco',
+            'ports': make_link('/softboxen/v1/boxen/1/ports'),
+            '_links': {'self': '/softboxen/v1/boxen/1'}})
+        self.put_doc('/softboxen/v1/boxen/1/ports', {
+            'members': [],
+            '_links': {'self': '/softboxen/v1/boxen/1/ports'}})
+
+    def put_doc(self, path, json_doc):
+        self.docs[path] = json_doc
+
+    def change(self, action, path):
+        self.changes.append({'action': action, 'path': path})
+
+    def get(self, path='', params=None, **kwargs):
+        self.calls.append(path)
+
+        if path == '/softboxen/v1/changes':
+            since = (params or {}).get('since', len(self.changes))
+            if since < self.pruned:
+                raise exceptions.HTTPError(
+                    'GET', path, make_response({}, status_code=410))
+
+            return make_response({
+                'revision': len(self.changes),
+                'changes': [
+                    dict(change, revision=revision) for revision, change
+                    in enumerate(self.changes[since:], since + 1)],
+                '_links': {'self': path}})
+
+        try:
+            return make_response(self.docs[path])
+
+        except KeyError:
+            raise exceptions.ResourceNotFoundError(
+                'GET', path, make_response({}, status_code=404))
+
+    def post(self, *args, **kwargs):
+        self.calls.append(('post', args, kwargs))
+
+
+class ReplicaTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(ReplicaTestCase, self).setUp()
+        self.conn = FakeConnection()
+        self.conn.change('create', '/softboxen/v1/boxen/1')
+        self.replica = replica.Replica(self.conn)
+
+    def test_load(self):
+        self.replica.load()
+
+        self.assertEqual(1, self.replica.revision)
+        self.assertEqual(
+            set(self.conn.docs),
+            set(self.replica._responses))
+
+    def test_read_from_memory(self):
+        self.replica.load()
+        self.conn.calls[:] = []
+
+        response = self.replica.get('/softboxen/v1/boxen/1')
+
+        self.assertEqual('cisco', response.json()['vendor'])
+        self.assertEqual('Softboxen', self.replica.root.description)
+        self.assertEqual([], self.conn.calls)
+
+    def test_read_through(self):
+        self.replica.load()
+        self.conn.put_doc('/softboxen/v1/boxen/2', {'vendor': 'juniper'})
+        self.conn.calls[:] = []
+
+        response = self.replica.get('/softboxen/v1/boxen/2')
+
+        self.assertEqual('juniper', response.json()['vendor'])
+        self.assertEqual(['/softboxen/v1/boxen/2'], self.conn.calls)
+
+    def test_snapshot_read_through(self):
+        snapshot_path = '/softboxen/v1/boxen/1/snapshot'
+
+        box_doc = dict(self.conn.docs['/softboxen/v1/boxen/1'])
+        box_doc['snapshot'] = make_link(snapshot_path)
+        self.conn.put_doc('/softboxen/v1/boxen/1', box_doc)
+        self.conn.put_doc(snapshot_path, {'vendor': 'cisco'})
+
+        self.replica.load()
+
+        self.assertNotIn(snapshot_path, self.replica._responses)
+
+        self.conn.put_doc(snapshot_path, {'vendor': 'juniper'})
+        self.conn.calls[:] = []
+
+        response = self.replica.get(snapshot_path)
+
+        self.assertEqual('juniper', response.json()['vendor'])
+        self.assertEqual([snapshot_path], self.conn.calls)
+
+    def test_write_through(self):
+        self.replica.post('/softboxen/v1/boxen', data={})
+
+        self.assertEqual(
+            [('post', ('/softboxen/v1/boxen',), {'data': {}})],
+            self.conn.calls)
+
+    def test_sync_create(self):
+        self.replica.load()
+
+        self.conn.put_doc('/softboxen/v1/boxen/1/ports/1', {
+            'name': 'eth0',
+            '_links': {'self': '/softboxen/v1/boxen/1/ports/1'}})
+        self.conn.put_doc('/softboxen/v1/boxen/1/ports', {
+            'members': [make_link('/softboxen/v1/boxen/1/ports/1')],
+            '_links': {'self': '/softboxen/v1/boxen/1/ports'}})
+        self.conn.change('create', '/softboxen/v1/boxen/1/ports/1')
+
+        self.assertEqual(1, self.replica.sync())
+        self.assertEqual(2, self.replica.revision)
+
+        response = self.replica.get('/softboxen/v1/boxen/1/ports')
+        self.assertEqual(1, len(response.json()['members']))
+
+        response = self.replica.get('/softboxen/v1/boxen/1/ports/1')
+        self.assertEqual('eth0', response.json()['name'])
+
+    def test_sync_update(self):
+        self.replica.load()
+
+        self.conn.docs['/softboxen/v1/boxen/1']['vendor'] = 'juniper'
+        self.conn.change('update', '/softboxen/v1/boxen/1')
+
+        self.assertEqual(1, self.replica.sync())
+
+        response = self.replica.get('/softboxen/v1/boxen/1')
+        self.assertEqual('juniper', response.json()['vendor'])
+
+    def test_sync_delete(self):
+        self.replica.load()
+
+        self.conn.put_doc('/softboxen/v1/boxen', {
+            'members': [],
+            '_links': {'self': '/softboxen/v1/boxen'}})
+        del self.conn.docs['/softboxen/v1/boxen/1']
+        del self.conn.docs['/softboxen/v1/boxen/1/ports']
+        self.conn.change('delete', '/softboxen/v1/boxen/1')
+
+        self.assertEqual(1, self.replica.sync())
+
+        self.assertEqual(
+            {'/softboxen/v1', '/softboxen/v1/boxen'},
+            set(self.replica._responses))
+
+    def test_sync_nothing(self):
+        self.replica.load()
+        self.conn.calls[:] = []
+
+        self.assertEqual(0, self.replica.sync())
+        self.assertEqual(['/softboxen/v1/changes'], self.conn.calls)
+
+    def test_sync_revision_reset(self):
+        self.replica.load()
+
+        self.conn.changes[:] = []
+        self.conn.calls[:] = []
+
+        self.replica._revision = 5
+        self.replica.sync()
+
+        self.assertEqual(0, self.replica.revision)
+        self.assertIn('/softboxen/v1/boxen/1', self.conn.calls)
+
+    def test_sync_changes_pruned(self):
+        self.replica.load()
+
+        self.conn.put_doc('/softboxen/v1/boxen/1', dict(
+            self.conn.docs['/softboxen/v1/boxen/1'], vendor='juniper'))
+        self.conn.change('update', '/softboxen/v1/boxen/1')
+        self.conn.change('update', '/softboxen/v1/boxen/1')
+        self.conn.pruned = 2
+
+        self.replica.sync()
+
+        self.assertEqual(3, self.replica.revision)
+        self.assertEqual(
+            'juniper',
+            self.replica.get('/softboxen/v1/boxen/1').json()['vendor'])
+
+    def test_sync_error(self):
+        self.replica.load()
+
+        def get(path='', params=None, **kwargs):
+            raise exceptions.HTTPError(
+                'GET', path, make_response({}, status_code=500))
+
+        self.conn.get = get
+
+        self.assertRaises(exceptions.HTTPError, self.replica.sync)
+        self.assertEqual(1, self.replica.revision)
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
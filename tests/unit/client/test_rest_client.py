@@ -6,13 +6,23 @@
 #
 
 import json
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
 import unittest
 from http import client as http_client
+from http import server as http_server
+from urllib import parse as urlparse
 from unittest import mock
 
 import requests
+from requests import adapters
 
 from softboxen import exceptions
+from softboxen import jsoncodec
+from softboxen.client import deadline
 from softboxen.client import rest_client
 
 
@@ -89,6 +99,293 @@ class RestClientMethodsTestCase(unittest.TestCase):
         session.close.assert_called_once_with()
 
 
+class KeepAliveRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(KeepAliveRestClientTestCase, self).setUp()
+        self.conn = rest_client.RestClient(
+            'http://softboxen.com:1234', keep_alive=True, pool_size=4,
+            idle_timeout=30)
+
+    def test_connection_close_by_default(self):
+        conn = rest_client.RestClient('http://softboxen.com:1234')
+        self.assertEqual('close', conn._session.headers['Connection'])
+        self.assertIsNone(conn.pool_stats())
+
+    def test_keep_alive(self):
+        self.assertNotEqual(
+            'close', self.conn._session.headers.get('Connection'))
+
+        for scheme in ('http://', 'https://'):
+            adapter = self.conn._session.get_adapter(scheme + 'softboxen.com')
+            self.assertIsInstance(adapter, rest_client.PooledHTTPAdapter)
+            self.assertEqual(4, adapter._pool_maxsize)
+
+    def test_pool_stats(self):
+        adapter = self.conn._adapter
+        adapter.poolmanager.connection_from_url('http://softboxen.com:1234')
+
+        request = requests.Request(
+            'GET', 'http://softboxen.com:1234/box/path').prepare()
+
+        with mock.patch.object(adapters.HTTPAdapter, 'send', autospec=True):
+            adapter.send(request)
+
+        expected = {
+            'requests': 1,
+            'reaped': 0,
+            'pools': {
+                'http://softboxen.com:1234': {
+                    'connections': 0,
+                    'requests': 0,
+                    'idle': 0
+                }
+            }
+        }
+
+        self.assertEqual(expected, self.conn.pool_stats())
+
+    @mock.patch.object(rest_client.time, 'monotonic', autospec=True)
+    def test_reap_idle_connections(self, mock_monotonic):
+        adapter = self.conn._adapter
+        adapter.poolmanager.connection_from_url('http://softboxen.com:1234')
+
+        mock_monotonic.return_value = 100
+
+        request = requests.Request(
+            'GET', 'http://softboxen.com:1234/box/path').prepare()
+
+        with mock.patch.object(adapters.HTTPAdapter, 'send', autospec=True):
+            adapter.send(request)
+
+        mock_monotonic.return_value = 110
+        self.assertEqual(0, adapter.reap_idle_connections())
+        self.assertEqual(1, len(adapter.poolmanager.pools))
+
+        mock_monotonic.return_value = 131
+        self.assertEqual(1, adapter.reap_idle_connections())
+        self.assertEqual(0, len(adapter.poolmanager.pools))
+        self.assertEqual(1, self.conn.pool_stats()['reaped'])
+
+
+class CachingRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(CachingRestClientTestCase, self).setUp()
+        self.conn = rest_client.RestClient(
+            'http://softboxen.com:1234', cache_size=10)
+        self.session = mock.Mock(spec=requests.Session)
+        self.conn._session = self.session
+        self.request = self.session.request
+
+        response = requests.Response()
+        response.status_code = http_client.OK
+        response.headers['ETag'] = '"1"'
+        response._content = b'{"box": "data"}'
+
+        self.request.return_value = response
+
+    def test_no_cache_by_default(self):
+        conn = rest_client.RestClient('http://softboxen.com:1234')
+        self.assertIsNone(conn.cache_stats())
+
+    def test_conditional_get(self):
+        response = self.conn.get(path='box/path')
+
+        self.request.assert_called_once_with(
+            'GET', 'http://softboxen.com:1234/box/path',
+            headers={}, json=None, timeout=60)
+
+        self.request.reset_mock()
+        self.request.return_value = mock.Mock(
+            status_code=http_client.NOT_MODIFIED)
+
+        cached_response = self.conn.get(path='box/path')
+
+        self.request.assert_called_once_with(
+            'GET', 'http://softboxen.com:1234/box/path',
+            headers={'If-None-Match': '"1"'}, json=None, timeout=60)
+
+        self.assertIs(response, cached_response)
+        self.assertEqual({'box': 'data'}, cached_response.json())
+
+        self.assertEqual(
+            {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0},
+            self.conn.cache_stats())
+
+    def test_query_parameters(self):
+        self.conn.get(path='box/path', params={'name': 'eth1'})
+        self.request.reset_mock()
+
+        self.conn.get(path='box/path')
+
+        self.request.assert_called_once_with(
+            'GET', 'http://softboxen.com:1234/box/path',
+            headers={}, json=None, timeout=60)
+
+    def test_modified(self):
+        self.conn.get(path='box/path')
+
+        response = requests.Response()
+        response.status_code = http_client.OK
+        response.headers['ETag'] = '"2"'
+        response._content = b'{"box": "new data"}'
+
+        self.request.return_value = response
+
+        self.assertEqual(
+            {'box': 'new data'}, self.conn.get(path='box/path').json())
+
+    def test_invalidate(self):
+        self.conn.get(path='box/path')
+        self.conn.get(path='box/path/ports')
+        self.conn.get(path='other/path')
+        self.request.reset_mock()
+
+        self.conn.invalidate('box/path')
+
+        self.conn.get(path='box/path/ports')
+
+        self.request.assert_called_once_with(
+            'GET', 'http://softboxen.com:1234/box/path/ports',
+            headers={}, json=None, timeout=60)
+
+        self.assertEqual(2, self.conn.cache_stats()['size'])
+
+
+class CoalescingRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(CoalescingRestClientTestCase, self).setUp()
+        self.conn = rest_client.RestClient(
+            'http://softboxen.com:1234', coalesce=True)
+        self.session = mock.Mock(spec=requests.Session)
+        self.conn._session = self.session
+        self.request = self.session.request
+
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+        response = requests.Response()
+        response.status_code = http_client.OK
+        response._content = b'{"box": "data"}'
+
+        def request(*args, **kwargs):
+            self.entered.set()
+            self.release.wait(5)
+            return response
+
+        self.request.side_effect = request
+
+    def test_no_coalescing_by_default(self):
+        conn = rest_client.RestClient('http://softboxen.com:1234')
+        self.assertIsNone(conn.coalescing_stats())
+
+    def test_get_coalesced(self):
+        responses = []
+
+        def get():
+            responses.append(self.conn.get(path='box/path'))
+
+        threads = [threading.Thread(target=get) for _ in range(4)]
+
+        threads[0].start()
+        self.entered.wait(5)
+
+        for thread in threads[1:]:
+            thread.start()
+
+        while self.conn.coalescing_stats()['coalesced'] < 3:
+            threading.Event().wait(0.001)
+
+        self.release.set()
+
+        for thread in threads:
+            thread.join(5)
+
+        self.request.assert_called_once_with(
+            'GET', 'http://softboxen.com:1234/box/path',
+            headers={}, json=None, timeout=60)
+
+        self.assertEqual(4, len(responses))
+
+        for response in responses:
+            self.assertIs(responses[0], response)
+
+        self.assertEqual(
+            {'calls': 1, 'coalesced': 3, 'in_flight': 0},
+            self.conn.coalescing_stats())
+
+    def test_get_not_coalesced(self):
+        self.release.set()
+
+        self.conn.get(path='box/path')
+        self.conn.get(path='box/path', params={'name': 'eth1'})
+        self.conn.get(path='box/path', stream=True)
+
+        self.assertEqual(3, self.request.call_count)
+        self.assertEqual(
+            {'calls': 2, 'coalesced': 0, 'in_flight': 0},
+            self.conn.coalescing_stats())
+
+
+class IdentityMapRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(IdentityMapRestClientTestCase, self).setUp()
+        self.conn = rest_client.RestClient(
+            'http://softboxen.com:1234', identity_map_size=10)
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.return_value = mock.Mock(
+            status_code=http_client.OK)
+        self.conn._session = self.session
+
+        self.identity_map = self.conn.identity_map
+        for path in ('/boxen', '/boxen/1', '/boxen/1/ports', '/boxen/2'):
+            self.identity_map.put(path, object())
+
+    def test_no_identity_map_by_default(self):
+        conn = rest_client.RestClient('http://softboxen.com:1234')
+        self.assertIsNone(conn.identity_map)
+        self.assertIsNone(conn.identity_map_stats())
+
+    def test_get(self):
+        self.conn.get(path='/boxen/1')
+
+        self.assertEqual(4, len(self.identity_map))
+
+    def test_invalidate(self):
+        self.conn.invalidate('/boxen/1')
+
+        self.assertEqual(2, len(self.identity_map))
+
+        self.conn.invalidate()
+
+        self.assertEqual(0, len(self.identity_map))
+
+    def test_post(self):
+        self.conn.post(path='/boxen/1/ports', data={'name': 'eth0'})
+
+        self.assertIsNone(self.identity_map.get('/boxen/1/ports', object))
+        self.assertEqual(3, len(self.identity_map))
+
+    def test_delete(self):
+        self.conn.delete(path='/boxen/1')
+
+        self.assertIsNone(self.identity_map.get('/boxen', object))
+        self.assertIsNone(self.identity_map.get('/boxen/1', object))
+        self.assertIsNone(self.identity_map.get('/boxen/1/ports', object))
+        self.assertIsNotNone(self.identity_map.get('/boxen/2', object))
+
+    def test_delete_failed(self):
+        self.session.request.side_effect = requests.ConnectionError()
+
+        self.assertRaises(
+            exceptions.NetworkError, self.conn.delete, path='/boxen/1')
+
+        self.assertEqual(1, len(self.identity_map))
+
+
 class LowLevelRestClientTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -108,7 +405,7 @@ class LowLevelRestClientTestCase(unittest.TestCase):
 
         self.request.assert_called_once_with(
             'GET', 'http://softboxen.com:1234/box/path',
-            headers=self.headers, json=None)
+            headers=self.headers, json=None, timeout=60)
 
     def test_ok_get_url_redirect_false(self):
         self.conn._http_call(
@@ -117,7 +414,8 @@ class LowLevelRestClientTestCase(unittest.TestCase):
 
         self.request.assert_called_once_with(
             'GET', 'http://softboxen.com:1234/box/path',
-            headers=self.headers, json=None, allow_redirects=False)
+            headers=self.headers, json=None, timeout=60,
+            allow_redirects=False)
 
     def test_ok_post(self):
         self.conn._http_call(
@@ -126,7 +424,7 @@ class LowLevelRestClientTestCase(unittest.TestCase):
 
         self.request.assert_called_once_with(
             'POST', 'http://softboxen.com:1234/box/path',
-            json=self.data, headers=self.headers)
+            json=self.data, headers=self.headers, timeout=60)
 
     def test_ok_put(self):
         self.conn._http_call(
@@ -135,7 +433,7 @@ class LowLevelRestClientTestCase(unittest.TestCase):
 
         self.request.assert_called_once_with(
             'PUT', 'http://softboxen.com:1234/box/path',
-            json=self.data, headers=self.headers)
+            json=self.data, headers=self.headers, timeout=60)
 
     def test_ok_delete(self):
         expected_headers = self.headers
@@ -145,7 +443,7 @@ class LowLevelRestClientTestCase(unittest.TestCase):
 
         self.request.assert_called_once_with(
             'DELETE', 'http://softboxen.com:1234/box/path',
-            headers=expected_headers, json=None)
+            headers=expected_headers, json=None, timeout=60)
 
     def test_connection_error(self):
         self.request.side_effect = requests.exceptions.ConnectionError
@@ -153,6 +451,39 @@ class LowLevelRestClientTestCase(unittest.TestCase):
         self.assertRaises(
             exceptions.NetworkError, self.conn._http_call, 'GET')
 
+    def test_timeout_error(self):
+        self.request.side_effect = requests.exceptions.ReadTimeout
+
+        self.assertRaises(
+            exceptions.NetworkError, self.conn._http_call, 'GET')
+
+    def test_deadline(self):
+        with deadline.deadline(10):
+            self.conn._http_call('GET', path='box/path')
+
+        timeout = self.request.call_args[1]['timeout']
+
+        self.assertLessEqual(timeout, 10)
+        self.assertGreater(timeout, 0)
+
+    def test_deadline_exceeded(self):
+        with deadline.deadline(0):
+            self.assertRaises(
+                exceptions.DeadlineExceededError, self.conn._http_call,
+                'GET', path='box/path')
+
+        self.assertFalse(self.request.called)
+
+    @mock.patch.object(deadline, 'exceeded', autospec=True)
+    def test_deadline_exceeded_in_flight(self, mock_exceeded):
+        self.request.side_effect = requests.exceptions.ReadTimeout
+        mock_exceeded.return_value = True
+
+        with deadline.deadline(10):
+            self.assertRaises(
+                exceptions.DeadlineExceededError, self.conn._http_call,
+                'GET', path='box/path')
+
     def test_unknown_http_error(self):
         self.request.return_value.status_code = http_client.CONFLICT
         self.request.return_value.json.side_effect = ValueError('no json')
@@ -221,3 +552,218 @@ class LowLevelRestClientTestCase(unittest.TestCase):
         exc = cm.exception
 
         self.assertEqual(http_client.FORBIDDEN, exc.status_code)
+
+
+class LocalFileRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(LocalFileRestClientTestCase, self).setUp()
+        self.conn = rest_client.RestClient(
+            'file://%s/' % os.path.abspath(
+                'tests/unit/client/resources/samples'))
+
+    def test_get(self):
+        response = self.conn.get('box.json')
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual('cisco', response.json()['vendor'])
+
+    def test_get_query_ignored(self):
+        response = self.conn.get(
+            'box_collection.json', params={'vendor': 'juniper'})
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual(1, response.json()['count'])
+
+    def test_get_missing(self):
+        self.assertRaises(
+            exceptions.ResourceNotFoundError, self.conn.get, 'nope.json')
+
+    def test_get_bytes(self):
+        response = self.conn.get('box.json')
+
+        self.assertIsInstance(response.content, bytes)
+        self.assertIs(response.json(), response.json())
+
+
+class UnixSocketRestClientTestCase(unittest.TestCase):
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    class RequestHandler(http_server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            content = json.dumps({'path': self.path}).encode()
+
+            self.send_response(http_client.OK)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    def setUp(self):
+        super(UnixSocketRestClientTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, 'softboxen.sock')
+
+        # Unix sockets' peer address is not a tuple
+        self.RequestHandler.address_string = lambda handler: 'local'
+
+        self.server = self.Server(self.socket_path, self.RequestHandler)
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+
+        self.conn = rest_client.RestClient(
+            'http+unix://%s/softboxen/v1/' % urlparse.quote(
+                self.socket_path, safe=''), keep_alive=True)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+        super(UnixSocketRestClientTestCase, self).tearDown()
+
+    def test_get_url(self):
+        url = 'http+unix://%s/softboxen/v1/boxen/1' % urlparse.quote(
+            self.socket_path, safe='')
+
+        self.assertEqual(url, self.conn._get_url('boxen/1'))
+        self.assertEqual(url, self.conn._get_url('/softboxen/v1/boxen/1'))
+        self.assertEqual(url, self.conn._get_url(url))
+
+    def test_get(self):
+        response = self.conn.get('boxen', params={'vendor': 'cisco'})
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual(
+            {'path': '/softboxen/v1/boxen?vendor=cisco'}, response.json())
+
+    def test_get_missing_socket(self):
+        conn = rest_client.RestClient(
+            'http+unix://%s/' % urlparse.quote(
+                os.path.join(self.directory, 'nope.sock'), safe=''))
+
+        self.assertRaises(exceptions.NetworkError, conn.get, 'boxen')
+
+
+class LocalFileCacheRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(LocalFileCacheRestClientTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.path = os.path.join(self.directory, 'box.json')
+        self.write({'vendor': 'cisco'})
+
+        self.conn = rest_client.RestClient(
+            'file://%s/' % self.directory, file_cache_size=10)
+
+    def write(self, json_doc, mtime_ns=None):
+        with open(self.path, 'w') as f:
+            json.dump(json_doc, f)
+
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_no_cache_by_default(self):
+        conn = rest_client.RestClient('file://%s/' % self.directory)
+
+        self.assertIsNone(conn.file_cache_stats())
+
+    def test_get_cached(self):
+        expected = self.conn.get('box.json').json()
+
+        self.assertIs(expected, self.conn.get('box.json').json())
+        self.assertEqual(
+            {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0},
+            self.conn.file_cache_stats())
+
+    def test_get_truncated(self):
+        response = self.conn.get('box.json')
+        content = response.content
+
+        # File rewritten in place does not affect the response
+        self.write({})
+
+        self.assertEqual(content, response.content)
+        self.assertEqual('cisco', response.json()['vendor'])
+
+    def test_get_modified(self):
+        self.write({'vendor': 'cisco'}, mtime_ns=10 ** 18)
+        self.conn.get('box.json')
+
+        self.write({'vendor': 'juniper'}, mtime_ns=2 * 10 ** 18)
+
+        self.assertEqual(
+            'juniper', self.conn.get('box.json').json()['vendor'])
+
+    def test_get_empty(self):
+        open(self.path, 'w').close()
+
+        response = self.conn.get('box.json')
+
+        self.assertEqual(http_client.OK, response.status_code)
+        self.assertEqual(b'', response.content)
+        self.assertEqual(0, self.conn.file_cache_stats()['size'])
+
+
+class JSONCodecRestClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(JSONCodecRestClientTestCase, self).setUp()
+        self.conn = rest_client.RestClient(
+            'http://softboxen.com:1234', json_codec='json')
+
+    def test_unknown_codec(self):
+        self.assertRaises(
+            exceptions.InvalidInputError, rest_client.RestClient,
+            'http://softboxen.com:1234', json_codec='pickle')
+
+    def test_decode_with_codec(self):
+        response = requests.Response()
+        response.status_code = http_client.OK
+        response._content = b'{"box": "data"}'
+
+        response = self.conn._decode_with_codec(response)
+
+        self.assertIs(jsoncodec.Codec, response._codec)
+        self.assertEqual({'box': 'data'}, response.json())
+        self.assertIs(response, self.conn._decode_with_codec(response))
+
+    def test_error_body(self):
+        response = requests.Response()
+        response.status_code = http_client.BAD_REQUEST
+        response._content = b'{"error": "Box is broken"}'
+
+        response = self.conn._decode_with_codec(response)
+
+        with self.assertRaisesRegex(
+                exceptions.BadRequestError, 'Box is broken'):
+            exceptions.handle_error_response(
+                'GET', 'http://softboxen.com', response)
+
+    def test_malformed_error_body(self):
+        response = requests.Response()
+        response.status_code = http_client.BAD_REQUEST
+        response._content = b'not json'
+
+        response = self.conn._decode_with_codec(response)
+
+        with self.assertRaisesRegex(
+                exceptions.BadRequestError, 'unknown error'):
+            exceptions.handle_error_response(
+                'GET', 'http://softboxen.com', response)
+
+    def test_session_hook(self):
+        self.assertIn(
+            self.conn._decode_with_codec,
+            self.conn._session.hooks['response'])
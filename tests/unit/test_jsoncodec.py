@@ -0,0 +1,79 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+import mmap
+import sys
+import tempfile
+import unittest
+
+from softboxen import exceptions
+from softboxen import jsoncodec
+
+DOC = {'vendor': 'cisco', 'ports': [{'mtu': 1500, 'shutdown': False}]}
+
+
+class CodecTestCase(unittest.TestCase):
+
+    def test_get_codec_fastest(self):
+        codec = jsoncodec.get_codec()
+
+        expected = [codec for codec in jsoncodec.CODECS if codec.available]
+
+        self.assertIs(expected[0], codec)
+
+    def test_get_codec_by_name(self):
+        self.assertIs(jsoncodec.Codec, jsoncodec.get_codec('json'))
+
+    def test_get_codec_unknown(self):
+        self.assertRaises(
+            exceptions.InvalidInputError, jsoncodec.get_codec, 'pickle')
+
+    def test_codecs(self):
+        for codec in jsoncodec.CODECS:
+            if not codec.available:
+                continue
+
+            with self.subTest(codec=codec.name):
+                data = codec.dumps(DOC, sort_keys=True)
+
+                self.assertIsInstance(data, str)
+                self.assertEqual(DOC, codec.loads(data))
+                self.assertEqual(DOC, codec.loads(data.encode()))
+
+                self.assertRaises(ValueError, codec.loads, b'')
+                self.assertRaises(ValueError, codec.loads, b'{')
+
+    def test_codecs_buffer(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(jsoncodec.Codec.dumps(DOC).encode())
+            f.flush()
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for codec in jsoncodec.CODECS:
+                    if not codec.available:
+                        continue
+
+                    with self.subTest(codec=codec.name):
+                        self.assertEqual(DOC, codec.loads(data))
+
+    def test_codecs_default(self):
+        class Box(object):
+            pass
+
+        for codec in jsoncodec.CODECS:
+            if not codec.available:
+                continue
+
+            with self.subTest(codec=codec.name):
+                data = codec.dumps({'box': Box()}, default=lambda o: 'box')
+
+                self.assertEqual({'box': 'box'}, codec.loads(data))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
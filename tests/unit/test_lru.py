@@ -0,0 +1,79 @@
+#
+# This file is part of softboxen software.
+#
+# Copyright (c) 2020, Ilya Etingof <etingof@gmail.com>
+# License: https://github.com/etingof/softboxen/LICENSE.rst
+#
+import sys
+import unittest
+from unittest import mock
+
+from softboxen import lru
+
+
+class LRUCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(LRUCacheTestCase, self).setUp()
+        self.cache = lru.LRUCache(2)
+
+    def test_get(self):
+        with self.cache._lock:
+            self.assertIsNone(self.cache._get('a'))
+
+            self.cache._put('a', 1)
+
+            self.assertEqual(1, self.cache._get('a'))
+
+        self.assertEqual(1, len(self.cache))
+
+    def test_evict(self):
+        with self.cache._lock:
+            self.cache._put('a', 1)
+            self.cache._put('b', 2)
+            self.cache._get('a')
+            self.cache._put('c', 3)
+
+            self.assertIsNone(self.cache._get('b'))
+            self.assertEqual(1, self.cache._get('a'))
+            self.assertEqual(3, self.cache._get('c'))
+
+        expected = {
+            'size': 2,
+            'hits': 0,
+            'misses': 0,
+            'evictions': 1
+        }
+
+        self.assertEqual(expected, self.cache.stats())
+
+    @mock.patch.object(lru.time, 'monotonic', autospec=True)
+    def test_ttl(self, mock_monotonic):
+        cache = lru.LRUCache(2, ttl=10)
+
+        mock_monotonic.return_value = 100
+
+        with cache._lock:
+            cache._put('a', 1)
+
+        mock_monotonic.return_value = 111
+
+        with cache._lock:
+            self.assertIsNone(cache._get('a'))
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(1, cache.stats()['evictions'])
+
+    def test_clear(self):
+        with self.cache._lock:
+            self.cache._put('a', 1)
+
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)